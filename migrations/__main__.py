@@ -4,15 +4,130 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import argparse
 import asyncio
+import json
+import sys
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 
 from migrations.index_checker import IndexChecker
+from migrations.reindexer import Reindexer
+from migrations.rollup import RollupRunner
+from search.components.crud import CRUD
 from search.components.dataset_activity.crud import DatasetActivityCRUD
+from search.components.item_activity.crud import ActivityCounterCRUD
 from search.components.item_activity.crud import ItemActivityCRUD
 from search.components.metadata_item.crud import MetadataItemCRUD
+from search.components.metadata_item.crud import SizeUsageRollupCRUD
 from search.config import get_settings
 
-if __name__ == '__main__':
+CRUDS: list[type[CRUD]] = [
+    MetadataItemCRUD,
+    SizeUsageRollupCRUD,
+    ItemActivityCRUD,
+    ActivityCounterCRUD,
+    DatasetActivityCRUD,
+]
+
+
+def get_crud(name: str) -> type[CRUD]:
+    """Return the CRUD class by its class name or index name."""
+
+    for crud in CRUDS:
+        if name in (crud.__name__, crud.index):
+            return crud
+
+    raise argparse.ArgumentTypeError(f'unknown CRUD "{name}", choose from {[crud.index for crud in CRUDS]}')
+
+
+def get_datetime(value: str) -> datetime:
+    """Return datetime parsed from ISO format considering naive datetime to be in UTC."""
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid ISO datetime "{value}"')
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+
+    return parsed
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m migrations', description='Manage elasticsearch indices.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    subparsers.add_parser('check', help='create missing indices and roll partitions over (default)')
+
+    reindex = subparsers.add_parser('reindex', help='reindex a CRUD into new indices and swap its aliases')
+    reindex.add_argument('crud', type=get_crud, help='CRUD class name or index name')
+    reindex.add_argument('--slices', default='auto', help='number of _reindex slices or "auto"')
+    reindex.add_argument(
+        '--requests-per-second', type=float, default=-1, help='throttle of copied documents per second'
+    )
+    reindex.add_argument('--batch-size', type=int, default=1000, help='number of documents copied in one batch')
+    reindex.add_argument('--poll-interval', type=float, default=5, help='seconds between progress reports')
+    reindex.add_argument(
+        '--catch-up-margin', type=float, default=60, help='minutes before the start of copying the catch-up pass covers'
+    )
+
+    subparsers.add_parser('rollup-size-usage', help='roll up daily size usage of project files')
+
+    backfill = subparsers.add_parser('backfill-activity-counters', help='rebuild item activity counters from logs')
+    backfill.add_argument('--from', dest='start', type=get_datetime, help='start of the backfilled range')
+    backfill.add_argument('--to', dest='end', type=get_datetime, help='end of the backfilled range')
+
+    check_counters = subparsers.add_parser(
+        'check-activity-counters', help='compare item activity counters with item activity logs'
+    )
+    check_counters.add_argument('--from', dest='start', type=get_datetime, help='start of the range, 7 days by default')
+    check_counters.add_argument('--to', dest='end', type=get_datetime, help='end of the range, now by default')
+
+    return parser
+
+
+def main(arguments: list[str]) -> int:
     settings = get_settings()
+    options = get_parser().parse_args(arguments)
+
+    if options.command == 'reindex':
+        reindexer = Reindexer(
+            settings.ELASTICSEARCH_URI,
+            slices=int(options.slices) if options.slices.isdigit() else options.slices,
+            requests_per_second=options.requests_per_second,
+            batch_size=options.batch_size,
+            poll_interval=options.poll_interval,
+            catch_up_margin=timedelta(minutes=options.catch_up_margin),
+        )
+        is_reindexed = asyncio.run(reindexer.reindex_cruds([options.crud]))
+        return 0 if is_reindexed else 1
+
+    if options.command == 'rollup-size-usage':
+        is_rolled_up = asyncio.run(RollupRunner(settings.ELASTICSEARCH_URI).rollup_size_usage())
+        return 0 if is_rolled_up else 1
+
+    if options.command == 'backfill-activity-counters':
+        runner = RollupRunner(settings.ELASTICSEARCH_URI)
+        is_backfilled = asyncio.run(runner.backfill_activity_counters(options.start, options.end))
+        return 0 if is_backfilled else 1
+
+    if options.command == 'check-activity-counters':
+        end = options.end or datetime.now(timezone.utc)
+        start = options.start or end - timedelta(days=7)
+        mismatches = asyncio.run(RollupRunner(settings.ELASTICSEARCH_URI).check_activity_counters(start, end))
+        if mismatches is None:
+            return 1
+        print(json.dumps([json.loads(mismatch.json()) for mismatch in mismatches], indent=2))  # noqa: T201
+        return 0 if not mismatches else 1
+
     index_checker = IndexChecker(settings.ELASTICSEARCH_URI)
-    asyncio.run(index_checker.check_cruds([MetadataItemCRUD, ItemActivityCRUD, DatasetActivityCRUD]))
+    report = asyncio.run(index_checker.check_cruds(CRUDS))
+    print(report.json(indent=2))  # noqa: T201
+    return 0 if report.is_successful else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
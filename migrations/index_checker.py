@@ -4,10 +4,16 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import asyncio
+
 from common import configure_logging
 from elasticsearch import AsyncElasticsearch
+from elasticsearch import RequestError
+from pydantic import BaseModel
 
 from search.components.crud import CRUD
+from search.components.index import get_field_names
+from search.components.partitioning import PartitionedCRUD
 from search.config import get_settings
 from search.logger import logger
 
@@ -15,34 +21,144 @@ settings = get_settings()
 configure_logging(settings.LOGGING_LEVEL, settings.LOGGING_FORMAT)
 
 
+class IndexReport(BaseModel):
+    """Changes made and problems found while checking indices of one CRUD."""
+
+    crud: str
+    index: str
+    created: bool = False
+    updated_fields: dict[str, list[str]] = {}
+    conflicting_fields: dict[str, list[str]] = {}
+    unsorted_indices: list[str] = []
+    error: str | None = None
+
+    @property
+    def is_successful(self) -> bool:
+        return self.error is None and not self.conflicting_fields
+
+
+class CheckReport(BaseModel):
+    """Reports of checked indices for all CRUDs."""
+
+    indices: list[IndexReport]
+
+    @property
+    def is_successful(self) -> bool:
+        return all(report.is_successful for report in self.indices)
+
+
 class IndexChecker:
-    """Check if required indexes are available in the elasticsearch and create them if not."""
+    """Check if required indexes are available in the elasticsearch and create or update them if not."""
 
     def __init__(self, elasticsearch_uri: str) -> None:
         self.client = AsyncElasticsearch(elasticsearch_uri)
 
-    async def check_crud(self, crud: CRUD) -> None:
-        """Check index of one CRUD."""
+    async def check_index_sort(self, crud: CRUD, report: IndexReport) -> None:
+        """Report existing indices of one CRUD that have to be reindexed to get sorted as defined in the index sort."""
+
+        if not crud.index_sort:
+            return
+
+        report.unsorted_indices = await crud.get_unsorted_indices()
+        if report.unsorted_indices:
+            logger.warning(
+                f'Indices {report.unsorted_indices} are not sorted by {crud.index_sort}, '
+                f'they must be reindexed with "python -m migrations reindex {crud.index}" to apply the index sorting.'
+            )
+
+    async def check_mappings(self, crud: CRUD, report: IndexReport) -> None:
+        """Add fields missing in mappings of existing indices and report fields that can't be updated in place."""
+
+        missing, report.conflicting_fields = await crud.get_mappings_drift()
+
+        for index, properties in missing.items():
+            logger.info(f'Adding missing fields to mappings of index "{index}".')
+            try:
+                await crud.update_mappings(index, properties)
+            except RequestError as e:
+                # Fields using analyzers or normalizers the existing index settings don't define can't be added
+                logger.warning(f'Fields can\'t be added to mappings of index "{index}": {e.info}.')
+                report.conflicting_fields.setdefault(index, []).extend(get_field_names(properties))
+                continue
+            report.updated_fields[index] = get_field_names(properties)
+
+        if report.conflicting_fields:
+            logger.warning(
+                f'Fields {report.conflicting_fields} are mapped differently than defined for "{crud.index}", '
+                f'they must be reindexed with "python -m migrations reindex {crud.index}".'
+            )
+
+    async def check_partitioned_crud(self, crud: PartitionedCRUD, report: IndexReport) -> None:
+        """Update index template of one partitioned CRUD and roll its write alias over to the current partition."""
+
+        if await crud.is_legacy_index():
+            report.error = (
+                f'Index "{crud.index}" is not partitioned, it must be reindexed into partitions '
+                f'"{crud.partitioning.pattern}" with "python -m migrations reindex {crud.index}".'
+            )
+            logger.warning(report.error)
+            return
+
+        report.created = not await crud.is_index_exists()
+
+        logger.info(f'Updating index template and rolling over partitions for alias "{crud.index}".')
+        await crud.create_index()
+        logger.info(f'The write alias "{crud.partitioning.write_alias}" has been successfully rolled over.')
+
+    async def check_index(self, crud: CRUD, report: IndexReport) -> None:
+        """Create the index of one CRUD when it doesn't exist."""
 
         logger.info(f'Checking if index "{crud.index}" exists.')
         is_exists = await crud.is_index_exists()
         logger.info(f'Existence check result for index "{crud.index}" is "{is_exists}".')
 
-        if not is_exists:
-            logger.info(f'Creating index "{crud.index}" for CRUD "{crud}".')
+        if is_exists:
+            return
+
+        logger.info(f'Creating index "{crud.index}" for CRUD "{crud}".')
+        try:
             await crud.create_index()
+        except RequestError as e:
+            # Another checker running at the same time may create the index first
+            if e.error != 'resource_already_exists_exception':
+                raise
+            logger.info(f'The index "{crud.index}" has been created concurrently.')
+        else:
+            report.created = True
             logger.info(f'The index "{crud.index}" has been successfully created.')
 
-    async def check_cruds(self, cruds: list[type[CRUD]]) -> None:
-        """Check indexes for a list of CRUDs."""
+    async def check_crud(self, crud: CRUD) -> IndexReport:
+        """Check index of one CRUD and report what has been changed."""
+
+        report = IndexReport(crud=str(crud), index=crud.index)
+        try:
+            if isinstance(crud, PartitionedCRUD):
+                await self.check_partitioned_crud(crud, report)
+            else:
+                await self.check_index(crud, report)
+
+            if report.error is None:
+                await self.check_mappings(crud, report)
+                await self.check_index_sort(crud, report)
+        except Exception as e:
+            logger.exception(f'An exception occurred while checking index "{crud.index}".')
+            report.error = repr(e)
+
+        return report
+
+    async def check_cruds(self, cruds: list[type[CRUD]]) -> CheckReport:
+        """Check indexes for a list of CRUDs concurrently."""
 
         logger.info(f'Start checking for the existence of indexes for the CRUDs: {cruds}.')
         try:
-            for crud in cruds:
-                await self.check_crud(crud(self.client))
-        except Exception:
-            logger.exception('An exception occurred while performing CRUDs indexes check.')
-        else:
-            logger.info('The indexes check is successfully completed.')
+            reports = await asyncio.gather(*[self.check_crud(crud(self.client)) for crud in cruds])
         finally:
             await self.client.close()
+
+        report = CheckReport(indices=reports)
+        if report.is_successful:
+            logger.info('The indexes check is successfully completed.')
+        else:
+            logger.error('The indexes check is completed with errors.')
+
+        return report
@@ -0,0 +1,265 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+import re
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+
+from elasticsearch import AsyncElasticsearch
+from pydantic import BaseModel
+
+from search.components.crud import CRUD
+from search.components.partitioning import PartitionedCRUD
+from search.logger import logger
+
+VERSION_PATTERN = re.compile(r'^(?P<name>.+)-v(?P<version>\d+)$')
+
+PARTITION_SCRIPT = '''
+if (ctx._source[params.field] != null) {
+    long seconds = (long) Double.parseDouble(String.valueOf(ctx._source[params.field]));
+    ZonedDateTime time = ZonedDateTime.ofInstant(Instant.ofEpochSecond(seconds), ZoneOffset.UTC);
+    ctx._index = params.prefix + DateTimeFormatter.ofPattern('yyyy.MM').format(time);
+}
+'''
+
+
+class ReindexFailed(Exception):
+    """Raised when a reindex task completes with failures."""
+
+
+class IndexCopy(BaseModel):
+    """Copy of one source index into a target index which replaces it together with aliases.
+
+    Partitioned copies split documents of the source into partitions matched by the target pattern.
+    """
+
+    source: str
+    target: str
+    aliases: dict[str, dict[str, Any]]
+    partitioned: bool = False
+
+
+class Reindexer:
+    """Copy documents of CRUD indices into new versioned indices and swap aliases the CRUD reads from.
+
+    Documents are copied twice using external versioning, first while the source indices accept writes and then
+    after writes are blocked, so that the second pass catches up with documents created or updated in the meantime.
+    The second pass copies only documents written since the first pass started, less the catch-up margin, when the
+    CRUD has a field with the time documents are written.
+    """
+
+    def __init__(
+        self,
+        elasticsearch_uri: str,
+        slices: int | str = 'auto',
+        requests_per_second: float = -1,
+        batch_size: int = 1000,
+        poll_interval: float = 5,
+        catch_up_margin: timedelta = timedelta(hours=1),
+    ) -> None:
+        self.client = AsyncElasticsearch(elasticsearch_uri)
+        self.slices = slices
+        self.requests_per_second = requests_per_second
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.catch_up_margin = catch_up_margin
+
+    def get_versioned_name(self, index: str) -> tuple[str, str]:
+        """Return the name of the index without version and the name of its next version."""
+
+        match = VERSION_PATTERN.match(index)
+        if match is None:
+            return index, f'{index}-v1'
+
+        return match['name'], f'{match["name"]}-v{int(match["version"]) + 1}'
+
+    async def get_index_copies(self, crud: CRUD) -> list[IndexCopy]:
+        """Return copies required to replace all indices the CRUD reads from."""
+
+        indices = await self.client.indices.get_alias(index=crud.index)
+
+        copies = []
+        for source, description in sorted(indices.items()):
+            aliases = description['aliases']
+
+            if isinstance(crud, PartitionedCRUD) and source == crud.index:
+                copies.append(
+                    IndexCopy(
+                        source=source,
+                        target=crud.partitioning.get_partition(datetime.now(timezone.utc)),
+                        aliases={crud.index: {}},
+                        partitioned=True,
+                    )
+                )
+                continue
+
+            name, target = self.get_versioned_name(source)
+            copies.append(IndexCopy(source=source, target=target, aliases={name: {}, crud.index: {}, **aliases}))
+
+        return copies
+
+    async def create_target(self, crud: CRUD, copy: IndexCopy) -> None:
+        """Create the target index with the current CRUD mappings and settings.
+
+        Partitions are created from the index template, the partition of the current month is created even when the
+        split source index has no documents for it, so it can take writes once aliases are swapped.
+        """
+
+        if isinstance(crud, PartitionedCRUD):
+            if copy.partitioned:
+                await self.client.indices.create(index=copy.target, ignore=400)
+            else:
+                await self.client.indices.create(index=copy.target)
+            return
+
+        await self.client.indices.create(
+            index=copy.target, mappings=crud.index_mappings, settings=crud.get_index_settings()
+        )
+
+    def get_catch_up_query(self, crud: CRUD, started_at: datetime) -> dict[str, Any] | None:
+        """Return the query matching documents written since the first pass started or None to copy all of them."""
+
+        if crud.updated_time_field is None:
+            return None
+
+        since = int((started_at - self.catch_up_margin).timestamp())
+
+        return {'range': {crud.updated_time_field: {'gte': since, 'format': 'epoch_second'}}}
+
+    def get_reindex_body(self, crud: CRUD, copy: IndexCopy, query: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Return the _reindex request body for one copy."""
+
+        body = {
+            'conflicts': 'proceed',
+            'source': {'index': copy.source, 'size': self.batch_size},
+            'dest': {'index': copy.target, 'version_type': 'external'},
+        }
+
+        if query is not None:
+            body['source']['query'] = query
+
+        if copy.partitioned:
+            body['script'] = {
+                'lang': 'painless',
+                'source': PARTITION_SCRIPT,
+                'params': {'field': crud.partitioning.field, 'prefix': f'{crud.index}-'},
+            }
+
+        return body
+
+    async def wait_for_task(self, task_id: str, copy: IndexCopy) -> None:
+        """Wait until the reindex task is completed reporting its progress."""
+
+        while True:
+            task = await self.client.tasks.get(task_id=task_id)
+            status = task['task']['status']
+            copied = status['created'] + status['updated'] + status['version_conflicts']
+            logger.info(f'Copied {copied} of {status["total"]} documents from "{copy.source}" into "{copy.target}".')
+
+            if task['completed']:
+                break
+
+            await asyncio.sleep(self.poll_interval)
+
+        failures = task.get('response', {}).get('failures')
+        if failures or 'error' in task:
+            raise ReindexFailed(f'Copying "{copy.source}" into "{copy.target}" failed: {failures or task["error"]}.')
+
+    async def copy_documents(self, crud: CRUD, copy: IndexCopy, query: dict[str, Any] | None = None) -> None:
+        """Run sliced and throttled _reindex task for one copy and wait for its completion."""
+
+        result = await self.client.reindex(
+            body=self.get_reindex_body(crud, copy, query),
+            slices=self.slices,
+            requests_per_second=self.requests_per_second,
+            refresh=True,
+            wait_for_completion=False,
+        )
+
+        await self.wait_for_task(result['task'], copy)
+
+    def get_swap_actions(self, crud: CRUD, copies: list[IndexCopy]) -> list[dict[str, Any]]:
+        """Return alias actions that replace source indices with target indices in one atomic request.
+
+        The partition of the current month a split index is replaced with takes writes of both the read alias and the
+        write alias, so writes of the replaced index don't fail until the CRUD notices the write alias.
+        """
+
+        actions = []
+        for copy in copies:
+            actions.append({'remove_index': {'index': copy.source}})
+
+        for copy in copies:
+            target = f'{copy.source}-*' if copy.partitioned else copy.target
+            for alias, options in copy.aliases.items():
+                actions.append({'add': {'index': target, 'alias': alias, **options}})
+
+            if copy.partitioned:
+                for alias in (crud.index, crud.partitioning.write_alias):
+                    actions.append({'add': {'index': copy.target, 'alias': alias, 'is_write_index': True}})
+
+        return actions
+
+    async def reindex_crud(self, crud: CRUD) -> None:
+        """Copy all indices of one CRUD into new indices and swap aliases to them."""
+
+        copies = await self.get_index_copies(crud)
+        sources = ','.join(copy.source for copy in copies)
+        logger.info(f'Reindexing "{sources}" of CRUD "{crud}" into {[copy.target for copy in copies]}.')
+
+        if isinstance(crud, PartitionedCRUD):
+            # Partitions must not be added to the read alias before they replace source indices
+            template = crud.get_index_template()
+            template['template'].pop('aliases')
+            await self.client.indices.put_index_template(name=crud.index, body=template)
+
+        started_at = datetime.now(timezone.utc)
+        is_swapped = False
+        try:
+            for copy in copies:
+                await self.create_target(crud, copy)
+                await self.copy_documents(crud, copy)
+
+            logger.info(f'Blocking writes into "{sources}" to copy the remaining documents.')
+            await self.client.indices.add_block(index=sources, block='write')
+
+            query = self.get_catch_up_query(crud, started_at)
+            for copy in copies:
+                await self.copy_documents(crud, copy, query)
+
+            await self.client.indices.update_aliases(body={'actions': self.get_swap_actions(crud, copies)})
+            is_swapped = True
+            logger.info(f'Aliases of "{sources}" have been swapped to the new indices.')
+        finally:
+            if not is_swapped:
+                await self.client.indices.put_settings(index=sources, body={'index.blocks.write': False})
+
+            if isinstance(crud, PartitionedCRUD):
+                if is_swapped:
+                    await crud.create_index()
+                    # Partitions created by writes while the template had no aliases are added to the read alias
+                    actions = [{'add': {'index': crud.partitioning.pattern, 'alias': crud.index}}]
+                    await self.client.indices.update_aliases(body={'actions': actions})
+                else:
+                    await self.client.indices.put_index_template(name=crud.index, body=crud.get_index_template())
+
+    async def reindex_cruds(self, cruds: list[type[CRUD]]) -> bool:
+        """Reindex indices of a list of CRUDs and return if all of them are successfully reindexed."""
+
+        try:
+            for crud in cruds:
+                await self.reindex_crud(crud(self.client))
+        except Exception:
+            logger.exception('An exception occurred while reindexing CRUDs indices.')
+            return False
+        else:
+            logger.info('The reindexing is successfully completed.')
+            return True
+        finally:
+            await self.client.close()
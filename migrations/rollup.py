@@ -0,0 +1,66 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from datetime import datetime
+
+from elasticsearch import AsyncElasticsearch
+
+from search.components.item_activity.crud import ActivityCounterCRUD
+from search.components.item_activity.models import ItemActivityCounterMismatch
+from search.components.metadata_item.crud import SizeUsageRollupCRUD
+from search.logger import logger
+
+
+class RollupRunner:
+    """Maintain indices with data pre-aggregated from other indices."""
+
+    def __init__(self, elasticsearch_uri: str) -> None:
+        self.client = AsyncElasticsearch(elasticsearch_uri)
+
+    async def rollup_size_usage(self) -> bool:
+        """Roll up size usage of project files for days that are over or have updated files."""
+
+        logger.info('Start rolling up size usage of project files.')
+        try:
+            count = await SizeUsageRollupCRUD(self.client).rollup()
+        except Exception:
+            logger.exception('An exception occurred while rolling up size usage.')
+            return False
+        else:
+            logger.info(f'The size usage rollup is successfully completed, {count} buckets have been written.')
+            return True
+        finally:
+            await self.client.close()
+
+    async def backfill_activity_counters(self, start: datetime | None = None, end: datetime | None = None) -> bool:
+        """Rebuild item activity counters from item activity logs."""
+
+        logger.info(f'Start backfilling item activity counters between "{start}" and "{end}".')
+        try:
+            count = await ActivityCounterCRUD(self.client).backfill(start, end)
+        except Exception:
+            logger.exception('An exception occurred while backfilling item activity counters.')
+            return False
+        else:
+            logger.info(f'The item activity counters backfill is successfully completed, {count} counters are written.')
+            return True
+        finally:
+            await self.client.close()
+
+    async def check_activity_counters(self, start: datetime, end: datetime) -> list[ItemActivityCounterMismatch] | None:
+        """Compare item activity counters with item activity logs and return mismatches or None when check fails."""
+
+        logger.info(f'Start checking item activity counters between "{start}" and "{end}".')
+        try:
+            mismatches = await ActivityCounterCRUD(self.client).check_consistency(start, end)
+        except Exception:
+            logger.exception('An exception occurred while checking item activity counters.')
+            return None
+        else:
+            logger.info(f'The item activity counters check is completed, {len(mismatches)} counters do not match.')
+            return mismatches
+        finally:
+            await self.client.close()
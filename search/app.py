@@ -28,8 +28,13 @@ from search.components.exceptions import UnhandledException
 from search.components.item_activity import item_activity_router
 from search.components.metadata_item import metadata_item_router
 from search.components.project_files import project_files_router
+from search.components.responses import ORJSONResponse
 from search.config import Settings
 from search.config import get_settings
+from search.dependencies import close_application_elasticsearch_client
+from search.dependencies import close_application_result_cache
+from search.dependencies import close_application_write_buffer
+from search.dependencies import get_application_elasticsearch_client
 
 
 def create_app() -> FastAPI:
@@ -43,6 +48,7 @@ def create_app() -> FastAPI:
         docs_url='/v1/api-doc',
         redoc_url='/v1/api-redoc',
         version=settings.VERSION,
+        default_response_class=ORJSONResponse,
     )
 
     setup_logging(settings)
@@ -85,12 +91,23 @@ def setup_middlewares(app: FastAPI, settings: Settings) -> None:
 def setup_dependencies(app: FastAPI, settings: Settings) -> None:
     """Perform dependencies setup/teardown at the application startup/shutdown events."""
 
-    app.add_event_handler('startup', partial(startup_event, settings))
+    app.add_event_handler('startup', partial(startup_event, app, settings))
+    app.add_event_handler('shutdown', partial(shutdown_event, app))
 
 
-async def startup_event(settings: Settings) -> None:
+async def startup_event(app: FastAPI, settings: Settings) -> None:
     """Initialise dependencies at the application startup event."""
 
+    get_application_elasticsearch_client(app, settings)
+
+
+async def shutdown_event(app: FastAPI) -> None:
+    """Release dependencies at the application shutdown event."""
+
+    await close_application_write_buffer(app)
+    await close_application_elasticsearch_client(app)
+    await close_application_result_cache(app)
+
 
 def setup_exception_handlers(app: FastAPI) -> None:
     """Configure the application exception handlers."""
@@ -0,0 +1,21 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from search.components.cache.backends import CacheBackend
+from search.components.cache.backends import MemoryCacheBackend
+from search.components.cache.backends import RedisCacheBackend
+from search.components.cache.cache import ResultCache
+from search.components.cache.cache import cached_result
+from search.components.cache.cache import make_cache_key
+
+__all__ = [
+    'CacheBackend',
+    'MemoryCacheBackend',
+    'RedisCacheBackend',
+    'ResultCache',
+    'cached_result',
+    'make_cache_key',
+]
@@ -0,0 +1,158 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import time
+from abc import ABCMeta
+from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from search.logger import logger
+
+
+class CacheBackend(metaclass=ABCMeta):
+    """Base class for storages of serialized cached results."""
+
+    @abstractmethod
+    async def get(self, key: str) -> tuple[bytes | None, int | None]:
+        """Return stored value or None when the key is missing or expired together with the version of its namespace.
+
+        Values computed after a miss are stored with the returned version, so values computed while the namespace is
+        invalidated are never returned. The version is None when it's unknown.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float, version: int | None) -> None:
+        """Store value for the time to live in seconds unless the version of the key namespace is outdated."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_namespace(self, namespace: str) -> None:
+        """Remove all values with keys in the namespace."""
+
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release resources used by the backend."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process storage with least recently used eviction, values are not shared between workers."""
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_size = max_size
+        self.clock = clock
+
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_version(self, key: str) -> int:
+        namespace, _, _ = key.partition(':')
+
+        return self._versions.get(namespace, 0)
+
+    async def get(self, key: str) -> tuple[bytes | None, int | None]:
+        version = self._get_version(key)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, version
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None, version
+
+        self._entries.move_to_end(key)
+
+        return value, version
+
+    async def set(self, key: str, value: bytes, ttl: float, version: int | None) -> None:
+        if version != self._get_version(key):
+            return
+
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete_namespace(self, namespace: str) -> None:
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        prefix = f'{namespace}:'
+
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Storage in a server speaking Redis protocol, values are shared between all workers.
+
+    Values are stored together with the generation of their namespace, so invalidating a namespace is a single INCR of
+    its generation counter and values of previous generations are treated as missing until they are overwritten or
+    expire. The generation and the value are read with one MGET, so every operation is a single round trip. Cache is
+    considered optional, so server errors are logged and treated as missing values.
+    """
+
+    def __init__(self, client: Redis, prefix: str = 'search:cache:') -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = 'search:cache:') -> 'RedisCacheBackend':
+        return cls(Redis.from_url(url), prefix)
+
+    def _get_generation_key(self, namespace: str) -> str:
+        return f'{self.prefix}generation:{namespace}'
+
+    def _get_server_key(self, key: str) -> str:
+        return f'{self.prefix}{key}'
+
+    async def get(self, key: str) -> tuple[bytes | None, int | None]:
+        namespace, _, _ = key.partition(':')
+
+        try:
+            generation, data = await self.client.mget(self._get_generation_key(namespace), self._get_server_key(key))
+        except RedisError:
+            logger.exception('Unable to get value from the cache.')
+            return None, None
+
+        version = int(generation or 0)
+        if data is None:
+            return None, version
+
+        stored_version, _, value = data.partition(b':')
+        if int(stored_version) != version:
+            return None, version
+
+        return value, version
+
+    async def set(self, key: str, value: bytes, ttl: float, version: int | None) -> None:
+        if version is None:
+            return
+
+        try:
+            await self.client.set(self._get_server_key(key), b'%d:%s' % (version, value), px=max(int(ttl * 1000), 1))
+        except RedisError:
+            logger.exception('Unable to set value in the cache.')
+
+    async def delete_namespace(self, namespace: str) -> None:
+        try:
+            await self.client.incr(self._get_generation_key(namespace))
+        except RedisError:
+            logger.exception('Unable to delete values from the cache.')
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,176 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+import functools
+import typing
+from collections.abc import Awaitable
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import TypeVar
+
+import orjson
+from pydantic import BaseModel
+from pydantic import parse_raw_as
+
+from search.components.cache.backends import CacheBackend
+from search.components.encoders import dumps_json
+
+Result = TypeVar('Result')
+
+
+def normalize_cache_key_part(value: Any) -> Any:
+    """Convert value into json-compatible form where equal values have the same representation."""
+
+    if isinstance(value, BaseModel):
+        value = value.dict()
+
+    if isinstance(value, dict):
+        return {str(key): normalize_cache_key_part(item) for key, item in value.items()}
+
+    if isinstance(value, list | tuple | set | frozenset):
+        return [normalize_cache_key_part(item) for item in value]
+
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc)
+
+    return value
+
+
+def make_cache_key(namespace: str, name: str, *args: Any, **kwds: Any) -> str:
+    """Create cache key within the namespace from the name and normalized arguments."""
+
+    parts = [name, normalize_cache_key_part(args), normalize_cache_key_part(kwds)]
+
+    return f'{namespace}:{orjson.dumps(parts, option=orjson.OPT_SORT_KEYS).decode()}'
+
+
+class ResultCache:
+    """Cache for results of coroutines stored as json in the cache backend.
+
+    Concurrent requests of the same missing key within the process share one computation, so identical aggregations
+    are executed once. Invalidations of a namespace requested within the invalidation delay are coalesced into one, so
+    frequent writes don't invalidate cached results on every write.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, invalidation_delay: float = 0) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.invalidation_delay = invalidation_delay
+
+        self.hits = 0
+        self.misses = 0
+
+        self._pending: dict[str, asyncio.Future] = {}
+        self._invalidations: dict[str, asyncio.Task] = {}
+
+    def get_statistics(self) -> dict[str, int]:
+        """Return hit and miss counters."""
+
+        return {'hits': self.hits, 'misses': self.misses}
+
+    async def invalidate(self, namespace: str) -> None:
+        """Remove all cached results within the namespace.
+
+        Results are removed once the invalidation delay passes when it's set, later invalidations of the namespace are
+        joined with the pending one until it's completed.
+        """
+
+        if self.invalidation_delay <= 0:
+            await self.backend.delete_namespace(namespace)
+            return
+
+        if namespace not in self._invalidations:
+            self._invalidations[namespace] = asyncio.create_task(self._invalidate_later(namespace))
+
+    async def _invalidate_later(self, namespace: str) -> None:
+        try:
+            await asyncio.sleep(self.invalidation_delay)
+            await self.backend.delete_namespace(namespace)
+        finally:
+            del self._invalidations[namespace]
+
+    async def close(self) -> None:
+        """Perform pending invalidations without waiting for the delay and release resources used by the backend."""
+
+        for namespace, task in list(self._invalidations.items()):
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await self.backend.delete_namespace(namespace)
+
+        await self.backend.close()
+
+    async def get_or_set(
+        self, key: str, factory: Callable[[], Awaitable[Result]], result_type: type[Result] = Any
+    ) -> Result:
+        """Return cached value for the key or compute it with the factory and store it.
+
+        Stored values are parsed back using the result type.
+        """
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+
+        try:
+            value = await self._get_or_set(key, factory, result_type)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when there are no other requests waiting for it
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+        future.set_result(value)
+
+        return value
+
+    async def _get_or_set(
+        self, key: str, factory: Callable[[], Awaitable[Result]], result_type: type[Result]
+    ) -> Result:
+        # The version is taken before the computation, so results computed while the namespace is invalidated are
+        # never returned
+        data, version = await self.backend.get(key)
+        if data is not None:
+            self.hits += 1
+            return parse_raw_as(result_type, data)
+
+        self.misses += 1
+
+        value = await factory()
+        await self.backend.set(key, dumps_json(value), self.ttl, version)
+
+        return value
+
+
+def cached_result(method: Callable[..., Awaitable[Result]]) -> Callable[..., Awaitable[Result]]:
+    """Cache results of the CRUD method in the result cache of the CRUD instance when it's available.
+
+    Results are cached within the CRUD namespace and parsed back using the method return annotation.
+    """
+
+    result_type = typing.get_type_hints(method).get('return', Any)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args: Any, **kwds: Any) -> Result:
+        if self.cache is None:
+            return await method(self, *args, **kwds)
+
+        key = make_cache_key(str(self), method.__name__, *args, **kwds)
+
+        return await self.cache.get_or_set(key, lambda: method(self, *args, **kwds), result_type)
+
+    return wrapper
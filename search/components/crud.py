@@ -4,21 +4,47 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import asyncio
+import copy
 import os
+import re
+from collections.abc import AsyncIterator
 from typing import Any
 from typing import ClassVar
 
 from elasticsearch import AsyncElasticsearch
-
+from elasticsearch import NotFoundError
+from elasticsearch import TransportError
+from opentelemetry import trace
+from pydantic import ValidationError
+
+from search.components.cache import ResultCache
+from search.components.exceptions import CursorMismatch
+from search.components.exceptions import InvalidCursor
 from search.components.filtering import Filtering
 from search.components.index import INDEX_SETTINGS
+from search.components.index import compare_properties
+from search.components.index import get_index_sort_settings
+from search.components.models import BulkCreateError
+from search.components.models import BulkCreateResult
 from search.components.models import Model
+from search.components.models import get_model_defaults
+from search.components.multi_search import MultiSearch
+from search.components.pagination import CountRelation
+from search.components.pagination import Cursor
+from search.components.pagination import CursorPagination
 from search.components.pagination import Page
 from search.components.pagination import PageType
 from search.components.pagination import Pagination
+from search.components.pagination import get_cursor_digest
+from search.components.projection import Projection
 from search.components.schemas import BaseSchema
 from search.components.search_query import SearchQuery
 from search.components.sorting import Sorting
+from search.components.write_buffer import CreatedHook
+from search.components.write_buffer import WriteBuffer
+
+tracer = trace.get_tracer(__name__)
 
 
 class CRUD:
@@ -27,65 +53,375 @@ class CRUD:
     index: ClassVar[str | list[str]]
     index_settings: ClassVar[dict[str, Any]] = INDEX_SETTINGS
     index_mappings: ClassVar[dict[str, Any]] = {}
+    index_sort: ClassVar[dict[str, str]] = {}
     model: ClassVar[Model]
+    point_in_time_keep_alive: ClassVar[str] = '1m'
+    point_in_time_tiebreaker: ClassVar[dict[str, str]] = {'_shard_doc': 'asc'}
+    bulk_chunk_size: ClassVar[int] = 500
+    bulk_concurrency: ClassVar[int] = 4
+    composite_size: ClassVar[int] = 1000
+    updated_time_field: ClassVar[str | None] = None
 
     client: AsyncElasticsearch
-
-    def __init__(self, client: AsyncElasticsearch) -> None:
+    cache: ResultCache | None
+    write_buffer: WriteBuffer | None
+    multi_search: MultiSearch | None
+
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        cache: ResultCache | None = None,
+        write_buffer: WriteBuffer | None = None,
+    ) -> None:
         self.client = client
+        self.cache = cache
+        self.write_buffer = write_buffer
+        self.multi_search = None
 
     def __str__(self) -> str:
         return self.__class__.__name__
 
+    def with_multi_search(self, multi_search: MultiSearch) -> 'CRUD':
+        """Return a copy of the CRUD which sends its searches as part of the shared multi-search batch."""
+
+        crud = copy.copy(self)
+        crud.multi_search = multi_search
+
+        return crud
+
     def _generate_pk(self) -> str:
         """Generate random primary key for a document."""
 
         return os.urandom(10).hex()
 
+    def _get_document_source(self, document: dict[str, Any]) -> dict[str, Any]:
+        """Return elasticsearch document source extended with the primary key."""
+
+        document['_source']['pk'] = document['_id']
+        return document['_source']
+
+    def _get_raw_document_source(
+        self, document: dict[str, Any], projection: Projection | None = None
+    ) -> dict[str, Any]:
+        """Return elasticsearch document source with defaults of selected model fields that are missing in it.
+
+        Defaults are filled the same way as while parsing the source into a model, so raw sources render the same
+        content as parsed entries.
+        """
+
+        source = self._get_document_source(document)
+
+        for name, default in get_model_defaults(self.model).items():
+            if name not in source and (projection is None or projection.selects(name)):
+                source[name] = default
+
+        return source
+
     def _parse_document(self, document: dict[str, Any]) -> Model:
         """Parse elasticsearch document source into a model instance."""
-        document['_source']['pk'] = document['_id']
-        return self.model.parse_obj(document['_source'])
 
-    def _parse_documents(self, documents: list[dict[str, Any]]) -> list[Model]:
+        return self.model.parse_obj(self._get_document_source(document))
+
+    def _parse_partial_document(self, document: dict[str, Any], projection: Projection) -> Model:
+        """Parse projected elasticsearch document source into a model instance.
+
+        Only fields kept by the projection are validated and set, the rest of the model fields are left unset.
+        """
+
+        source = self._get_document_source(document)
+
+        values = {}
+        errors = []
+        for name, field in self.model.__fields__.items():
+            if field.alias in source:
+                value = source[field.alias]
+            elif projection.selects(name) and not field.required:
+                value = field.get_default()
+            else:
+                continue
+
+            values[name], error = field.validate(value, values, loc=field.alias, cls=self.model)
+            if error:
+                errors.append(error)
+
+        if errors:
+            raise ValidationError(errors, self.model)
+
+        entry = self.model.__new__(self.model)
+        object.__setattr__(entry, '__dict__', values)
+        object.__setattr__(entry, '__fields_set__', set(values))
+
+        return entry
+
+    def _parse_documents(self, documents: list[dict[str, Any]], projection: Projection | None = None) -> list[Model]:
         """Parse a list of elasticsearch document sources into a list of model instances."""
 
+        if projection:
+            return [self._parse_partial_document(document, projection) for document in documents]
+
         return [self._parse_document(document) for document in documents]
 
     async def _create_one(self, **kwds: Any) -> dict[str, Any]:
-        """Use elasticsearch client to create one document."""
+        """Use elasticsearch client to create one document.
+
+        The document is created as part of a _bulk request when the write buffer is set and there are no other request
+        parameters. The model of the document is passed to the created hook of the CRUD then.
+        """
+
+        model = kwds.pop('model', None)
+        kwds.setdefault('index', self.index)
+
+        if self.write_buffer is not None and kwds.keys() == {'index', 'id', 'document'}:
+            hook = self.get_created_hook() if model is not None else None
+            pk = await self.write_buffer.create(kwds['index'], kwds['id'], kwds['document'], hook, model)
+            return {'_index': kwds['index'], '_id': pk, 'result': 'created'}
+
+        return await self.client.create(**kwds)
 
-        return await self.client.create(index=self.index, **kwds)
+    def get_created_hook(self) -> CreatedHook | None:
+        """Return the hook the write buffer calls once per flush with models of documents created through it."""
+
+        return None
 
     async def _retrieve_one(self, **kwds: Any) -> dict[str, Any]:
         """Use elasticsearch client to retrieve one document."""
 
-        return await self.client.get(index=self.index, **kwds)
+        kwds.setdefault('index', self.index)
+
+        return await self.client.get(**kwds)
+
+    async def _retrieve_many(self, documents: list[dict[str, str]], **kwds: Any) -> dict[str, Any]:
+        """Use elasticsearch client to retrieve multiple documents identified by _id and optional _index."""
+
+        return await self.client.mget(index=self.index, body={'docs': documents}, **kwds)
+
+    async def _bulk(self, operations: list[dict[str, Any] | str], **kwds: Any) -> dict[str, Any]:
+        """Use elasticsearch client to execute multiple operations in one _bulk request."""
+
+        return await self.client.bulk(index=self.index, body=operations, **kwds)
 
     async def _search(self, **kwds: Any) -> dict[str, Any]:
-        """Use elasticsearch client to execute a search query and get back search hits."""
+        """Use elasticsearch client to execute a search query and get back search hits.
+
+        Searches against a point in time snapshot target the snapshot indices and are never batched.
+        """
+
+        if 'pit' in kwds:
+            return await self.client.search(**kwds)
+
+        kwds.setdefault('index', self.index)
+
+        if self.multi_search is not None:
+            return await self.multi_search.search(**kwds)
 
-        return await self.client.search(index=self.index, **kwds)
+        return await self.client.search(**kwds)
+
+    async def _search_point_in_time(self, point_in_time_id: str, **kwds: Any) -> dict[str, Any]:
+        """Execute a search query against the point in time snapshot."""
+
+        point_in_time = {'id': point_in_time_id, 'keep_alive': self.point_in_time_keep_alive}
+
+        return await self._search(pit=point_in_time, **kwds)
+
+    def _is_own_index(self, index: str) -> bool:
+        """Check if the index is one of the CRUD indices, their partitions or their reindexed versions."""
+
+        names = [self.index] if isinstance(self.index, str) else self.index
+
+        return any(re.fullmatch(rf'{re.escape(name)}(-\d{{4}}\.\d{{2}})?(-v\d+)?', index) for name in names)
+
+    async def _open_point_in_time(self) -> str:
+        """Open a point in time snapshot of the index and return its id."""
+
+        result = await self.client.open_point_in_time(index=self.index, keep_alive=self.point_in_time_keep_alive)
+
+        return result['id']
+
+    async def _close_point_in_time(self, point_in_time_id: str) -> None:
+        """Release the point in time snapshot before it expires."""
+
+        await self.client.close_point_in_time(body={'id': point_in_time_id}, ignore=404)
+
+    def get_index_settings(self) -> dict[str, Any]:
+        """Return settings for a new index including index sorting."""
+
+        return {**self.index_settings, **get_index_sort_settings(self.index_sort)}
 
     async def create_index(self) -> None:
         """Create a new index."""
 
-        await self.client.indices.create(index=self.index, mappings=self.index_mappings, settings=self.index_settings)
+        await self.client.indices.create(
+            index=self.index, mappings=self.index_mappings, settings=self.get_index_settings()
+        )
+
+    async def get_unsorted_indices(self) -> list[str]:
+        """Return existing indices which are not sorted the way defined in the index sort.
+
+        Index sorting can be set only when an index is created, so these indices have to be reindexed.
+        """
+
+        expected = get_index_sort_settings(self.index_sort).get('index', {})
+        settings = await self.client.indices.get_settings(index=self.index, name='index.sort.*')
+
+        unsorted = []
+        for index, index_settings in settings.items():
+            sort = index_settings['settings'].get('index', {}).get('sort', {})
+            current = {f'sort.{name}': value for name, value in sort.items() if name in ('field', 'order')}
+            if current != expected:
+                unsorted.append(index)
+
+        return sorted(unsorted)
+
+    async def get_mappings_drift(self) -> tuple[dict[str, dict[str, Any]], dict[str, list[str]]]:
+        """Compare mappings of existing indices with the index mappings.
+
+        Return properties missing in each index and names of fields mapped differently in each index.
+        """
+
+        expected = self.index_mappings.get('properties', {})
+        mappings = await self.client.indices.get_mapping(index=self.index)
+
+        missing = {}
+        conflicts = {}
+        for index, index_mappings in sorted(mappings.items()):
+            index_missing, index_conflicts = compare_properties(
+                expected, index_mappings['mappings'].get('properties', {})
+            )
+            if index_missing:
+                missing[index] = index_missing
+            if index_conflicts:
+                conflicts[index] = index_conflicts
+
+        return missing, conflicts
+
+    async def update_mappings(self, index: str, properties: dict[str, Any]) -> None:
+        """Add properties to mappings of one existing index."""
+
+        await self.client.indices.put_mapping(index=index, body={'properties': properties})
 
     async def is_index_exists(self) -> bool:
         """Check if index exists."""
 
         return await self.client.indices.exists(index=self.index)
 
+    async def delete_index(self) -> None:
+        """Remove an existing index."""
+
+        await self.client.indices.delete(index=self.index)
+
+    async def get_write_index(self, model: BaseSchema) -> str:
+        """Return the index a new entry is written into."""
+
+        return self.index
+
     async def create(self, model: BaseSchema, **kwds: Any) -> Model:
         """Create a new entry."""
 
-        document = await self._create_one(id=self._generate_pk(), document=model.json(ensure_ascii=False), **kwds)
+        document = await self._create_one(
+            index=await self.get_write_index(model),
+            id=self._generate_pk(),
+            document=model.json(ensure_ascii=False),
+            model=model,
+            **kwds,
+        )
+
+        if self.cache is not None:
+            await self.cache.invalidate(str(self))
 
-        entry = await self.retrieve_by_pk(document['_id'])
+        document = await self._retrieve_one(index=document['_index'], id=document['_id'])
+        entry = self._parse_document(document)
 
         return entry
 
+    async def _bulk_create_chunk(
+        self, models: list[BaseSchema], indices: list[str], pks: list[str], start: int, **kwds: Any
+    ) -> list[BulkCreateError]:
+        """Send one chunk of documents in a _bulk request and return errors of documents that were not created.
+
+        Documents get positions starting from the start of the chunk, all of them fail when the whole request fails.
+        """
+
+        operations = []
+        for index, pk, model in zip(indices, pks, models):
+            operations.extend([{'create': {'_index': index, '_id': pk}}, model.json(ensure_ascii=False)])
+
+        try:
+            result = await self._bulk(operations, **kwds)
+        except TransportError as e:
+            status = e.status_code if isinstance(e.status_code, int) else None
+            return [
+                BulkCreateError(position=position, pk=pk, status=status, type=e.error, reason=str(e.info))
+                for position, pk in enumerate(pks, start)
+            ]
+
+        if not result['errors']:
+            return []
+
+        errors = []
+        for position, item in enumerate(result['items'], start):
+            operation = item['create']
+            if 'error' not in operation:
+                continue
+
+            error = operation['error']
+            errors.append(
+                BulkCreateError(
+                    position=position,
+                    pk=operation['_id'],
+                    status=operation['status'],
+                    type=error.get('type'),
+                    reason=error.get('reason'),
+                )
+            )
+
+        return errors
+
+    async def bulk_create(
+        self,
+        models: list[BaseSchema],
+        chunk_size: int | None = None,
+        concurrency: int | None = None,
+        read_back: bool = False,
+        **kwds: Any,
+    ) -> BulkCreateResult:
+        """Create multiple entries sending them in chunks of _bulk requests executed concurrently.
+
+        Created entries are retrieved only when read_back is set.
+        """
+
+        chunk_size = chunk_size or self.bulk_chunk_size
+        semaphore = asyncio.Semaphore(concurrency or self.bulk_concurrency)
+        indices = [await self.get_write_index(model) for model in models]
+        pks = [self._generate_pk() for _ in models]
+
+        async def create_chunk(start: int) -> list[BulkCreateError]:
+            async with semaphore:
+                end = start + chunk_size
+                return await self._bulk_create_chunk(
+                    models[start:end], indices[start:end], pks[start:end], start, **kwds
+                )
+
+        chunks = await asyncio.gather(*[create_chunk(start) for start in range(0, len(models), chunk_size)])
+
+        errors = [error for chunk in chunks for error in chunk]
+        failed = {error.position for error in errors}
+        created = [
+            {'_index': index, '_id': pk}
+            for position, (index, pk) in enumerate(zip(indices, pks))
+            if position not in failed
+        ]
+
+        if self.cache is not None and created:
+            await self.cache.invalidate(str(self))
+
+        entries = None
+        if read_back:
+            entries = await self._retrieve_documents(created, chunk_size)
+
+        return BulkCreateResult(
+            pks=[None if position in failed else pk for position, pk in enumerate(pks)], errors=errors, entries=entries
+        )
+
     async def retrieve_by_pk(self, pk: str) -> Model:
         """Get an existing entry by primary key."""
 
@@ -95,32 +431,251 @@ class CRUD:
 
         return entry
 
+    async def _retrieve_documents(self, documents: list[dict[str, str]], chunk_size: int) -> list[Model]:
+        """Get existing entries in chunks of _mget requests, missing entries are skipped."""
+
+        entries = []
+        for start in range(0, len(documents), chunk_size):
+            end = start + chunk_size
+            result = await self._retrieve_many(documents[start:end])
+            entries.extend(self._parse_documents([document for document in result['docs'] if document['found']]))
+
+        return entries
+
+    async def retrieve_by_pks(self, pks: list[str], chunk_size: int | None = None) -> list[Model]:
+        """Get existing entries by primary keys in chunks of _mget requests, missing entries are skipped."""
+
+        return await self._retrieve_documents([{'_id': pk} for pk in pks], chunk_size or self.bulk_chunk_size)
+
     async def _list(self, **kwds: Any) -> dict[str, Any]:
         """Get a list of entries by executing a search."""
         return await self._search(**kwds)
 
-    async def _paginate_list_result(self, result: dict[str, Any], pagination: Pagination) -> Page:
-        """Create a response page from list result."""
-        count = result['hits']['total']['value']
-        entries = self._parse_documents(result['hits']['hits'])
+    async def _paginate_list_result(
+        self,
+        result: dict[str, Any],
+        pagination: Pagination,
+        raw: bool = False,
+        projection: Projection | None = None,
+    ) -> Page:
+        """Create a response page from list result.
+
+        When raw is set, page entries are document sources that are neither parsed into models nor validated.
+        When projection is set, page entries are partial models with only projected fields.
+        Count is empty when total hits were not tracked.
+        """
+        count = count_relation = None
+
+        total = result['hits'].get('total')
+        if total is not None:
+            count = total['value']
+            count_relation = CountRelation(total['relation'])
+
+        if raw:
+            entries = [self._get_raw_document_source(document, projection) for document in result['hits']['hits']]
+            return Page.construct(
+                pagination=pagination, count=count, count_relation=count_relation, entries=entries, next_cursor=None
+            )
+
+        entries = self._parse_documents(result['hits']['hits'], projection)
+
+        return Page(pagination=pagination, count=count, count_relation=count_relation, entries=entries)
+
+    async def _list_with_cursor(
+        self,
+        query: dict[str, Any],
+        sort: list[dict[str, Any]] | None,
+        pagination: CursorPagination,
+        raw: bool = False,
+        projection: Projection | None = None,
+    ) -> Page:
+        """Get a page of entries using search_after within the point in time snapshot.
+
+        Point in time snapshot is taken from the cursor when it's provided, so results stay consistent while the client
+        walks through the pages. Query and sorting are always built from request parameters and must match the ones
+        the cursor was created for, as well as the indices its snapshot returns hits from.
+        """
+
+        sort = [*(sort or []), self.point_in_time_tiebreaker]
+        digest = get_cursor_digest(self.index, query, sort)
+
+        cursor = pagination.cursor
+        if cursor is None:
+            cursor = Cursor(point_in_time_id=await self._open_point_in_time(), digest=digest, search_after=[], page=1)
+        elif not cursor.matches(digest, sort):
+            raise CursorMismatch()
+
+        kwds = {}
+        if cursor.search_after:
+            kwds['search_after'] = cursor.search_after
+
+        if projection:
+            kwds['_source'] = projection.apply()
+
+        try:
+            result = await self._search_point_in_time(
+                cursor.point_in_time_id,
+                query=query,
+                sort=sort,
+                size=pagination.size,
+                track_total_hits=pagination.track_total_hits,
+                **kwds,
+            )
+        except NotFoundError:
+            raise InvalidCursor()
+
+        if not all(self._is_own_index(hit['_index']) for hit in result['hits']['hits']):
+            raise CursorMismatch()
+
+        page = await self._paginate_list_result(result, pagination, raw, projection)
+
+        hits = result['hits']['hits']
+        if len(hits) < pagination.size:
+            await self._close_point_in_time(result['pit_id'])
+            return page
+
+        page.next_cursor = Cursor(
+            point_in_time_id=result['pit_id'],
+            digest=cursor.digest,
+            search_after=hits[-1]['sort'],
+            page=pagination.page,
+        ).encode()
+
+        return page
+
+    def _align_sort_with_index_sort(
+        self, sort: list[dict[str, Any]], filtering: Filtering | None = None
+    ) -> list[dict[str, Any]]:
+        """Prefix sort with leading index sort fields that are matched by filtering to exactly one value.
+
+        The prefix doesn't change the order of results, but searches sorted the same way as the index can terminate
+        early instead of collecting all matching documents.
+        """
+
+        if filtering is None:
+            return sort
+
+        prefix = []
+        for field, order in self.index_sort.items():
+            if sort[:1] == [{field: order}]:
+                return [*prefix, *sort]
+
+            if not filtering.is_exact(field):
+                break
+
+            prefix.append({field: order})
+
+        return sort
+
+    def _build_query(self, filtering: Filtering | None = None) -> dict[str, Any]:
+        """Build search query with applied filtering.
+
+        The build is traced in its own span with the filtering shape, so the cost of each query shape is visible
+        next to the elasticsearch request when tracing is enabled.
+        """
+
+        with tracer.start_as_current_span('build_query') as span:
+            search_query = SearchQuery()
+
+            if filtering is not None and (filtering or not hasattr(filtering, 'container_type')):
+                if span.is_recording():
+                    span.set_attribute('search.filtering', type(filtering).__name__)
+                    span.set_attribute('search.filtering.shape', filtering.get_shape())
+                filtering.apply(search_query)
+
+            return search_query.build()
+
+    async def _iterate_composite_buckets(
+        self,
+        query: dict[str, Any],
+        sources: list[dict[str, Any]],
+        aggregations: dict[str, Any] | None = None,
+        **kwds: Any,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Iterate over pages of composite aggregation buckets following the after key of each page."""
+
+        composite = {'size': self.composite_size, 'sources': sources}
+        while True:
+            buckets = {'composite': composite}
+            if aggregations:
+                buckets['aggs'] = aggregations
+
+            result = await self._search(query=query, size=0, aggregations={'buckets': buckets}, **kwds)
+            page = result['aggregations']['buckets']
+            if not page['buckets']:
+                return
+
+            yield page['buckets']
+
+            # A page with fewer buckets than requested is the last one
+            if 'after_key' not in page or len(page['buckets']) < self.composite_size:
+                return
+            composite = {**composite, 'after': page['after_key']}
+
+    async def iterate_sources(
+        self, filtering: Filtering | None = None, batch_size: int = 1000
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Iterate over sources of all filtered documents in batches within the point in time snapshot.
+
+        Only one batch is kept in memory at a time and documents are not parsed into models.
+        """
+
+        query = self._build_query(filtering)
+        sort = [self.point_in_time_tiebreaker]
+        point_in_time_id = await self._open_point_in_time()
+
+        try:
+            kwds = {}
+            while True:
+                result = await self._search_point_in_time(
+                    point_in_time_id, query=query, sort=sort, size=batch_size, track_total_hits=False, **kwds
+                )
+                point_in_time_id = result['pit_id']
+
+                hits = result['hits']['hits']
+                if hits:
+                    yield [self._get_document_source(hit) for hit in hits]
+
+                if len(hits) < batch_size:
+                    break
 
-        return Page(pagination=pagination, count=count, entries=entries)
+                kwds['search_after'] = hits[-1]['sort']
+        finally:
+            await self._close_point_in_time(point_in_time_id)
 
     async def list(
-        self, pagination: Pagination, sorting: Sorting | None = None, filtering: Filtering | None = None
+        self,
+        pagination: Pagination,
+        sorting: Sorting | None = None,
+        filtering: Filtering | None = None,
+        projection: Projection | None = None,
+        raw: bool = False,
     ) -> PageType:
-        """Get all existing entries with pagination, sorting and filtering support."""
-        search_query = SearchQuery()
+        """Get all existing entries with pagination, sorting, filtering and source fields projection support.
+
+        When raw is set, page entries are trusted document sources instead of model instances.
+        """
 
         sort = None
         if sorting:
-            sort = sorting.apply()
+            sort = self._align_sort_with_index_sort(sorting.apply(), filtering)
+
+        query = self._build_query(filtering)
 
-        if filtering or not hasattr(filtering, 'container_type'):
-            filtering.apply(search_query)
+        if isinstance(pagination, CursorPagination):
+            return await self._list_with_cursor(query, sort, pagination, raw, projection)
 
-        query = search_query.build()
+        kwds = {}
+        if projection:
+            kwds['_source'] = projection.apply()
 
-        result = await self._list(query=query, sort=sort, size=pagination.size, from_=pagination.from_)
+        result = await self._list(
+            query=query,
+            sort=sort,
+            size=pagination.size,
+            from_=pagination.from_,
+            track_total_hits=pagination.track_total_hits,
+            **kwds,
+        )
 
-        return await self._paginate_list_result(result, pagination)
+        return await self._paginate_list_result(result, pagination, raw, projection)
@@ -8,33 +8,50 @@ from typing import Any
 
 from search.components.crud import CRUD
 from search.components.dataset_activity.index import DATASET_ACTIVITY_INDEX_MAPPINGS
+from search.components.dataset_activity.index import DATASET_ACTIVITY_INDEX_SORT
 from search.components.dataset_activity.models import DatasetActivity
 from search.components.dataset_activity.models import DatasetAndItemActivity
 from search.components.dataset_activity.models import DatasetAndItemActivityIndex
+from search.components.partitioning import PartitionedCRUD
+from search.components.partitioning import TimePartitioning
 
 
-class DatasetActivityCRUD(CRUD):
-    """CRUD for managing dataset activity logs."""
+class DatasetActivityCRUD(PartitionedCRUD):
+    """CRUD for managing dataset activity logs stored in monthly partitions."""
 
     index = 'datasets-activity-logs'
     index_mappings = DATASET_ACTIVITY_INDEX_MAPPINGS
+    index_sort = DATASET_ACTIVITY_INDEX_SORT
     model = DatasetActivity
+    updated_time_field = 'activity_time'
+    partitioning = TimePartitioning(alias='datasets-activity-logs', field='activity_time')
 
 
 class DatasetAndItemActivityCRUD(CRUD):
-    """CRUD for managing combined dataset and item activity logs."""
+    """CRUD for managing combined dataset and item activity logs.
+
+    Documents are searched through read aliases, so source indices are resolved by prefixes of their partition names,
+    which may also carry a version suffix once reindexed. Both dataset and item activity partitions are sorted the same
+    way.
+    """
 
     index = ['datasets-activity-logs', 'items-activity-logs']
+    index_sort = DATASET_ACTIVITY_INDEX_SORT
     model = DatasetAndItemActivity
     index_to_model_index_mapping = {
         'datasets-activity-logs': DatasetAndItemActivityIndex.DATASET,
         'items-activity-logs': DatasetAndItemActivityIndex.ITEM,
     }
 
-    def _parse_document(self, document: dict[str, Any]) -> DatasetAndItemActivity:
-        """Parse elasticsearch document source into a model instance."""
+    def _get_document_source(self, document: dict[str, Any]) -> dict[str, Any]:
+        """Return elasticsearch document source extended with the primary key and the source index."""
+
+        source = super()._get_document_source(document)
+        index = document['_index']
+        alias = next(
+            alias for alias in self.index_to_model_index_mapping if index == alias or index.startswith(f'{alias}-')
+        )
 
-        document['_source']['pk'] = document['_id']
-        document['_source']['index'] = self.index_to_model_index_mapping[document['_index']]
+        source['index'] = self.index_to_model_index_mapping[alias]
 
-        return self.model.parse_obj(document['_source'])
+        return source
@@ -7,8 +7,20 @@
 from elasticsearch import AsyncElasticsearch
 from fastapi import Depends
 
+from search.components.dataset_activity.crud import DatasetActivityCRUD
 from search.components.dataset_activity.crud import DatasetAndItemActivityCRUD
+from search.components.write_buffer import WriteBuffer
 from search.dependencies import get_elasticsearch_client
+from search.dependencies import get_write_buffer
+
+
+def get_dataset_activity_crud(
+    elasticsearch_client: AsyncElasticsearch = Depends(get_elasticsearch_client),
+    write_buffer: WriteBuffer | None = Depends(get_write_buffer),
+) -> DatasetActivityCRUD:
+    """Return an instance of DatasetActivityCRUD as a dependency."""
+
+    return DatasetActivityCRUD(elasticsearch_client, write_buffer=write_buffer)
 
 
 def get_dataset_and_item_activity_crud(
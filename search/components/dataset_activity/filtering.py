@@ -15,6 +15,8 @@ from search.components.search_query import SearchQuery
 class DatasetAndItemActivityFiltering(Filtering):
     """Dataset and item activity filtering control parameters."""
 
+    exact_fields = frozenset({'container_code'})
+
     activity_type: str | None = None
     activity_time_start: datetime | None = None
     activity_time_end: datetime | None = None
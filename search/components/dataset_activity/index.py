@@ -9,7 +9,7 @@ DATASET_ACTIVITY_INDEX_MAPPINGS = {
         'activity_time': {'type': 'date', 'format': 'epoch_second'},
         'activity_type': {'type': 'keyword'},
         'changes': {
-            'type': 'nested',
+            'type': 'object',
             'properties': {
                 'property': {'type': 'keyword'},
                 'new_value': {'type': 'keyword'},
@@ -23,3 +23,5 @@ DATASET_ACTIVITY_INDEX_MAPPINGS = {
         'version': {'type': 'keyword'},
     },
 }
+
+DATASET_ACTIVITY_INDEX_SORT = {'container_code': 'asc', 'activity_time': 'desc'}
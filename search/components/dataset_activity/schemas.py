@@ -16,6 +16,8 @@ from search.components.dataset_activity.models import DatasetAndItemActivityInde
 from search.components.encoders import datetime_as_timestamp_encoder
 from search.components.item_activity.schemas import ItemActivitySchema
 from search.components.schemas import BaseSchema
+from search.components.schemas import BulkCreateResponseSchema
+from search.components.schemas import BulkCreateSchema
 from search.components.schemas import ListResponseSchema
 
 
@@ -52,3 +54,15 @@ class DatasetAndItemActivityListResponseSchema(ListResponseSchema):
     """Default schema for multiple dataset and item activities in response."""
 
     result: list[Annotated[DatasetActivityIndexedSchema | ItemActivityIndexedSchema, Field(discriminator='index')]]
+
+
+class DatasetActivityBulkCreateSchema(BulkCreateSchema):
+    """Dataset activities schema used for bulk creation."""
+
+    items: list[DatasetActivityCreateSchema]
+
+
+class DatasetActivityBulkCreateResponseSchema(BulkCreateResponseSchema):
+    """Default schema for result of dataset activities bulk creation in response."""
+
+    result: list[DatasetActivitySchema] | None = None
@@ -6,14 +6,26 @@
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi.responses import StreamingResponse
 
+from search.components.dataset_activity.crud import DatasetActivityCRUD
 from search.components.dataset_activity.crud import DatasetAndItemActivityCRUD
+from search.components.dataset_activity.dependencies import get_dataset_activity_crud
 from search.components.dataset_activity.dependencies import get_dataset_and_item_activity_crud
 from search.components.dataset_activity.parameters import DatasetActivitySortByFields
 from search.components.dataset_activity.parameters import DatasetAndItemActivityFilterParameters
+from search.components.dataset_activity.schemas import DatasetActivityBulkCreateResponseSchema
+from search.components.dataset_activity.schemas import DatasetActivityBulkCreateSchema
 from search.components.dataset_activity.schemas import DatasetAndItemActivityListResponseSchema
+from search.components.export import create_ndjson_response
+from search.components.parameters import BulkCreateParameters
+from search.components.parameters import ExportParameters
 from search.components.parameters import PageParameters
+from search.components.parameters import ProjectionParameters
 from search.components.parameters import SortParameters
+from search.components.responses import ORJSONResponse
+from search.config import Settings
+from search.config import get_settings
 
 router = APIRouter(prefix='/dataset-activity-logs', tags=['Dataset Activity'])
 
@@ -25,15 +37,58 @@ async def list_dataset_and_item_activity_logs(
     filter_parameters: DatasetAndItemActivityFilterParameters = Depends(),
     sort_parameters: SortParameters.with_sort_by_fields(DatasetActivitySortByFields) = Depends(),
     page_parameters: PageParameters = Depends(),
+    projection_parameters: ProjectionParameters.with_fields(
+        DatasetAndItemActivityListResponseSchema.get_result_fields()
+    ) = Depends(),
     dataset_and_item_activity_crud: DatasetAndItemActivityCRUD = Depends(get_dataset_and_item_activity_crud),
-) -> DatasetAndItemActivityListResponseSchema:
+    settings: Settings = Depends(get_settings),
+) -> ORJSONResponse:
     """List dataset and item activity logs."""
 
     filtering = filter_parameters.to_filtering()
     sorting = sort_parameters.to_sorting()
     pagination = page_parameters.to_pagination()
+    projection = projection_parameters.to_projection()
 
-    page = await dataset_and_item_activity_crud.list(pagination, sorting, filtering)
-    response = DatasetAndItemActivityListResponseSchema.from_page(page)
+    if 'dataset-activity-logs' in settings.FAST_LIST_RESPONSE_ENDPOINTS:
+        page = await dataset_and_item_activity_crud.list(pagination, sorting, filtering, projection, raw=True)
+        return DatasetAndItemActivityListResponseSchema.render_page(page, projection)
 
-    return response
+    page = await dataset_and_item_activity_crud.list(pagination, sorting, filtering, projection)
+    response = DatasetAndItemActivityListResponseSchema.from_page(page, projection)
+
+    return ORJSONResponse(response)
+
+
+@router.get(
+    '/export', summary='Export all dataset and items activity logs as NDJSON.', response_class=StreamingResponse
+)
+async def export_dataset_and_item_activity_logs(
+    filter_parameters: DatasetAndItemActivityFilterParameters = Depends(),
+    export_parameters: ExportParameters = Depends(),
+    dataset_and_item_activity_crud: DatasetAndItemActivityCRUD = Depends(get_dataset_and_item_activity_crud),
+) -> StreamingResponse:
+    """Export dataset and item activity logs."""
+
+    filtering = filter_parameters.to_filtering()
+    batches = dataset_and_item_activity_crud.iterate_sources(filtering, export_parameters.batch_size)
+
+    return create_ndjson_response(batches, 'dataset-activity-logs', export_parameters.compress)
+
+
+@router.post(
+    '/bulk', summary='Create multiple dataset activity logs.', response_model=DatasetActivityBulkCreateResponseSchema
+)
+async def bulk_create_dataset_activity_logs(
+    data: DatasetActivityBulkCreateSchema,
+    parameters: BulkCreateParameters = Depends(),
+    dataset_activity_crud: DatasetActivityCRUD = Depends(get_dataset_activity_crud),
+    settings: Settings = Depends(get_settings),
+) -> DatasetActivityBulkCreateResponseSchema:
+    """Create multiple dataset activity logs in chunks of bulk requests."""
+
+    result = await dataset_activity_crud.bulk_create(
+        data.items, settings.BULK_CREATE_CHUNK_SIZE, settings.BULK_CREATE_CONCURRENCY, parameters.read_back
+    )
+
+    return DatasetActivityBulkCreateResponseSchema.from_result(result)
@@ -5,6 +5,10 @@
 # You may not use this file except in compliance with the License.
 
 from datetime import datetime
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
 
 
 def datetime_to_timestamp(value: datetime) -> int:
@@ -16,3 +20,21 @@ def datetime_to_timestamp(value: datetime) -> int:
 datetime_as_timestamp_encoder = {
     datetime: datetime_to_timestamp,
 }
+
+
+def encode_json_default(value: Any) -> Any:
+    """Convert values that are not supported by orjson natively into serializable ones."""
+
+    if isinstance(value, BaseModel):
+        return value.dict(by_alias=True)
+
+    raise TypeError(f'Type is not JSON serializable: {type(value).__name__}')
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize content into json bytes using orjson.
+
+    UUID, datetime and enum values, including StrEnum members, are serialized natively without the generic encoder.
+    """
+
+    return orjson.dumps(content, default=encode_json_default, option=orjson.OPT_NON_STR_KEYS)
@@ -7,6 +7,7 @@
 from abc import ABCMeta
 from abc import abstractmethod
 from collections.abc import Sequence
+from http.client import BAD_REQUEST
 from http.client import INTERNAL_SERVER_ERROR
 from http.client import UNPROCESSABLE_ENTITY
 
@@ -64,6 +65,38 @@ class UnhandledException(ServiceException):
         return 'Unexpected Internal Server Error'
 
 
+class InvalidCursor(ServiceException):
+    """Raised when pagination cursor cannot be decoded or its point in time has expired."""
+
+    @property
+    def status(self) -> int:
+        return BAD_REQUEST
+
+    @property
+    def code(self) -> str:
+        return 'invalid_cursor'
+
+    @property
+    def details(self) -> str:
+        return 'Pagination cursor is invalid or expired'
+
+
+class CursorMismatch(ServiceException):
+    """Raised when pagination cursor was created for a different endpoint, filters or sorting."""
+
+    @property
+    def status(self) -> int:
+        return UNPROCESSABLE_ENTITY
+
+    @property
+    def code(self) -> str:
+        return 'cursor_mismatch'
+
+    @property
+    def details(self) -> str:
+        return 'Pagination cursor does not match the requested endpoint, filters or sorting'
+
+
 class ServiceValidationError(ServiceException):
     """Raised when validation error is raised."""
 
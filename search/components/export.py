@@ -0,0 +1,55 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import zlib
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+from search.components.encoders import dumps_json
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+GZIP_MEDIA_TYPE = 'application/gzip'
+
+
+async def encode_ndjson(batches: AsyncIterator[list[dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """Encode each batch of documents into one chunk of newline delimited json."""
+
+    async for batch in batches:
+        yield b''.join(dumps_json(document) + b'\n' for document in batch)
+
+
+async def compress_gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress stream of chunks into gzip format on the fly."""
+
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+
+def create_ndjson_response(
+    batches: AsyncIterator[list[dict[str, Any]]], filename: str, compress: bool = False
+) -> StreamingResponse:
+    """Create streaming response with documents exported as optionally gzip-compressed newline delimited json."""
+
+    content = encode_ndjson(batches)
+    media_type = NDJSON_MEDIA_TYPE
+    filename = f'{filename}.ndjson'
+
+    if compress:
+        content = compress_gzip(content)
+        media_type = GZIP_MEDIA_TYPE
+        filename = f'{filename}.gz'
+
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+
+    return StreamingResponse(content, media_type=media_type, headers=headers)
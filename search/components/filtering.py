@@ -4,25 +4,40 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from typing import ClassVar
+
 from pydantic import BaseModel
 
 from search.components.search_query import SearchQuery
 
 
 class Filtering(BaseModel):
-    """Base filtering control parameters."""
+    """Base filtering control parameters.
+
+    Exact fields are matched with term queries against attributes of the same names.
+    """
+
+    exact_fields: ClassVar[frozenset[str]] = frozenset()
 
     def __bool__(self) -> bool:
         """Filtering considered valid when at least one attribute has a value."""
 
-        values = self.dict()
-
         for name in self.__fields__.keys():
-            if values[name] is not None:
+            if getattr(self, name) is not None:
                 return True
 
         return False
 
+    def get_shape(self) -> list[str]:
+        """Return names of attributes with values, which define the structure of the applied query."""
+
+        return [name for name in self.__fields__.keys() if getattr(self, name) is not None]
+
+    def is_exact(self, field: str) -> bool:
+        """Check if filtering matches only one value of the field."""
+
+        return field in self.exact_fields and bool(getattr(self, field))
+
     def apply(self, search_query: SearchQuery) -> None:
         """Add filtering into search query."""
 
@@ -4,9 +4,113 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from typing import Any
+
+NGRAM_SIZE = 3
+
 INDEX_SETTINGS = {
     'analysis': {
-        'analyzer': {'path_analyzer': {'tokenizer': 'path_tokenizer'}},
-        'tokenizer': {'path_tokenizer': {'type': 'path_hierarchy', 'delimiter': '.'}},
+        'analyzer': {
+            'path_analyzer': {'tokenizer': 'path_tokenizer'},
+            'ngram_analyzer': {'tokenizer': 'ngram_tokenizer', 'filter': ['lowercase', 'asciifolding']},
+            'suggest_analyzer': {'tokenizer': 'suggest_tokenizer', 'filter': ['lowercase', 'asciifolding']},
+            'suggest_search_analyzer': {'tokenizer': 'words_tokenizer', 'filter': ['lowercase', 'asciifolding']},
+        },
+        'normalizer': {'folding_normalizer': {'type': 'custom', 'filter': ['lowercase', 'asciifolding']}},
+        'tokenizer': {
+            'path_tokenizer': {'type': 'path_hierarchy', 'delimiter': '.'},
+            'ngram_tokenizer': {'type': 'ngram', 'min_gram': NGRAM_SIZE, 'max_gram': NGRAM_SIZE},
+            'suggest_tokenizer': {
+                'type': 'edge_ngram',
+                'min_gram': 1,
+                'max_gram': 20,
+                'token_chars': ['letter', 'digit'],
+            },
+            'words_tokenizer': {'type': 'pattern', 'pattern': '[^\\p{L}\\p{N}]+'},
+        },
     }
 }
+
+# Subfields for case and accent insensitive searches, queried with SearchQuery.match_normalized_text
+NORMALIZED_TEXT_FIELDS = {
+    'keyword': {'type': 'keyword'},
+    'normalized': {'type': 'keyword', 'normalizer': 'folding_normalizer'},
+    'ngram': {'type': 'text', 'analyzer': 'ngram_analyzer'},
+}
+
+
+def get_index_sort_settings(index_sort: dict[str, str]) -> dict[str, Any]:
+    """Return index settings that keep documents in segments sorted by fields in the given orders."""
+
+    if not index_sort:
+        return {}
+
+    return {'index': {'sort.field': list(index_sort), 'sort.order': list(index_sort.values())}}
+
+
+def has_nested_fields(mappings: dict[str, Any]) -> bool:
+    """Check if mappings contain nested fields, which are not compatible with index sorting."""
+
+    for field in mappings.get('properties', {}).values():
+        if field.get('type') == 'nested' or has_nested_fields(field):
+            return True
+
+    return False
+
+
+def compare_properties(
+    expected: dict[str, Any], actual: dict[str, Any], prefix: str = ''
+) -> tuple[dict[str, Any], list[str]]:
+    """Return properties missing in the actual mapping properties and names of fields mapped differently.
+
+    Missing properties are returned in the shape accepted by the put mapping API, so only additive changes that
+    elasticsearch can apply to existing indices are included. Fields which exist only in actual properties are ignored.
+    """
+
+    missing = {}
+    conflicts = []
+    for name, field in expected.items():
+        path = f'{prefix}{name}'
+        if name not in actual:
+            missing[name] = field
+            continue
+
+        current = actual[name]
+        parameters = (field.keys() | current.keys()) - {'type', 'properties', 'fields'}
+        is_conflict = field.get('type', 'object') != current.get('type', 'object') or any(
+            field.get(parameter) != current.get(parameter) for parameter in parameters
+        )
+        if is_conflict:
+            conflicts.append(path)
+            continue
+
+        missing_properties, properties_conflicts = compare_properties(
+            field.get('properties', {}), current.get('properties', {}), f'{path}.'
+        )
+        missing_fields, fields_conflicts = compare_properties(
+            field.get('fields', {}), current.get('fields', {}), f'{path}.'
+        )
+        conflicts.extend(properties_conflicts + fields_conflicts)
+
+        if missing_properties:
+            missing[name] = {**field, 'properties': missing_properties}
+        elif missing_fields:
+            missing[name] = {**field, 'fields': missing_fields}
+
+    return missing, conflicts
+
+
+def get_field_names(properties: dict[str, Any], prefix: str = '') -> list[str]:
+    """Return dotted names of leaf fields and multi-fields defined in mapping properties."""
+
+    names = []
+    for name, field in properties.items():
+        path = f'{prefix}{name}'
+        if 'properties' in field:
+            names.extend(get_field_names(field['properties'], f'{path}.'))
+            continue
+
+        names.append(path)
+        names.extend(get_field_names(field.get('fields', {}), f'{path}.'))
+
+    return names
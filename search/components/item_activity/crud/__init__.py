@@ -4,8 +4,10 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from search.components.item_activity.crud.activity_counters import ActivityCounterCRUD
 from search.components.item_activity.crud.crud import ItemActivityCRUD
 
 __all__ = [
+    'ActivityCounterCRUD',
     'ItemActivityCRUD',
 ]
@@ -0,0 +1,215 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import hashlib
+import json
+from collections import Counter
+from collections.abc import AsyncIterator
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import ClassVar
+
+from search.components.crud import CRUD
+from search.components.item_activity.filtering import ItemActivityProjectFileActivityFiltering
+from search.components.item_activity.index import ITEM_ACTIVITY_COUNTER_INDEX_MAPPINGS
+from search.components.item_activity.index import ITEM_ACTIVITY_COUNTER_INDEX_SORT
+from search.components.item_activity.models import ItemActivityCounter
+from search.components.item_activity.models import ItemActivityCounterMismatch
+from search.components.models import ContainerType
+from search.components.schemas import BaseSchema
+from search.components.search_query import SearchQuery
+
+CounterKey = tuple[str, int, str, str, int]
+
+
+class ActivityCounterCRUD(CRUD):
+    """CRUD for hourly counters of project item activities by zone, activity type and user.
+
+    Counters are incremented when item activities are created through ItemActivityCRUD and are rebuilt from item
+    activity logs by the backfill. Hourly counters serve daily buckets in any time zone with a whole hour offset.
+    """
+
+    index = 'items-activity-counters'
+    index_mappings = ITEM_ACTIVITY_COUNTER_INDEX_MAPPINGS
+    index_sort = ITEM_ACTIVITY_COUNTER_INDEX_SORT
+    model = ItemActivityCounter
+    source_index: ClassVar[str] = 'items-activity-logs'
+    key_fields: ClassVar[tuple[str, ...]] = ('container_code', 'zone', 'activity_type', 'user', 'hour')
+
+    def _get_counter_id(self, key: CounterKey) -> str:
+        """Return document id of the counter, the same key always gets the same id."""
+
+        return hashlib.sha1(json.dumps(key).encode()).hexdigest()
+
+    def _get_counter_document(self, key: CounterKey, count: int) -> dict[str, Any]:
+        return {**dict(zip(self.key_fields, key)), 'count': count}
+
+    def _get_key_sources(self, user_field: str, time_field: str) -> list[dict[str, Any]]:
+        """Return composite aggregation sources producing counter keys."""
+
+        return [
+            {'container_code': {'terms': {'field': 'container_code'}}},
+            {'zone': {'terms': {'field': 'zone'}}},
+            {'activity_type': {'terms': {'field': 'activity_type'}}},
+            {'user': {'terms': {'field': user_field}}},
+            {'hour': {'date_histogram': {'field': time_field, 'fixed_interval': '1h'}}},
+        ]
+
+    def _get_bucket_key(self, bucket: dict[str, Any]) -> CounterKey:
+        key = bucket['key']
+        return key['container_code'], key['zone'], key['activity_type'], key['user'], key['hour'] // 1000
+
+    async def increment(self, models: list[BaseSchema]) -> None:
+        """Increment counters of project item activities."""
+
+        counts = Counter()
+        for model in models:
+            if model.container_type != ContainerType.PROJECT:
+                continue
+
+            hour = int(model.activity_time.timestamp()) // 3600 * 3600
+            counts[(model.container_code, model.zone, model.activity_type.value, model.user, hour)] += 1
+
+        if not counts:
+            return
+
+        operations = []
+        for key, count in counts.items():
+            operations.append(
+                {'update': {'_index': self.index, '_id': self._get_counter_id(key), 'retry_on_conflict': 5}}
+            )
+            operations.append(
+                {
+                    'script': {'source': 'ctx._source.count += params.count', 'params': {'count': count}},
+                    'upsert': self._get_counter_document(key, count),
+                }
+            )
+
+        result = await self._bulk(operations)
+        if result['errors']:
+            raise RuntimeError(f'Failed to increment item activity counters: {result["items"]}.')
+
+    async def _iterate_activity_log_counts(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> AsyncIterator[dict[CounterKey, int]]:
+        """Iterate over pages of project item activity counts aggregated from item activity logs."""
+
+        search_query = SearchQuery()
+        search_query.match_term('container_type', ContainerType.PROJECT.value)
+        if start is not None:
+            search_query.match_range('activity_time', gte=int(start.timestamp()))
+        if end is not None:
+            search_query.match_range('activity_time', lt=int(end.timestamp()))
+
+        sources = self._get_key_sources('user.keyword', 'activity_time')
+        async for buckets in self._iterate_composite_buckets(search_query.build(), sources, index=self.source_index):
+            yield {self._get_bucket_key(bucket): bucket['doc_count'] for bucket in buckets}
+
+    async def _iterate_counts(self, start: datetime, end: datetime) -> AsyncIterator[dict[CounterKey, int]]:
+        """Iterate over pages of stored counters."""
+
+        search_query = SearchQuery()
+        search_query.match_range('hour', gte=int(start.timestamp()), lt=int(end.timestamp()))
+
+        sources = self._get_key_sources('user', 'hour')
+        aggregations = {'count': {'sum': {'field': 'count'}}}
+        async for buckets in self._iterate_composite_buckets(search_query.build(), sources, aggregations):
+            yield {self._get_bucket_key(bucket): int(bucket['count']['value']) for bucket in buckets}
+
+    async def backfill(self, start: datetime | None = None, end: datetime | None = None) -> int:
+        """Overwrite counters with numbers of activities in item activity logs and return number of written counters.
+
+        Activities created while the backfill is running may be counted twice or not at all for the hours that are
+        being backfilled, so the consistency should be checked afterwards.
+        """
+
+        written = 0
+        async for counts in self._iterate_activity_log_counts(start, end):
+            operations = []
+            for key, count in counts.items():
+                operations.append({'index': {'_index': self.index, '_id': self._get_counter_id(key)}})
+                operations.append(self._get_counter_document(key, count))
+
+            result = await self._bulk(operations)
+            if result['errors']:
+                raise RuntimeError(f'Failed to write item activity counters: {result["items"]}.')
+            written += len(counts)
+
+        return written
+
+    async def check_consistency(self, start: datetime, end: datetime) -> list[ItemActivityCounterMismatch]:
+        """Return counters that don't match numbers of activities aggregated from item activity logs.
+
+        The range is extended to whole hours, so it covers complete counters.
+        """
+
+        start = datetime.fromtimestamp(int(start.timestamp()) // 3600 * 3600, tz=timezone.utc)
+        end = datetime.fromtimestamp(-(-int(end.timestamp()) // 3600) * 3600, tz=timezone.utc)
+
+        expected = {}
+        async for counts in self._iterate_activity_log_counts(start, end):
+            expected.update(counts)
+
+        actual = {}
+        async for counts in self._iterate_counts(start, end):
+            actual.update(counts)
+
+        mismatches = []
+        for key in sorted(expected.keys() | actual.keys()):
+            if expected.get(key, 0) == actual.get(key, 0):
+                continue
+
+            container_code, zone, activity_type, user, hour = key
+            mismatches.append(
+                ItemActivityCounterMismatch(
+                    container_code=container_code,
+                    zone=zone,
+                    activity_type=activity_type,
+                    user=user,
+                    hour=datetime.fromtimestamp(hour, tz=timezone.utc),
+                    expected=expected.get(key, 0),
+                    actual=actual.get(key, 0),
+                )
+            )
+
+        return mismatches
+
+    async def search_file_activity(
+        self, filtering: ItemActivityProjectFileActivityFiltering, aggregations: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Aggregate counters matching the project file activity filtering."""
+
+        search_query = SearchQuery()
+        search_query.match_term('container_code', filtering.project_code)
+        search_query.match_term('activity_type', filtering.activity_type.value)
+        search_query.match_range(
+            'hour', gte=int(filtering.from_date.timestamp()), lt=int(filtering.to_date.timestamp())
+        )
+        if filtering.user is not None:
+            search_query.match_term('user', filtering.user)
+
+        return await self._search(query=search_query.build(), size=0, aggregations=aggregations)
+
+    async def search_transfer_statistics(
+        self,
+        project_codes: list[str],
+        activity_types: list[str],
+        start: datetime,
+        end: datetime,
+        aggregations: dict[str, Any],
+        zone: int | None = None,
+    ) -> dict[str, Any]:
+        """Aggregate counters of activity types in the projects between start and end inclusive."""
+
+        search_query = SearchQuery()
+        search_query.match_multiple_terms('container_code', project_codes)
+        search_query.match_range('hour', gte=int(start.timestamp()), lte=int(end.timestamp()))
+        search_query.match_multiple_terms('activity_type', activity_types)
+        if zone is not None:
+            search_query.match_term('zone', zone)
+
+        return await self._search(query=search_query.build(), size=0, aggregations=aggregations)
@@ -7,42 +7,168 @@
 from datetime import datetime
 from datetime import time
 from datetime import timezone
+from typing import Any
 
-from search.components.crud import CRUD
+from elasticsearch import AsyncElasticsearch
+
+from search.components.cache import ResultCache
+from search.components.cache import cached_result
+from search.components.item_activity.crud.activity_counters import ActivityCounterCRUD
 from search.components.item_activity.crud.file_activity import FileActivityHandler
 from search.components.item_activity.filtering import ItemActivityProjectFileActivityFiltering
 from search.components.item_activity.index import ITEM_ACTIVITY_INDEX_MAPPINGS
+from search.components.item_activity.index import ITEM_ACTIVITY_INDEX_SORT
 from search.components.item_activity.models import ActivityGroupBy
 from search.components.item_activity.models import ItemActivity
 from search.components.item_activity.models import ItemActivityTransferStatistics
 from search.components.item_activity.models import ItemActivityType
+from search.components.models import BulkCreateResult
 from search.components.models import ContainerType
+from search.components.partitioning import PartitionedCRUD
+from search.components.partitioning import TimePartitioning
+from search.components.schemas import BaseSchema
 from search.components.search_query import SearchQuery
+from search.components.write_buffer import CreatedHook
+from search.components.write_buffer import WriteBuffer
+from search.logger import logger
 
 
-class ItemActivityCRUD(CRUD):
-    """CRUD for managing documents in items-activity-logs index."""
+class ItemActivityCRUD(PartitionedCRUD):
+    """CRUD for managing documents in monthly partitions behind items-activity-logs alias."""
 
     index = 'items-activity-logs'
     index_mappings = ITEM_ACTIVITY_INDEX_MAPPINGS
+    index_sort = ITEM_ACTIVITY_INDEX_SORT
     model = ItemActivity
+    updated_time_field = 'activity_time'
+    partitioning = TimePartitioning(alias='items-activity-logs', field='activity_time')
+
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        cache: ResultCache | None = None,
+        write_buffer: WriteBuffer | None = None,
+        count_activities: bool = False,
+        read_activity_counters: bool = False,
+    ) -> None:
+        super().__init__(client, cache, write_buffer)
+        self.count_activities = count_activities
+        self.read_activity_counters = read_activity_counters
+
+    @property
+    def activity_counters(self) -> ActivityCounterCRUD:
+        """Return CRUD for hourly activity counters sharing the client and the multi-search batch."""
+
+        crud = ActivityCounterCRUD(self.client)
+        crud.multi_search = self.multi_search
+
+        return crud
+
+    async def _increment_activity_counters(self, models: list[BaseSchema]) -> None:
+        """Count created activities without failing the creation when counters can't be incremented."""
+
+        if not self.count_activities or not models:
+            return
+
+        try:
+            await self.activity_counters.increment(models)
+        except Exception:
+            logger.exception('Unable to increment item activity counters.')
+
+    @classmethod
+    async def _count_buffered_activities(cls, client: AsyncElasticsearch, models: list[BaseSchema]) -> None:
+        """Count activities created through the write buffer with one request per flush."""
+
+        try:
+            await ActivityCounterCRUD(client).increment(models)
+        except Exception:
+            logger.exception('Unable to increment item activity counters.')
+
+    def get_created_hook(self) -> CreatedHook | None:
+        """Return the hook counting activities created through the write buffer when counting is enabled.
+
+        The hook is bound to the class, so activities created by all CRUD instances are counted together.
+        """
+
+        if not self.count_activities:
+            return None
+
+        return ItemActivityCRUD._count_buffered_activities
+
+    async def create(self, model: BaseSchema, **kwds: Any) -> ItemActivity:
+        """Create a new entry and count it in activity counters.
+
+        Entries created through the write buffer are counted by its created hook once the buffer is flushed.
+        """
+
+        entry = await super().create(model, **kwds)
+
+        if self.write_buffer is None or kwds:
+            await self._increment_activity_counters([model])
+
+        return entry
+
+    async def bulk_create(
+        self,
+        models: list[BaseSchema],
+        chunk_size: int | None = None,
+        concurrency: int | None = None,
+        read_back: bool = False,
+        **kwds: Any,
+    ) -> BulkCreateResult:
+        """Create multiple entries and count the created ones in activity counters."""
+
+        result = await super().bulk_create(models, chunk_size, concurrency, read_back, **kwds)
+        await self._increment_activity_counters([model for model, pk in zip(models, result.pks) if pk is not None])
+
+        return result
+
+    def _get_day_range(self, date: datetime, time_zone: str) -> tuple[datetime, datetime]:
+        """Return start and inclusive end of the day of the date in the time zone."""
 
-    async def get_project_transfer_statistics(
-        self, project_code: str, date: datetime, time_zone: str, parent_path: str | None = None, zone: int | None = None
-    ) -> ItemActivityTransferStatistics:
-        """Get aggregated project transfer statistics."""
         parsed_tz = datetime.strptime(time_zone, '%z')
         day_considering_timezone = date.astimezone(tz=parsed_tz.tzinfo).date()
         start_of_day = datetime.combine(day_considering_timezone, time(0, 0, 0, tzinfo=timezone.utc))
         end_of_day = datetime.combine(day_considering_timezone, time(23, 59, 59, tzinfo=timezone.utc))
 
+        return start_of_day, end_of_day
+
+    async def _search_transfer_statistics(
+        self,
+        project_codes: list[str],
+        date: datetime,
+        time_zone: str,
+        parent_path: str | None = None,
+        zone: int | None = None,
+        group_by_project: bool = False,
+    ) -> dict[str, Any]:
+        """Aggregate uploads and downloads of the projects on the day of the date by activity types.
+
+        Activity types buckets are nested into buckets of each project when grouped by project.
+        """
+
+        start_of_day, end_of_day = self._get_day_range(date, time_zone)
+        activity_types = [ItemActivityType.UPLOAD.value, ItemActivityType.DOWNLOAD.value]
+        use_counters = self.read_activity_counters and parent_path is None
+
+        aggregations = {'activity_types': {'terms': {'field': 'activity_type'}}}
+        if use_counters:
+            aggregations['activity_types']['aggs'] = {'count': {'sum': {'field': 'count'}}}
+        if group_by_project:
+            aggregations = {
+                'projects': {'terms': {'field': 'container_code', 'size': len(project_codes)}, 'aggs': aggregations}
+            }
+
+        if use_counters:
+            return await self.activity_counters.search_transfer_statistics(
+                project_codes, activity_types, start_of_day, end_of_day, aggregations, zone
+            )
+
         search_query = SearchQuery()
         search_query.match_term('container_type', ContainerType.PROJECT.value)
-        search_query.match_term('container_code', project_code)
+        search_query.match_multiple_terms('container_code', project_codes)
         search_query.match_range('activity_time', gte=int(start_of_day.timestamp()), lte=int(end_of_day.timestamp()))
-        search_query.match_multiple_terms(
-            'activity_type', [ItemActivityType.UPLOAD.value, ItemActivityType.DOWNLOAD.value]
-        )
+        search_query.match_multiple_terms('activity_type', activity_types)
         if parent_path is not None:
             search_query.match_text('item_parent_path.keyword', parent_path)
         if zone is not None:
@@ -50,18 +176,26 @@ class ItemActivityCRUD(CRUD):
 
         query = search_query.build()
 
-        aggregations = {'activity_types': {'terms': {'field': 'activity_type'}}}
+        return await self._search(
+            index=await self.get_search_index(start_of_day, end_of_day),
+            ignore_unavailable=True,
+            query=query,
+            size=0,
+            aggregations=aggregations,
+        )
 
-        result = await self._search(query=query, size=0, aggregations=aggregations)
+    def _get_transfer_statistics(self, buckets: list[dict[str, Any]]) -> ItemActivityTransferStatistics:
+        """Return transfer statistics from buckets of the activity types aggregation."""
 
         mapping = {
             ItemActivityType.UPLOAD: 0,
             ItemActivityType.DOWNLOAD: 0,
         }
 
-        for bucket in result['aggregations']['activity_types']['buckets']:
+        for bucket in buckets:
+            count = int(bucket['count']['value']) if 'count' in bucket else bucket['doc_count']
             try:
-                mapping[bucket['key']] += bucket['doc_count']
+                mapping[bucket['key']] += count
             except KeyError:
                 pass
 
@@ -70,19 +204,64 @@ class ItemActivityCRUD(CRUD):
             downloaded=mapping[ItemActivityType.DOWNLOAD],
         )
 
+    async def get_project_transfer_statistics(
+        self, project_code: str, date: datetime, time_zone: str, parent_path: str | None = None, zone: int | None = None
+    ) -> ItemActivityTransferStatistics:
+        """Get aggregated project transfer statistics."""
+
+        result = await self._search_transfer_statistics([project_code], date, time_zone, parent_path, zone)
+
+        return self._get_transfer_statistics(result['aggregations']['activity_types']['buckets'])
+
+    async def get_projects_transfer_statistics(
+        self, project_codes: list[str], date: datetime, time_zone: str, zone: int | None = None
+    ) -> dict[str, ItemActivityTransferStatistics]:
+        """Get aggregated transfer statistics of multiple projects in one search."""
+
+        project_codes = list(dict.fromkeys(project_codes))
+
+        result = await self._search_transfer_statistics(
+            project_codes, date, time_zone, zone=zone, group_by_project=True
+        )
+
+        statistics = {
+            project_code: ItemActivityTransferStatistics(uploaded=0, downloaded=0) for project_code in project_codes
+        }
+        for bucket in result['aggregations']['projects']['buckets']:
+            statistics[bucket['key']] = self._get_transfer_statistics(bucket['activity_types']['buckets'])
+
+        return statistics
+
+    @cached_result
     async def get_project_file_activity(
         self, filtering: ItemActivityProjectFileActivityFiltering, time_zone: str, group_by: ActivityGroupBy
     ) -> dict[str, int]:
-        """Get aggregated project file activity filtered by dates and grouped into separate buckets."""
-        search_query = SearchQuery()
-        filtering.apply(search_query)
-        query = search_query.build()
+        """Get aggregated project file activity filtered by dates and grouped into separate buckets.
+
+        Activity counters are used when they are enabled and hourly counters can be grouped into buckets exactly.
+        """
 
         file_activity_handler = FileActivityHandler(
             from_date=filtering.from_date, to_date=filtering.to_date, time_zone=time_zone, group_by=group_by
         )
+
+        if self.read_activity_counters and file_activity_handler.is_hour_aligned():
+            aggregations = file_activity_handler.get_aggregations('hour', 'count')
+            result = await self.activity_counters.search_file_activity(filtering, aggregations)
+            return file_activity_handler.process_search_result(result)
+
+        search_query = SearchQuery()
+        filtering.apply(search_query)
+        query = search_query.build()
+
         aggregations = file_activity_handler.get_aggregations()
 
-        result = await self._search(query=query, size=0, aggregations=aggregations)
+        result = await self._search(
+            index=await self.get_search_index(filtering.from_date, filtering.to_date),
+            ignore_unavailable=True,
+            query=query,
+            size=0,
+            aggregations=aggregations,
+        )
 
         return file_activity_handler.process_search_result(result)
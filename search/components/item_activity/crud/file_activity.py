@@ -47,13 +47,24 @@ class FileActivityHandler(BaseModel):
 
         return sorted(keys)
 
-    def get_aggregations(self) -> dict[str, Any]:
-        """Return aggregations to retrieve data."""
+    def is_hour_aligned(self) -> bool:
+        """Check if the date range and buckets in the time zone consist of whole UTC hours."""
 
-        return {
+        offset = datetime.strptime(self.time_zone, '%z').utcoffset()
+        dates = [self.from_date, self.to_date]
+
+        return offset.total_seconds() % 3600 == 0 and all(date.timestamp() % 3600 == 0 for date in dates)
+
+    def get_aggregations(self, field: str = 'activity_time', count_field: str | None = None) -> dict[str, Any]:
+        """Return aggregations to retrieve data.
+
+        Activities are counted by documents or by the sum of the count field when it's set.
+        """
+
+        aggregations = {
             'group_by_activity_time': {
                 'date_histogram': {
-                    'field': 'activity_time',
+                    'field': field,
                     'calendar_interval': self.grouping_interval,
                     'min_doc_count': 0,
                     'time_zone': self.time_zone,
@@ -63,6 +74,11 @@ class FileActivityHandler(BaseModel):
             },
         }
 
+        if count_field is not None:
+            aggregations['group_by_activity_time']['aggs'] = {'count': {'sum': {'field': count_field}}}
+
+        return aggregations
+
     def process_search_result(self, result: dict[str, Any]) -> dict[str, int]:
         """Process search result and categorize into datasets per day."""
 
@@ -74,6 +90,9 @@ class FileActivityHandler(BaseModel):
             mapping[key] = 0
 
         for date_key, date in buckets_by_activity_time.items():
-            mapping[date_key] = date['doc_count']
+            if 'count' in date:
+                mapping[date_key] = int(date['count']['value'])
+            else:
+                mapping[date_key] = date['doc_count']
 
         return mapping
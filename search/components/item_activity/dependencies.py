@@ -7,13 +7,28 @@
 from elasticsearch import AsyncElasticsearch
 from fastapi import Depends
 
+from search.components.cache import ResultCache
 from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.write_buffer import WriteBuffer
+from search.config import Settings
+from search.config import get_settings
 from search.dependencies import get_elasticsearch_client
+from search.dependencies import get_result_cache
+from search.dependencies import get_write_buffer
 
 
 def get_item_activity_crud(
     elasticsearch_client: AsyncElasticsearch = Depends(get_elasticsearch_client),
+    result_cache: ResultCache | None = Depends(get_result_cache),
+    write_buffer: WriteBuffer | None = Depends(get_write_buffer),
+    settings: Settings = Depends(get_settings),
 ) -> ItemActivityCRUD:
     """Return an instance of ItemActivityCRUD as a dependency."""
 
-    return ItemActivityCRUD(elasticsearch_client)
+    return ItemActivityCRUD(
+        elasticsearch_client,
+        result_cache,
+        write_buffer,
+        count_activities=settings.ACTIVITY_COUNTERS_WRITE_ENABLED,
+        read_activity_counters=settings.ACTIVITY_COUNTERS_READ_ENABLED,
+    )
@@ -35,6 +35,8 @@ class ItemActivityProjectFileActivityFiltering(Filtering):
 class ItemActivityProjectFiltering(Filtering):
     """Item activity filtering control parameters."""
 
+    exact_fields = frozenset({'container_code'})
+
     activity_type: str | None = None
     activity_time_start: datetime | None = None
     activity_time_end: datetime | None = None
@@ -9,7 +9,7 @@ ITEM_ACTIVITY_INDEX_MAPPINGS = {
         'activity_time': {'type': 'date', 'format': 'epoch_second'},
         'activity_type': {'type': 'keyword'},
         'changes': {
-            'type': 'nested',
+            'type': 'object',
             'properties': {
                 'item_property': {'type': 'keyword'},
                 'new_value': {'type': 'keyword'},
@@ -28,3 +28,18 @@ ITEM_ACTIVITY_INDEX_MAPPINGS = {
         'zone': {'type': 'byte'},
     },
 }
+
+ITEM_ACTIVITY_INDEX_SORT = {'container_code': 'asc', 'activity_time': 'desc'}
+
+ITEM_ACTIVITY_COUNTER_INDEX_MAPPINGS = {
+    'properties': {
+        'container_code': {'type': 'keyword'},
+        'zone': {'type': 'byte'},
+        'activity_type': {'type': 'keyword'},
+        'user': {'type': 'keyword'},
+        'hour': {'type': 'date', 'format': 'epoch_second'},
+        'count': {'type': 'long'},
+    },
+}
+
+ITEM_ACTIVITY_COUNTER_INDEX_SORT = {'container_code': 'asc', 'hour': 'asc'}
@@ -57,3 +57,26 @@ class ItemActivityTransferStatistics(BaseModel):
 
     uploaded: int
     downloaded: int
+
+
+class ItemActivityCounter(BaseModel):
+    """Number of project item activities of one type made by one user in one zone within one hour."""
+
+    container_code: str
+    zone: int
+    activity_type: str
+    user: str
+    hour: datetime
+    count: int
+
+
+class ItemActivityCounterMismatch(BaseModel):
+    """Counter that doesn't match the number of activities in item activity logs."""
+
+    container_code: str
+    zone: int
+    activity_type: str
+    user: str
+    hour: datetime
+    expected: int
+    actual: int
@@ -12,6 +12,8 @@ from search.components.encoders import datetime_as_timestamp_encoder
 from search.components.item_activity.models import ItemActivityType
 from search.components.models import ContainerType
 from search.components.schemas import BaseSchema
+from search.components.schemas import BulkCreateResponseSchema
+from search.components.schemas import BulkCreateSchema
 from search.components.schemas import ListResponseSchema
 
 
@@ -41,3 +43,15 @@ class ItemActivityListResponseSchema(ListResponseSchema):
     """Default schema for item activities in response."""
 
     result: list[ItemActivitySchema]
+
+
+class ItemActivityBulkCreateSchema(BulkCreateSchema):
+    """Item activities schema used for bulk creation."""
+
+    items: list[ItemActivityCreateSchema]
+
+
+class ItemActivityBulkCreateResponseSchema(BulkCreateResponseSchema):
+    """Default schema for result of item activities bulk creation in response."""
+
+    result: list[ItemActivitySchema] | None = None
@@ -6,14 +6,24 @@
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi.responses import StreamingResponse
 
+from search.components.export import create_ndjson_response
 from search.components.item_activity.crud import ItemActivityCRUD
 from search.components.item_activity.dependencies import get_item_activity_crud
 from search.components.item_activity.parameters import ItemActivityFilterParameters
 from search.components.item_activity.parameters import ItemActivitySortByFields
+from search.components.item_activity.schemas import ItemActivityBulkCreateResponseSchema
+from search.components.item_activity.schemas import ItemActivityBulkCreateSchema
 from search.components.item_activity.schemas import ItemActivityListResponseSchema
+from search.components.parameters import BulkCreateParameters
+from search.components.parameters import ExportParameters
 from search.components.parameters import PageParameters
+from search.components.parameters import ProjectionParameters
 from search.components.parameters import SortParameters
+from search.components.responses import ORJSONResponse
+from search.config import Settings
+from search.config import get_settings
 
 router = APIRouter(prefix='/item-activity-logs', tags=['Item Activity'])
 
@@ -23,15 +33,56 @@ async def list_item_activity_logs(
     filter_parameters: ItemActivityFilterParameters = Depends(),
     sort_parameters: SortParameters.with_sort_by_fields(ItemActivitySortByFields) = Depends(),
     page_parameters: PageParameters = Depends(),
+    projection_parameters: ProjectionParameters.with_fields(
+        ItemActivityListResponseSchema.get_result_fields()
+    ) = Depends(),
     item_activity_crud: ItemActivityCRUD = Depends(get_item_activity_crud),
-) -> ItemActivityListResponseSchema:
+    settings: Settings = Depends(get_settings),
+) -> ORJSONResponse:
     """List item activity logs."""
 
     filtering = filter_parameters.to_filtering()
     sorting = sort_parameters.to_sorting()
     pagination = page_parameters.to_pagination()
+    projection = projection_parameters.to_projection()
 
-    page = await item_activity_crud.list(pagination, sorting, filtering)
-    response = ItemActivityListResponseSchema.from_page(page)
+    if 'item-activity-logs' in settings.FAST_LIST_RESPONSE_ENDPOINTS:
+        page = await item_activity_crud.list(pagination, sorting, filtering, projection, raw=True)
+        return ItemActivityListResponseSchema.render_page(page, projection)
 
-    return response
+    page = await item_activity_crud.list(pagination, sorting, filtering, projection)
+    response = ItemActivityListResponseSchema.from_page(page, projection)
+
+    return ORJSONResponse(response)
+
+
+@router.get('/export', summary='Export project items activity logs as NDJSON.', response_class=StreamingResponse)
+async def export_item_activity_logs(
+    filter_parameters: ItemActivityFilterParameters = Depends(),
+    export_parameters: ExportParameters = Depends(),
+    item_activity_crud: ItemActivityCRUD = Depends(get_item_activity_crud),
+) -> StreamingResponse:
+    """Export item activity logs."""
+
+    filtering = filter_parameters.to_filtering()
+    batches = item_activity_crud.iterate_sources(filtering, export_parameters.batch_size)
+
+    return create_ndjson_response(batches, 'item-activity-logs', export_parameters.compress)
+
+
+@router.post(
+    '/bulk', summary='Create multiple item activity logs.', response_model=ItemActivityBulkCreateResponseSchema
+)
+async def bulk_create_item_activity_logs(
+    data: ItemActivityBulkCreateSchema,
+    parameters: BulkCreateParameters = Depends(),
+    item_activity_crud: ItemActivityCRUD = Depends(get_item_activity_crud),
+    settings: Settings = Depends(get_settings),
+) -> ItemActivityBulkCreateResponseSchema:
+    """Create multiple item activity logs in chunks of bulk requests."""
+
+    result = await item_activity_crud.bulk_create(
+        data.items, settings.BULK_CREATE_CHUNK_SIZE, settings.BULK_CREATE_CONCURRENCY, parameters.read_back
+    )
+
+    return ItemActivityBulkCreateResponseSchema.from_result(result)
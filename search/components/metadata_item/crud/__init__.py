@@ -5,7 +5,9 @@
 # You may not use this file except in compliance with the License.
 
 from search.components.metadata_item.crud.crud import MetadataItemCRUD
+from search.components.metadata_item.crud.size_usage_rollup import SizeUsageRollupCRUD
 
 __all__ = [
     'MetadataItemCRUD',
+    'SizeUsageRollupCRUD',
 ]
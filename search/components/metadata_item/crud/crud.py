@@ -4,14 +4,18 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from search.components.cache import cached_result
 from search.components.crud import CRUD
 from search.components.metadata_item.crud.size_usage import SizeUsageHandler
+from search.components.metadata_item.crud.size_usage import get_range_queries
+from search.components.metadata_item.crud.size_usage_rollup import SizeUsageRollupCRUD
 from search.components.metadata_item.filtering import MetadataItemProjectSizeUsageFiltering
 from search.components.metadata_item.index import METADATA_ITEM_INDEX_MAPPINGS
 from search.components.metadata_item.models import MetadataItem
 from search.components.metadata_item.models import MetadataItemSizeStatistics
 from search.components.metadata_item.models import MetadataItemSizeUsage
 from search.components.metadata_item.models import MetadataItemStatus
+from search.components.metadata_item.models import MetadataItemSuggestion
 from search.components.metadata_item.models import MetadataItemType
 from search.components.metadata_item.models import SizeGroupBy
 from search.components.models import ContainerType
@@ -24,39 +28,110 @@ class MetadataItemCRUD(CRUD):
     index = 'metadata-items'
     index_mappings = METADATA_ITEM_INDEX_MAPPINGS
     model = MetadataItem
+    updated_time_field = 'last_updated_time'
 
+    @property
+    def size_usage_rollup(self) -> SizeUsageRollupCRUD:
+        """Return CRUD for the daily size usage rollup sharing the client and the multi-search batch."""
+
+        crud = SizeUsageRollupCRUD(self.client)
+        crud.multi_search = self.multi_search
+
+        return crud
+
+    async def suggest(
+        self, container_code: str, zone: int, text: str, size: int = 10, timeout: int | None = None
+    ) -> list[MetadataItemSuggestion]:
+        """Return active items of the container with names containing words that start with all words of the text.
+
+        Only fields of suggestions are fetched and the search returns hits found within the timeout in milliseconds.
+        """
+
+        search_query = SearchQuery()
+        search_query.match_term('container_code', container_code)
+        search_query.match_term('zone', zone)
+        search_query.match_term('status.keyword', MetadataItemStatus.ACTIVE.value)
+        search_query.match_all_words('name.suggest', text)
+
+        kwds = {}
+        if timeout is not None:
+            kwds['timeout'] = f'{timeout}ms'
+
+        result = await self._search(
+            query=search_query.build(),
+            size=size,
+            _source=list(MetadataItemSuggestion.__fields__),
+            track_total_hits=False,
+            **kwds,
+        )
+
+        return [MetadataItemSuggestion.parse_obj(hit['_source']) for hit in result['hits']['hits']]
+
+    @cached_result
     async def get_project_size_usage(
         self, filtering: MetadataItemProjectSizeUsageFiltering, time_zone: str, group_by: SizeGroupBy
     ) -> MetadataItemSizeUsage:
-        """Get aggregated project storage usage filtered by dates and grouped into separate buckets."""
+        """Get aggregated project storage usage filtered by dates and grouped into separate buckets.
 
-        search_query = SearchQuery()
-        filtering.apply(search_query)
-        query = search_query.build()
+        Whole days are taken from the daily size usage rollup when it's available and files are not filtered by parent
+        path, only the rest of the range is aggregated from metadata items.
+        """
 
         size_usage_handler = SizeUsageHandler(
             from_date=filtering.from_date, to_date=filtering.to_date, time_zone=time_zone, group_by=group_by
         )
+
+        state = None
+        if filtering.parent_path is None:
+            state = await self.size_usage_rollup.get_state()
+
+        if state is None:
+            rollup_ranges, raw_ranges = [], [(filtering.from_date, filtering.to_date)]
+        else:
+            rollup_ranges, raw_ranges = size_usage_handler.split_ranges(state.rolled_up_until)
+
         aggregations = size_usage_handler.get_aggregations()
+        pages = []
+        if raw_ranges:
+            search_query = SearchQuery()
+            filtering.apply(search_query)
+            if rollup_ranges:
+                search_query.match_any_range('created_time', get_range_queries(raw_ranges))
+            sources = size_usage_handler.get_composite_sources()
+            pages.append(self._iterate_composite_buckets(search_query.build(), sources, aggregations))
 
-        result = await self._search(query=query, size=0, aggregations=aggregations)
+        if rollup_ranges:
+            sources = size_usage_handler.get_composite_sources('day')
+            pages.append(
+                self.size_usage_rollup.iterate_project_size_usage(
+                    filtering.project_code, get_range_queries(rollup_ranges), sources, aggregations
+                )
+            )
 
-        return size_usage_handler.process_search_result(result)
+        return await size_usage_handler.process_search_result(*pages)
+
+    def _get_project_files_query(self, parent_path: str | None = None, zone: int | None = None) -> SearchQuery:
+        """Return query matching active project files, projects are matched by the caller."""
 
-    async def get_project_statistics(
-        self, project_code: str, parent_path: str | None = None, zone: int | None = None
-    ) -> MetadataItemSizeStatistics:
-        """Get aggregated project files statistics."""
         search_query = SearchQuery()
         search_query.match_term('type', MetadataItemType.FILE.value)
         search_query.match_term('container_type', ContainerType.PROJECT.value)
-        search_query.match_term('container_code', project_code)
         search_query.match_term('status.keyword', MetadataItemStatus.ACTIVE.value)
         if parent_path is not None:
             search_query.match_text('parent_path.keyword', parent_path)
         if zone is not None:
             search_query.match_term('zone', zone)
 
+        return search_query
+
+    @cached_result
+    async def get_project_statistics(
+        self, project_code: str, parent_path: str | None = None, zone: int | None = None
+    ) -> MetadataItemSizeStatistics:
+        """Get aggregated project files statistics."""
+        search_query = self._get_project_files_query(parent_path, zone)
+        search_query.match_term('container_code', project_code)
+
         query = search_query.build()
 
         aggregations = {'size': {'sum': {'field': 'size'}}}
@@ -67,3 +142,31 @@ class MetadataItemCRUD(CRUD):
         size = int(result['aggregations']['size']['value'])
 
         return MetadataItemSizeStatistics(count=count, size=size)
+
+    @cached_result
+    async def get_projects_statistics(
+        self, project_codes: list[str], zone: int | None = None
+    ) -> dict[str, MetadataItemSizeStatistics]:
+        """Get aggregated files statistics of multiple projects in one search."""
+
+        project_codes = list(dict.fromkeys(project_codes))
+
+        search_query = self._get_project_files_query(zone=zone)
+        search_query.match_multiple_terms('container_code', project_codes)
+
+        aggregations = {
+            'projects': {
+                'terms': {'field': 'container_code', 'size': len(project_codes)},
+                'aggs': {'size': {'sum': {'field': 'size'}}},
+            }
+        }
+
+        result = await self._search(query=search_query.build(), size=0, aggregations=aggregations)
+
+        statistics = {project_code: MetadataItemSizeStatistics(count=0, size=0) for project_code in project_codes}
+        for bucket in result['aggregations']['projects']['buckets']:
+            statistics[bucket['key']] = MetadataItemSizeStatistics(
+                count=bucket['doc_count'], size=int(bucket['size']['value'])
+            )
+
+        return statistics
@@ -4,11 +4,15 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import asyncio
 from collections import defaultdict
+from collections.abc import AsyncIterator
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
 from typing import Any
 
+from dateutil.relativedelta import relativedelta
 from dateutil.rrule import MONTHLY
 from dateutil.rrule import rrule
 from pydantic import BaseModel
@@ -18,6 +22,21 @@ from search.components.metadata_item.models import MetadataItemSizeUsageDataset
 from search.components.metadata_item.models import SizeGroupBy
 
 
+def as_utc(value: datetime) -> datetime:
+    """Return datetime in UTC considering naive datetime to be in UTC already."""
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+
+def get_range_queries(ranges: list[tuple[datetime, datetime]]) -> list[dict[str, int]]:
+    """Return range query parameters for datetime ranges with exclusive ends."""
+
+    return [{'gte': int(start.timestamp()), 'lt': int(end.timestamp())} for start, end in ranges]
+
+
 class SizeUsageHandler(BaseModel):
     """Process aggregated response to provide size usage statistic.
 
@@ -48,55 +67,105 @@ class SizeUsageHandler(BaseModel):
         keys = {date.strftime(self.manual_grouping_format) for date in dates_range}
         return sorted(keys)
 
-    def get_aggregations(self) -> dict[str, Any]:
-        """Return aggregations to retrieve data."""
-
-        return {
-            'group_by_zone': {
-                'terms': {'field': 'zone'},
-                'aggs': {
-                    'group_by_created_time': {
-                        'date_histogram': {
-                            'field': 'created_time',
-                            'calendar_interval': self.grouping_interval,
-                            'min_doc_count': 0,
-                            'time_zone': self.time_zone,
-                            'format': self.elasticsearch_grouping_format,
-                            'keyed': True,
-                        },
-                        'aggs': {
-                            'total_size': {'sum': {'field': 'size'}},
-                        },
-                    },
-                },
+    def get_composite_sources(self, field: str = 'created_time') -> list[dict[str, Any]]:
+        """Return composite aggregation sources grouping documents by zone and by the date field."""
+
+        return [
+            {'zone': {'terms': {'field': 'zone'}}},
+            {
+                'date': {
+                    'date_histogram': {
+                        'field': field,
+                        'calendar_interval': self.grouping_interval,
+                        'time_zone': self.time_zone,
+                        'format': self.elasticsearch_grouping_format,
+                    }
+                }
             },
-        }
+        ]
+
+    def get_aggregations(self) -> dict[str, Any]:
+        """Return aggregations calculated for each composite bucket."""
 
-    def process_search_result(self, result: dict[str, Any]) -> MetadataItemSizeUsage:
-        """Process search result and categorize into datasets per zone."""
+        return {'total_size': {'sum': {'field': 'size'}}}
 
-        buckets_by_zone = result['aggregations']['group_by_zone']['buckets']
-        available_zones = {zone['key'] for zone in buckets_by_zone}
+    def get_grouping_boundaries(self) -> list[datetime]:
+        """Return UTC datetimes where buckets of the time zone start within the date range."""
 
-        grouping_keys = self.get_grouping_keys()
+        time_zone = datetime.strptime(self.time_zone, '%z').tzinfo
+        start = as_utc(self.from_date).astimezone(time_zone)
+        end = as_utc(self.to_date)
+
+        boundary = start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        boundaries = []
+        while boundary < end:
+            if boundary > start:
+                boundaries.append(boundary.astimezone(timezone.utc))
+            boundary += relativedelta(months=1)
 
-        if not available_zones:
-            return MetadataItemSizeUsage(labels=grouping_keys, datasets=[])
+        return boundaries
 
-        mapping = defaultdict(dict)
-        for key in grouping_keys:
-            for zone in available_zones:
-                mapping[key][zone] = 0
+    def split_ranges(
+        self, rolled_up_until: datetime
+    ) -> tuple[list[tuple[datetime, datetime]], list[tuple[datetime, datetime]]]:
+        """Split the date range into ranges served by the daily rollup and ranges served by raw documents.
 
-        for zone in buckets_by_zone:
-            zone_key = zone['key']
-            buckets_by_created_time = zone['group_by_created_time']['buckets']
-            for date_key, date in buckets_by_created_time.items():
-                mapping[date_key][zone_key] = int(date['total_size']['value'])
+        The rollup serves whole UTC days before rolled_up_until unless a bucket of the time zone starts in the middle
+        of the day. Everything else in the date range, including the current day, is left for raw documents.
+        """
+
+        start = as_utc(self.from_date)
+        end = as_utc(self.to_date)
+        limit = min(end, as_utc(rolled_up_until))
+        boundaries = self.get_grouping_boundaries()
+
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        if day < start:
+            day += timedelta(days=1)
+
+        rollup_ranges = []
+        while day + timedelta(days=1) <= limit:
+            next_day = day + timedelta(days=1)
+            if not any(day < boundary < next_day for boundary in boundaries):
+                if rollup_ranges and rollup_ranges[-1][1] == day:
+                    rollup_ranges[-1] = (rollup_ranges[-1][0], next_day)
+                else:
+                    rollup_ranges.append((day, next_day))
+            day = next_day
+
+        raw_ranges = []
+        position = start
+        for range_start, range_end in rollup_ranges:
+            if position < range_start:
+                raw_ranges.append((position, range_start))
+            position = range_end
+        if position < end:
+            raw_ranges.append((position, end))
+
+        return rollup_ranges, raw_ranges
+
+    async def process_search_result(self, *pages: AsyncIterator[list[dict[str, Any]]]) -> MetadataItemSizeUsage:
+        """Sum up composite aggregation buckets into datasets per zone.
+
+        Buckets are consumed page by page from all iterators concurrently, so only one page of each search and the
+        sums per zone and date are kept in memory.
+        """
+
+        sizes = defaultdict(int)
+
+        async def add_buckets(buckets_pages: AsyncIterator[list[dict[str, Any]]]) -> None:
+            async for buckets in buckets_pages:
+                for bucket in buckets:
+                    sizes[bucket['key']['zone'], bucket['key']['date']] += int(bucket['total_size']['value'])
+
+        await asyncio.gather(*[add_buckets(buckets_pages) for buckets_pages in pages])
+
+        grouping_keys = self.get_grouping_keys()
+        available_zones = sorted({zone for zone, _ in sizes})
 
         datasets = []
         for zone in available_zones:
-            values = [mapping[key][zone] for key in grouping_keys]
+            values = [sizes.get((zone, key), 0) for key in grouping_keys]
             datasets.append(MetadataItemSizeUsageDataset(label=zone, values=values))
 
         return MetadataItemSizeUsage(labels=grouping_keys, datasets=datasets)
@@ -0,0 +1,201 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+from typing import ClassVar
+
+from search.components.crud import CRUD
+from search.components.metadata_item.index import METADATA_ITEM_SIZE_USAGE_ROLLUP_INDEX_MAPPINGS
+from search.components.metadata_item.index import METADATA_ITEM_SIZE_USAGE_ROLLUP_INDEX_SORT
+from search.components.metadata_item.models import MetadataItemSizeUsageRollup
+from search.components.metadata_item.models import MetadataItemSizeUsageRollupState
+from search.components.metadata_item.models import MetadataItemStatus
+from search.components.metadata_item.models import MetadataItemType
+from search.components.models import ContainerType
+from search.components.search_query import SearchQuery
+
+
+def get_day_ranges(days: list[datetime]) -> list[dict[str, int]]:
+    """Return range queries covering sorted days with consecutive days merged into one range."""
+
+    ranges = []
+    for day in days:
+        start = int(day.timestamp())
+        end = int((day + timedelta(days=1)).timestamp())
+        if ranges and ranges[-1]['lt'] == start:
+            ranges[-1]['lt'] = end
+        else:
+            ranges.append({'gte': start, 'lt': end})
+
+    return ranges
+
+
+class SizeUsageRollupCRUD(CRUD):
+    """CRUD for daily size usage of project files pre-aggregated from the metadata-items index.
+
+    Days are rolled up once they are over in UTC. Days that are already rolled up are rolled up again when files
+    created on them are updated, so the rollup reflects changes of file status and size. Files are expected to be
+    archived rather than removed from the metadata-items index.
+    """
+
+    index = 'metadata-items-size-usage-rollup'
+    index_mappings = METADATA_ITEM_SIZE_USAGE_ROLLUP_INDEX_MAPPINGS
+    index_sort = METADATA_ITEM_SIZE_USAGE_ROLLUP_INDEX_SORT
+    model = MetadataItemSizeUsageRollup
+    source_index: ClassVar[str] = 'metadata-items'
+    state_id: ClassVar[str] = 'state'
+    updates_delay: ClassVar[timedelta] = timedelta(minutes=1)
+    max_ranges: ClassVar[int] = 500
+
+    async def get_state(self) -> MetadataItemSizeUsageRollupState | None:
+        """Return progress of the rollup or None when nothing has been rolled up yet."""
+
+        document = await self.client.get(index=self.index, id=self.state_id, ignore=404)
+        if not document.get('found'):
+            return None
+
+        return MetadataItemSizeUsageRollupState.parse_obj(document['_source'])
+
+    async def save_state(self, state: MetadataItemSizeUsageRollupState) -> None:
+        """Store progress of the rollup."""
+
+        document = {
+            'rolled_up_until': int(state.rolled_up_until.timestamp()),
+            'updated_until': int(state.updated_until.timestamp()),
+        }
+        await self.client.index(index=self.index, id=self.state_id, document=document, refresh=True)
+
+    def iterate_project_size_usage(
+        self,
+        project_code: str,
+        ranges: list[dict[str, int]],
+        sources: list[dict[str, Any]],
+        aggregations: dict[str, Any],
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Iterate over pages of composite buckets of rolled up days of the project within any of the ranges."""
+
+        search_query = SearchQuery()
+        search_query.match_term('container_code', project_code)
+        search_query.match_any_range('day', ranges)
+
+        return self._iterate_composite_buckets(search_query.build(), sources, aggregations)
+
+    def _get_source_query(self, ranges: list[dict[str, int]], project_code: str | None = None) -> SearchQuery:
+        """Return query matching project files created within any of the ranges."""
+
+        search_query = SearchQuery()
+        search_query.match_term('type', MetadataItemType.FILE.value)
+        search_query.match_term('container_type', ContainerType.PROJECT.value)
+        search_query.match_any_range('created_time', ranges)
+        if project_code is not None:
+            search_query.match_term('container_code', project_code)
+
+        return search_query
+
+    async def rollup_days(
+        self, ranges: list[dict[str, int]], rolled_up_time: datetime, project_code: str | None = None
+    ) -> int:
+        """Replace rolled up days within ranges with current size usage of active files and return number of buckets."""
+
+        search_query = self._get_source_query(ranges, project_code)
+        search_query.match_term('status.keyword', MetadataItemStatus.ACTIVE.value)
+        sources = [
+            {'container_code': {'terms': {'field': 'container_code'}}},
+            {'zone': {'terms': {'field': 'zone'}}},
+            {'day': {'date_histogram': {'field': 'created_time', 'calendar_interval': '1d'}}},
+        ]
+        aggregations = {'size': {'sum': {'field': 'size'}}}
+
+        count = 0
+        async for buckets in self._iterate_composite_buckets(
+            search_query.build(), sources, aggregations, index=self.source_index
+        ):
+            operations = []
+            for bucket in buckets:
+                key = bucket['key']
+                day = key['day'] // 1000
+                operations.append(
+                    {'index': {'_index': self.index, '_id': f'{key["container_code"]}:{key["zone"]}:{day}'}}
+                )
+                operations.append(
+                    {
+                        'container_code': key['container_code'],
+                        'zone': key['zone'],
+                        'day': day,
+                        'size': int(bucket['size']['value']),
+                        'count': bucket['doc_count'],
+                        'rolled_up_time': int(rolled_up_time.timestamp()),
+                    }
+                )
+            result = await self._bulk(operations)
+            if result['errors']:
+                raise RuntimeError(f'Failed to write size usage rollup buckets: {result["items"]}.')
+            count += len(buckets)
+
+        # Buckets without active files left are the ones that haven't been replaced within this rollup
+        await self.client.indices.refresh(index=self.index)
+        stale_query = SearchQuery()
+        stale_query.match_any_range('day', ranges)
+        stale_query.match_range('rolled_up_time', lt=int(rolled_up_time.timestamp()))
+        if project_code is not None:
+            stale_query.match_term('container_code', project_code)
+        await self.client.delete_by_query(
+            index=self.index, body={'query': stale_query.build()}, conflicts='proceed', refresh=True
+        )
+
+        return count
+
+    async def get_updated_days(self, updated_since: datetime, created_before: datetime) -> dict[str, list[datetime]]:
+        """Return rolled up days of each project with files updated since the datetime."""
+
+        search_query = self._get_source_query([{'lt': int(created_before.timestamp())}])
+        search_query.match_range('last_updated_time', gte=int(updated_since.timestamp()))
+        sources = [
+            {'container_code': {'terms': {'field': 'container_code'}}},
+            {'day': {'date_histogram': {'field': 'created_time', 'calendar_interval': '1d'}}},
+        ]
+
+        days = defaultdict(list)
+        async for buckets in self._iterate_composite_buckets(search_query.build(), sources, index=self.source_index):
+            for bucket in buckets:
+                day = datetime.fromtimestamp(bucket['key']['day'] // 1000, tz=timezone.utc)
+                days[bucket['key']['container_code']].append(day)
+
+        return dict(days)
+
+    async def rollup(self, now: datetime | None = None) -> int:
+        """Roll up days that are over and days with updated files, return number of written buckets."""
+
+        now = now or datetime.now(timezone.utc)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        state = await self.get_state()
+
+        if state is None:
+            count = await self.rollup_days([{'lt': int(today.timestamp())}], now)
+        else:
+            count = 0
+            if state.rolled_up_until < today:
+                ranges = [{'gte': int(state.rolled_up_until.timestamp()), 'lt': int(today.timestamp())}]
+                count += await self.rollup_days(ranges, now)
+
+            updated_days = await self.get_updated_days(state.updated_until, state.rolled_up_until)
+            for project_code, days in updated_days.items():
+                ranges = get_day_ranges(days)
+                for start in range(0, len(ranges), self.max_ranges):
+                    end = start + self.max_ranges
+                    count += await self.rollup_days(ranges[start:end], now, project_code)
+
+        # Files indexed with a delay after the rollup started are rolled up again by the next rollup
+        await self.save_state(
+            MetadataItemSizeUsageRollupState(rolled_up_until=today, updated_until=now - self.updates_delay)
+        )
+
+        return count
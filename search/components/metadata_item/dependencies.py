@@ -7,13 +7,19 @@
 from elasticsearch import AsyncElasticsearch
 from fastapi import Depends
 
+from search.components.cache import ResultCache
 from search.components.metadata_item.crud import MetadataItemCRUD
+from search.components.write_buffer import WriteBuffer
 from search.dependencies import get_elasticsearch_client
+from search.dependencies import get_result_cache
+from search.dependencies import get_write_buffer
 
 
 def get_metadata_item_crud(
     elasticsearch_client: AsyncElasticsearch = Depends(get_elasticsearch_client),
+    result_cache: ResultCache | None = Depends(get_result_cache),
+    write_buffer: WriteBuffer | None = Depends(get_write_buffer),
 ) -> MetadataItemCRUD:
     """Return an instance of MetadataItemCRUD as a dependency."""
 
-    return MetadataItemCRUD(elasticsearch_client)
+    return MetadataItemCRUD(elasticsearch_client, result_cache, write_buffer)
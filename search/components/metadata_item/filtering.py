@@ -11,16 +11,22 @@ from uuid import UUID
 from search.components.filtering import Filtering
 from search.components.metadata_item.models import MetadataItemStatus
 from search.components.metadata_item.models import MetadataItemType
+from search.components.metadata_item.models import ParentPathMode
 from search.components.models import ContainerType
 from search.components.search_query import SearchQuery
 
 
 class MetadataItemFiltering(Filtering):
-    """Metadata items filtering control parameters."""
+    """Metadata items filtering control parameters.
+
+    Parent path is matched as a pattern by default. The subtree mode matches items within the folder and all its
+    subfolders.
+    """
 
     name: str | None = None
     owner: str | None = None
     parent_path: str | None = None
+    parent_path_mode: ParentPathMode | None = None
     zone: int | None = None
     container_code: str | None = None
     container_type: ContainerType | None = None
@@ -38,13 +44,17 @@ class MetadataItemFiltering(Filtering):
         """Add filtering into search query."""
 
         if self.name:
-            search_query.match_text('name.keyword', self.name)
+            search_query.match_normalized_text('name', self.name)
 
         if self.owner:
-            search_query.match_text('owner.keyword', self.owner)
+            search_query.match_normalized_text('owner', self.owner)
 
         if self.parent_path:
-            search_query.match_text('parent_path.keyword', self.parent_path)
+            if self.parent_path_mode == ParentPathMode.SUBTREE:
+                # The path_analyzer indexes every ancestor of the parent path, so one term matches the whole subtree
+                search_query.match_term('parent_path', self.parent_path.rstrip('.'))
+            else:
+                search_query.match_text('parent_path.keyword', self.parent_path)
 
         if self.zone is not None:
             search_query.match_term('zone', self.zone)
@@ -4,6 +4,9 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from search.components.index import NORMALIZED_TEXT_FIELDS
+
+# Index sorting is not used, because it's not compatible with nested attributes
 METADATA_ITEM_INDEX_MAPPINGS = {
     'properties': {
         'status': {'type': 'text', 'fields': {'keyword': {'type': 'keyword'}}},
@@ -15,8 +18,19 @@ METADATA_ITEM_INDEX_MAPPINGS = {
         'id': {'type': 'keyword'},
         'last_updated_time': {'type': 'date', 'format': 'epoch_second'},
         'location_uri': {'type': 'keyword'},
-        'name': {'type': 'text', 'fields': {'keyword': {'type': 'keyword'}}},
-        'owner': {'type': 'text', 'fields': {'keyword': {'type': 'keyword'}}},
+        'name': {
+            'type': 'text',
+            'fields': {
+                **NORMALIZED_TEXT_FIELDS,
+                # Prefixes of every word in the name for search as you type
+                'suggest': {
+                    'type': 'text',
+                    'analyzer': 'suggest_analyzer',
+                    'search_analyzer': 'suggest_search_analyzer',
+                },
+            },
+        },
+        'owner': {'type': 'text', 'fields': NORMALIZED_TEXT_FIELDS},
         'parent': {'type': 'keyword'},
         'parent_path': {'type': 'text', 'fields': {'keyword': {'type': 'keyword'}}, 'analyzer': 'path_analyzer'},
         'restore_path': {'type': 'text', 'fields': {'keyword': {'type': 'keyword'}}, 'analyzer': 'path_analyzer'},
@@ -31,3 +45,18 @@ METADATA_ITEM_INDEX_MAPPINGS = {
         'zone': {'type': 'byte'},
     },
 }
+
+METADATA_ITEM_SIZE_USAGE_ROLLUP_INDEX_MAPPINGS = {
+    'properties': {
+        'container_code': {'type': 'keyword'},
+        'zone': {'type': 'byte'},
+        'day': {'type': 'date', 'format': 'epoch_second'},
+        'size': {'type': 'long'},
+        'count': {'type': 'long'},
+        'rolled_up_time': {'type': 'date', 'format': 'epoch_second'},
+        'rolled_up_until': {'type': 'date', 'format': 'epoch_second'},
+        'updated_until': {'type': 'date', 'format': 'epoch_second'},
+    },
+}
+
+METADATA_ITEM_SIZE_USAGE_ROLLUP_INDEX_SORT = {'container_code': 'asc', 'day': 'asc'}
@@ -28,6 +28,13 @@ class MetadataItemType(StrEnum):
     NAME_FOLDER = 'name_folder'
 
 
+class ParentPathMode(StrEnum):
+    """Store possible ways of matching parent path of metadata items."""
+
+    PATTERN = 'pattern'
+    SUBTREE = 'subtree'
+
+
 class MetadataItemAttribute(BaseModel):
     """Metadata item attribute structure."""
 
@@ -65,6 +72,15 @@ class MetadataItem(BaseModel):
     status: MetadataItemStatus
 
 
+class MetadataItemSuggestion(BaseModel):
+    """Metadata item suggested by the beginning of words in its name."""
+
+    id: UUID
+    name: str
+    type: str
+    parent_path: str | None
+
+
 class MetadataItemSizeUsageDataset(BaseModel):
     """Metadata item size usage dataset structure."""
 
@@ -84,3 +100,24 @@ class MetadataItemSizeStatistics(BaseModel):
 
     count: int
     size: int
+
+
+class MetadataItemSizeUsageRollup(BaseModel):
+    """Total size and count of active project files created in one zone on one day."""
+
+    container_code: str
+    zone: int
+    day: datetime
+    size: int
+    count: int
+    rolled_up_time: datetime
+
+
+class MetadataItemSizeUsageRollupState(BaseModel):
+    """Progress of the size usage rollup.
+
+    Days before rolled_up_until are rolled up and files updated before updated_until are reflected in the rollup.
+    """
+
+    rolled_up_until: datetime
+    updated_until: datetime
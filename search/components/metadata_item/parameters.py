@@ -13,8 +13,10 @@ from pydantic import PositiveInt
 from pydantic import validator
 
 from search.components.metadata_item.filtering import MetadataItemFiltering
+from search.components.metadata_item.models import ParentPathMode
 from search.components.models import ContainerType
 from search.components.parameters import FilterParameters
+from search.components.parameters import QueryParameters
 from search.components.parameters import SortByFields
 
 
@@ -26,12 +28,22 @@ class MetadataItemSortByFields(SortByFields):
     LAST_UPDATED_TIME = 'last_updated_time'
 
 
+class MetadataItemSuggestParameters(QueryParameters):
+    """Query parameters for suggesting metadata items by name."""
+
+    container_code: str = Query()
+    zone: int = Query()
+    query: str = Query(min_length=1, max_length=100)
+    size: int = Query(default=10, ge=1, le=50)
+
+
 class MetadataItemFilterParameters(FilterParameters):
     """Query parameters for metadata items filtering."""
 
     name: str | None = Query(default=None)
     owner: str | None = Query(default=None)
     parent_path: str | None = Query(default=None)
+    parent_path_mode: ParentPathMode | None = Query(default=None)
     zone: int | None = Query(default=None)
     container_code: str | None = Query(default=None)
     container_type: ContainerType | None = Query(default=None)
@@ -59,6 +71,7 @@ class MetadataItemFilterParameters(FilterParameters):
             name=self.name,
             owner=self.owner,
             parent_path=self.parent_path,
+            parent_path_mode=self.parent_path_mode,
             zone=self.zone,
             container_code=self.container_code,
             container_type=self.container_type,
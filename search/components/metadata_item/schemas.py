@@ -12,6 +12,8 @@ from search.components.encoders import datetime_as_timestamp_encoder
 from search.components.metadata_item.models import MetadataItemStatus
 from search.components.models import ContainerType
 from search.components.schemas import BaseSchema
+from search.components.schemas import BulkCreateResponseSchema
+from search.components.schemas import BulkCreateSchema
 from search.components.schemas import ListResponseSchema
 
 
@@ -51,3 +53,30 @@ class MetadataItemListResponseSchema(ListResponseSchema):
     """Default schema for multiple metadata items in response."""
 
     result: list[MetadataItemResponseSchema]
+
+
+class MetadataItemSuggestionSchema(BaseSchema):
+    """Metadata item suggestion schema."""
+
+    id: UUID
+    name: str
+    type: str
+    parent_path: str | None
+
+
+class MetadataItemSuggestResponseSchema(BaseSchema):
+    """Default schema for metadata item suggestions in response."""
+
+    result: list[MetadataItemSuggestionSchema]
+
+
+class MetadataItemBulkCreateSchema(BulkCreateSchema):
+    """Metadata items schema used for bulk creation."""
+
+    items: list[MetadataItemCreateSchema]
+
+
+class MetadataItemBulkCreateResponseSchema(BulkCreateResponseSchema):
+    """Default schema for result of metadata items bulk creation in response."""
+
+    result: list[MetadataItemResponseSchema] | None = None
@@ -6,14 +6,27 @@
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi.responses import StreamingResponse
 
+from search.components.export import create_ndjson_response
 from search.components.metadata_item.crud import MetadataItemCRUD
 from search.components.metadata_item.dependencies import get_metadata_item_crud
 from search.components.metadata_item.parameters import MetadataItemFilterParameters
 from search.components.metadata_item.parameters import MetadataItemSortByFields
+from search.components.metadata_item.parameters import MetadataItemSuggestParameters
+from search.components.metadata_item.schemas import MetadataItemBulkCreateResponseSchema
+from search.components.metadata_item.schemas import MetadataItemBulkCreateSchema
 from search.components.metadata_item.schemas import MetadataItemListResponseSchema
+from search.components.metadata_item.schemas import MetadataItemSuggestionSchema
+from search.components.metadata_item.schemas import MetadataItemSuggestResponseSchema
+from search.components.parameters import BulkCreateParameters
+from search.components.parameters import ExportParameters
 from search.components.parameters import PageParameters
+from search.components.parameters import ProjectionParameters
 from search.components.parameters import SortParameters
+from search.components.responses import ORJSONResponse
+from search.config import Settings
+from search.config import get_settings
 
 router = APIRouter(prefix='/metadata-items', tags=['Metadata Items'])
 
@@ -23,15 +36,80 @@ async def list_metadata_items(
     filter_parameters: MetadataItemFilterParameters = Depends(),
     sort_parameters: SortParameters.with_sort_by_fields(MetadataItemSortByFields) = Depends(),
     page_parameters: PageParameters = Depends(),
+    projection_parameters: ProjectionParameters.with_fields(
+        MetadataItemListResponseSchema.get_result_fields()
+    ) = Depends(),
     metadata_item_crud: MetadataItemCRUD = Depends(get_metadata_item_crud),
-) -> MetadataItemListResponseSchema:
+    settings: Settings = Depends(get_settings),
+) -> ORJSONResponse:
     """List metadata items."""
 
     filtering = filter_parameters.to_filtering()
     sorting = sort_parameters.to_sorting()
     pagination = page_parameters.to_pagination()
-    page = await metadata_item_crud.list(pagination, sorting, filtering)
+    projection = projection_parameters.to_projection()
 
-    response = MetadataItemListResponseSchema.from_page(page)
+    if 'metadata-items' in settings.FAST_LIST_RESPONSE_ENDPOINTS:
+        page = await metadata_item_crud.list(pagination, sorting, filtering, projection, raw=True)
+        return MetadataItemListResponseSchema.render_page(page, projection)
 
-    return response
+    page = await metadata_item_crud.list(pagination, sorting, filtering, projection)
+
+    response = MetadataItemListResponseSchema.from_page(page, projection)
+
+    return ORJSONResponse(response)
+
+
+@router.get(
+    '/suggest',
+    summary='Suggest metadata items by the beginning of words in their names.',
+    response_model=MetadataItemSuggestResponseSchema,
+)
+async def suggest_metadata_items(
+    parameters: MetadataItemSuggestParameters = Depends(),
+    metadata_item_crud: MetadataItemCRUD = Depends(get_metadata_item_crud),
+    settings: Settings = Depends(get_settings),
+) -> MetadataItemSuggestResponseSchema:
+    """Suggest metadata items in the container and zone while the name is being typed."""
+
+    suggestions = await metadata_item_crud.suggest(
+        parameters.container_code,
+        parameters.zone,
+        parameters.query,
+        parameters.size,
+        settings.METADATA_ITEM_SUGGEST_TIMEOUT,
+    )
+
+    return MetadataItemSuggestResponseSchema(
+        result=[MetadataItemSuggestionSchema(**suggestion.dict()) for suggestion in suggestions]
+    )
+
+
+@router.get('/export', summary='Export all metadata items as NDJSON.', response_class=StreamingResponse)
+async def export_metadata_items(
+    filter_parameters: MetadataItemFilterParameters = Depends(),
+    export_parameters: ExportParameters = Depends(),
+    metadata_item_crud: MetadataItemCRUD = Depends(get_metadata_item_crud),
+) -> StreamingResponse:
+    """Export metadata items."""
+
+    filtering = filter_parameters.to_filtering()
+    batches = metadata_item_crud.iterate_sources(filtering, export_parameters.batch_size)
+
+    return create_ndjson_response(batches, 'metadata-items', export_parameters.compress)
+
+
+@router.post('/bulk', summary='Create multiple metadata items.', response_model=MetadataItemBulkCreateResponseSchema)
+async def bulk_create_metadata_items(
+    data: MetadataItemBulkCreateSchema,
+    parameters: BulkCreateParameters = Depends(),
+    metadata_item_crud: MetadataItemCRUD = Depends(get_metadata_item_crud),
+    settings: Settings = Depends(get_settings),
+) -> MetadataItemBulkCreateResponseSchema:
+    """Create multiple metadata items in chunks of bulk requests."""
+
+    result = await metadata_item_crud.bulk_create(
+        data.items, settings.BULK_CREATE_CHUNK_SIZE, settings.BULK_CREATE_CONCURRENCY, parameters.read_back
+    )
+
+    return MetadataItemBulkCreateResponseSchema.from_result(result)
@@ -4,6 +4,7 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from functools import lru_cache
 from typing import Any
 from typing import TypeVar
 
@@ -14,6 +15,13 @@ from search.components.types import StrEnum
 Model = TypeVar('Model', bound=BaseModel)
 
 
+@lru_cache
+def get_model_defaults(model: type[BaseModel]) -> dict[str, Any]:
+    """Return default values of optional model fields by their aliases."""
+
+    return {field.alias: field.get_default() for field in model.__fields__.values() if not field.required}
+
+
 class ModelList(list):
     """Store a list of models of the same type."""
 
@@ -58,6 +66,27 @@ class ModelList(list):
         return results
 
 
+class BulkCreateError(BaseModel):
+    """Error of one document that was not created within bulk request."""
+
+    position: int
+    pk: str
+    status: int | None
+    type: str | None
+    reason: str | None
+
+
+class BulkCreateResult(BaseModel):
+    """Result of creating multiple documents.
+
+    Primary keys are kept in the same order as created documents, failed documents have empty primary keys.
+    """
+
+    pks: list[str | None]
+    errors: list[BulkCreateError]
+    entries: list[Any] | None = None
+
+
 class ContainerType(StrEnum):
     """Available container types."""
 
@@ -0,0 +1,124 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+from elasticsearch import AsyncElasticsearch
+from elasticsearch import TransportError
+
+HEADER_PARAMETERS = ('allow_no_indices', 'expand_wildcards', 'ignore_unavailable', 'preference', 'routing')
+
+
+class MultiSearch:
+    """Collect search requests and execute them as one _msearch request.
+
+    Searches registered during the same event loop iteration are sent together, so CRUD methods that are run
+    concurrently with asyncio.gather share one round trip to elasticsearch. CRUD methods run with the gather method
+    share it even when some of them wait for other requests before searching, searches are sent once every method
+    has registered its search or is done, but no later than max_wait seconds after the first registered search.
+    """
+
+    def __init__(self, client: AsyncElasticsearch, max_wait: float = 0.05) -> None:
+        self.client = client
+        self.max_wait = max_wait
+        self._pending: list[tuple[dict[str, Any], dict[str, Any], asyncio.Future]] = []
+        self._executions: set[asyncio.Task] = set()
+        self._participants = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._is_scheduled = False
+
+    def _schedule_execution(self) -> None:
+        """Execute pending searches in a separate task keeping a reference to it until it's done."""
+
+        self._is_scheduled = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        task = asyncio.ensure_future(self.execute())
+        self._executions.add(task)
+        task.add_done_callback(self._executions.discard)
+
+    def _schedule_execution_soon(self) -> None:
+        """Schedule execution at the next event loop iteration, so searches registered until then join the batch."""
+
+        if not self._is_scheduled:
+            self._is_scheduled = True
+            asyncio.get_running_loop().call_soon(self._schedule_execution)
+
+    def _schedule_execution_when_ready(self) -> None:
+        """Schedule execution of pending searches when every participant has registered its search or is done."""
+
+        if self._pending and len(self._pending) >= self._participants:
+            self._schedule_execution_soon()
+
+    async def gather(self, *aws: Awaitable[Any]) -> list[Any]:
+        """Run awaitables concurrently as participants of the batch and return their results."""
+
+        async def participate(aw: Awaitable[Any]) -> Any:
+            try:
+                return await aw
+            finally:
+                self._participants -= 1
+                self._schedule_execution_when_ready()
+
+        self._participants += len(aws)
+
+        return await asyncio.gather(*[participate(aw) for aw in aws])
+
+    async def search(self, index: str | list[str], **kwds: Any) -> dict[str, Any]:
+        """Add search into the batch and wait for its response."""
+
+        loop = asyncio.get_running_loop()
+
+        if 'from_' in kwds:
+            kwds['from'] = kwds.pop('from_')
+
+        header = {'index': index}
+        for name in HEADER_PARAMETERS:
+            if name in kwds:
+                header[name] = kwds.pop(name)
+
+        future = loop.create_future()
+        self._pending.append((header, kwds, future))
+
+        if len(self._pending) == 1 and self._participants:
+            self._timer = loop.call_later(self.max_wait, self._schedule_execution_soon)
+
+        self._schedule_execution_when_ready()
+
+        return await future
+
+    async def execute(self) -> None:
+        """Send all pending searches and resolve their responses."""
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        body = []
+        for header, search, _ in pending:
+            body.extend([header, search])
+
+        try:
+            result = await self.client.msearch(body=body)
+        except Exception as e:
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (*_, future), response in zip(pending, result['responses']):
+            if future.done():
+                continue
+
+            if 'error' in response:
+                error = response['error']
+                future.set_exception(TransportError(response.get('status', 500), error.get('type'), error))
+            else:
+                future.set_result(response)
@@ -4,13 +4,42 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import base64
+import hashlib
+import json
 import math
+from typing import Any
 from typing import TypeVar
 
 from pydantic import BaseModel
+from pydantic import StrictBool
+from pydantic import StrictFloat
+from pydantic import StrictInt
+from pydantic import StrictStr
 from pydantic import conint
 
+from search.components.exceptions import InvalidCursor
 from search.components.models import Model
+from search.components.types import StrEnum
+
+CURSOR_START = '*'
+
+APPROXIMATE_COUNT_LIMIT = 10000
+
+
+class CountMode(StrEnum):
+    """Available modes of counting the total number of entries."""
+
+    EXACT = 'exact'
+    APPROXIMATE = 'approximate'
+    NONE = 'none'
+
+
+class CountRelation(StrEnum):
+    """Relation of the counted total to the real number of entries."""
+
+    EQUAL = 'eq'
+    GREATER_THAN_OR_EQUAL = 'gte'
 
 
 class Pagination(BaseModel):
@@ -18,29 +47,99 @@ class Pagination(BaseModel):
 
     page: conint(ge=1) = 1
     page_size: conint(ge=1) = 20
+    count: CountMode = CountMode.APPROXIMATE
 
     @property
     def size(self) -> int:
         return self.page_size
 
+    @property
+    def track_total_hits(self) -> bool | int:
+        """Return track_total_hits search parameter for the count mode.
+
+        Approximate total is counted accurately up to the limit and is a lower bound above it.
+        """
+
+        if self.count == CountMode.EXACT:
+            return True
+
+        if self.count == CountMode.NONE:
+            return False
+
+        return APPROXIMATE_COUNT_LIMIT
+
     @property
     def from_(self) -> int:
         return self.page_size * (self.page - 1)
 
 
+def get_cursor_digest(index: str | list[str], query: dict[str, Any], sort: list[dict[str, Any]]) -> str:
+    """Return a short digest identifying the indices, query and sort a cursor was created for."""
+
+    value = json.dumps([index, query, sort], sort_keys=True, separators=(',', ':'), default=str)
+
+    return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+
+class Cursor(BaseModel):
+    """Position of cursor-based pagination within a point in time snapshot.
+
+    Neither the query nor the sort is taken from the cursor, both are rebuilt from request parameters on every page and
+    only their digest is kept to reject cursors created for different indices, filters or sort.
+    """
+
+    point_in_time_id: str
+    digest: str
+    search_after: list[StrictInt | StrictFloat | StrictStr | StrictBool | None]
+    page: conint(ge=1)
+
+    def matches(self, digest: str, sort: list[dict[str, Any]]) -> bool:
+        """Check if cursor was created for the digest and its position has a value for every sort clause."""
+
+        return self.digest == digest and len(self.search_after) in (0, len(sort))
+
+    def encode(self) -> str:
+        """Represent cursor as an opaque url-safe string."""
+
+        return base64.urlsafe_b64encode(self.json(separators=(',', ':')).encode()).decode()
+
+    @classmethod
+    def decode(cls, value: str) -> 'Cursor':
+        """Restore cursor from an opaque string."""
+
+        try:
+            return cls.parse_obj(json.loads(base64.urlsafe_b64decode(value.encode())))
+        except ValueError:
+            raise InvalidCursor()
+
+
+class CursorPagination(Pagination):
+    """Pagination control parameters for cursor-based pagination.
+
+    Cursor is empty for the first page, when a new point in time snapshot should be opened.
+    """
+
+    cursor: Cursor | None = None
+
+
 class Page(BaseModel):
     """Represent one page of the response."""
 
     pagination: Pagination
-    count: int
+    count: int | None
+    count_relation: CountRelation | None
     entries: list[Model]
+    next_cursor: str | None = None
 
     @property
     def number(self) -> int:
         return self.pagination.page
 
     @property
-    def total_pages(self) -> int:
+    def total_pages(self) -> int | None:
+        if self.count is None:
+            return None
+
         return math.ceil(self.count / self.pagination.page_size)
 
 
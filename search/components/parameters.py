@@ -4,12 +4,21 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from collections.abc import Iterable
+from typing import ClassVar
+
 from fastapi import Query
 from pydantic import BaseModel
 from pydantic import create_model
+from pydantic import validator
 
 from search.components.filtering import Filtering
+from search.components.pagination import CURSOR_START
+from search.components.pagination import CountMode
+from search.components.pagination import Cursor
+from search.components.pagination import CursorPagination
 from search.components.pagination import Pagination
+from search.components.projection import Projection
 from search.components.sorting import Sorting
 from search.components.sorting import SortingOrder
 from search.components.types import StrEnum
@@ -20,13 +29,30 @@ class QueryParameters(BaseModel):
 
 
 class PageParameters(QueryParameters):
-    """Base query parameters for pagination."""
+    """Base query parameters for pagination.
+
+    Passing the cursor switches to the cursor-based pagination, where "*" starts from the first page and the next pages
+    are requested with the cursor received in the previous response.
+
+    The count mode controls how the total number of entries is counted, approximate total is a lower bound above the
+    limit and no total is returned when counting is skipped.
+    """
 
     page: int = Query(default=1, ge=1)
     page_size: int = Query(default=20, ge=1)
+    cursor: str | None = Query(default=None)
+    count: CountMode = Query(default=CountMode.APPROXIMATE)
 
     def to_pagination(self) -> Pagination:
-        return Pagination(page=self.page, page_size=self.page_size)
+        if self.cursor is None:
+            return Pagination(page=self.page, page_size=self.page_size, count=self.count)
+
+        if self.cursor == CURSOR_START:
+            return CursorPagination(page=1, page_size=self.page_size, count=self.count)
+
+        cursor = Cursor.decode(self.cursor)
+
+        return CursorPagination(page=cursor.page + 1, page_size=self.page_size, count=self.count, cursor=cursor)
 
 
 class SortByFields(StrEnum):
@@ -54,6 +80,59 @@ class SortParameters(QueryParameters):
         return Sorting(field=field, order=self.sort_order)
 
 
+class ProjectionParameters(QueryParameters):
+    """Base query parameters for source fields projection.
+
+    Fields are separated with commas, fields prefixed with "-" are excluded from the result entries.
+    """
+
+    fields: str | None = Query(default=None)
+
+    allowed_fields: ClassVar[frozenset[str]] = frozenset()
+
+    @classmethod
+    def with_fields(cls, fields: Iterable[str]) -> type['ProjectionParameters']:
+        """Limit fields argument with names specified in fields argument."""
+
+        return type(cls.__name__, (cls,), {'allowed_fields': frozenset(fields)})
+
+    @staticmethod
+    def split_fields(value: str) -> list[str]:
+        return [field.strip() for field in value.split(',') if field.strip()]
+
+    @validator('fields')
+    def fields_validation(cls, v):
+        if v:
+            unknown = {field.removeprefix('-') for field in cls.split_fields(v)} - cls.allowed_fields
+            if unknown:
+                raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        return v
+
+    def to_projection(self) -> Projection:
+        projection = Projection()
+
+        for field in self.split_fields(self.fields or ''):
+            if field.startswith('-'):
+                projection.excludes.append(field.removeprefix('-'))
+            else:
+                projection.includes.append(field)
+
+        return projection
+
+
+class BulkCreateParameters(QueryParameters):
+    """Base query parameters for creating multiple entries."""
+
+    read_back: bool = Query(default=False)
+
+
+class ExportParameters(QueryParameters):
+    """Base query parameters for streaming export."""
+
+    compress: bool = Query(default=False)
+    batch_size: int = Query(default=1000, ge=1, le=10000)
+
+
 class FilterParameters(QueryParameters):
     """Base query parameters for filtering."""
 
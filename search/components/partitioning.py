@@ -0,0 +1,214 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import time
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import ClassVar
+from weakref import WeakKeyDictionary
+
+from elasticsearch import NotFoundError
+from pydantic import BaseModel
+
+from search.components.crud import CRUD
+from search.components.schemas import BaseSchema
+
+
+class TimePartitioning(BaseModel):
+    """Monthly partitioning of documents into backing indices by a datetime field.
+
+    Partitions are named after the read alias with a "YYYY.MM" suffix and boundaries in UTC. The write alias points to
+    the partition of the current month.
+    """
+
+    alias: str
+    field: str
+    max_targeted_partitions: int = 24
+
+    @property
+    def write_alias(self) -> str:
+        return f'{self.alias}-write'
+
+    @property
+    def pattern(self) -> str:
+        return f'{self.alias}-*'
+
+    def get_partition(self, value: datetime) -> str:
+        """Return name of the partition the datetime value belongs to."""
+
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+
+        return f'{self.alias}-{value:%Y.%m}'
+
+    def get_partitions(self, start: datetime, end: datetime) -> list[str]:
+        """Return names of partitions overlapping the range between start and end inclusive.
+
+        The read alias is returned instead when the range spans more than max_targeted_partitions.
+        """
+
+        if start.tzinfo is not None:
+            start = start.astimezone(timezone.utc)
+        if end.tzinfo is not None:
+            end = end.astimezone(timezone.utc)
+
+        months = (end.year - start.year) * 12 + end.month - start.month + 1
+        if months > self.max_targeted_partitions:
+            return [self.alias]
+
+        partitions = []
+        for number in range(max(months, 0)):
+            year, month = divmod(start.month - 1 + number, 12)
+            partitions.append(f'{self.alias}-{start.year + year:04d}.{month + 1:02d}')
+
+        return partitions
+
+
+class PartitionedCRUD(CRUD):
+    """Base CRUD class for documents stored in time-partitioned backing indices.
+
+    The index attribute is the read alias covering all partitions. Partitions are created from the index template on the
+    first write of a document into them.
+    """
+
+    partitioning: ClassVar[TimePartitioning]
+    partitioned_check_ttl: ClassVar[float] = 5
+
+    # Results of the write alias existence check by client, shared between CRUD instances using the same client
+    _partitioned_checks: ClassVar[WeakKeyDictionary] = WeakKeyDictionary()
+
+    async def is_partitioned(self) -> bool:
+        """Check if the write alias exists, otherwise the read alias may still be taken by a legacy index.
+
+        The result is cached for the client during the check TTL (in seconds), so searches and writes don't wait for
+        an extra request each.
+        """
+
+        checks = self._partitioned_checks.setdefault(self.client, {})
+        now = time.monotonic()
+
+        expires_at, is_partitioned = checks.get(self.partitioning.write_alias, (now, False))
+        if expires_at > now:
+            return is_partitioned
+
+        is_partitioned = bool(await self.client.indices.exists_alias(name=self.partitioning.write_alias))
+        checks[self.partitioning.write_alias] = (now + self.partitioned_check_ttl, is_partitioned)
+
+        return is_partitioned
+
+    async def get_write_index(self, model: BaseSchema) -> str:
+        """Return the partition of the model partitioning field value.
+
+        The read alias is returned instead while it's taken by a legacy index, so new documents are written into it
+        until the index is reindexed into partitions.
+        """
+
+        if not await self.is_partitioned():
+            return self.index
+
+        return self.partitioning.get_partition(getattr(model, self.partitioning.field))
+
+    async def get_search_index(self, start: datetime, end: datetime) -> list[str]:
+        """Return partitions overlapping the range of partitioning field values.
+
+        The write alias is always included, so searches have at least one existing partition to return aggregations
+        from even when none of the overlapping partitions exists. The read alias is searched instead while it's taken
+        by a legacy index.
+        """
+
+        if not await self.is_partitioned():
+            return [self.index]
+
+        return [*self.partitioning.get_partitions(start, end), self.partitioning.write_alias]
+
+    def get_index_template(self) -> dict[str, Any]:
+        """Return the index template applied to newly created partitions."""
+
+        return {
+            'index_patterns': [self.partitioning.pattern],
+            'template': {
+                'settings': self.get_index_settings(),
+                'mappings': self.index_mappings,
+                'aliases': {self.index: {}},
+            },
+        }
+
+    async def create_index(self) -> None:
+        """Create the index template for partitions and the partition of the current month."""
+
+        await self.client.indices.put_index_template(name=self.index, body=self.get_index_template())
+        await self.rollover()
+
+    async def is_index_exists(self) -> bool:
+        """Check if the index template for partitions exists."""
+
+        return await self.client.indices.exists_index_template(name=self.index)
+
+    async def is_legacy_index(self) -> bool:
+        """Check if the read alias name is taken by a non-partitioned index."""
+
+        is_alias = await self.client.indices.exists_alias(name=self.index)
+        is_index = await self.client.indices.exists(index=self.index)
+
+        return is_index and not is_alias
+
+    async def delete_index(self) -> None:
+        """Remove all partitions and the index template."""
+
+        await self.client.indices.delete(index=self.partitioning.pattern)
+        await self.client.indices.delete_index_template(name=self.index, ignore=404)
+
+    async def rollover(self, now: datetime | None = None) -> str:
+        """Create the partition of the current month when it's missing and move the write alias to it."""
+
+        partition = self.partitioning.get_partition(now or datetime.now(timezone.utc))
+
+        await self.client.indices.create(index=partition, ignore=400)
+
+        # The partition name is an alias of its backing index once the partition is reindexed into a new version
+        backing_index = next(iter(await self.client.indices.get_alias(index=partition)))
+
+        actions = [{'add': {'index': backing_index, 'alias': self.partitioning.write_alias, 'is_write_index': True}}]
+        current = await self.client.indices.get_alias(name=self.partitioning.write_alias, ignore=404)
+        if current.get('status') == 404:
+            current = {}
+
+        for index in current:
+            if index != backing_index:
+                actions.append({'remove': {'index': index, 'alias': self.partitioning.write_alias}})
+
+        await self.client.indices.update_aliases(body={'actions': actions})
+
+        return partition
+
+    async def _retrieve_one(self, **kwds: Any) -> dict[str, Any]:
+        """Retrieve one document from its partition or search for it across all partitions when it's unknown."""
+
+        if 'index' in kwds:
+            return await super()._retrieve_one(**kwds)
+
+        result = await self.client.search(index=self.index, query={'ids': {'values': [kwds['id']]}}, size=1)
+        hits = result['hits']['hits']
+        if not hits:
+            raise NotFoundError(404, 'not_found', {'_id': kwds['id'], 'found': False})
+
+        return hits[0]
+
+    async def _retrieve_many(self, documents: list[dict[str, str]], **kwds: Any) -> dict[str, Any]:
+        """Retrieve multiple documents from their partitions or search for them across all partitions.
+
+        Searched documents are returned in the same way as _mget does, but only after they are refreshed.
+        """
+
+        if all('_index' in document for document in documents):
+            return await self.client.mget(body={'docs': documents}, **kwds)
+
+        ids = [document['_id'] for document in documents]
+        result = await self.client.search(index=self.index, query={'ids': {'values': ids}}, size=len(ids), **kwds)
+        hits = {hit['_id']: hit for hit in result['hits']['hits']}
+
+        return {'docs': [{**hits[id_], 'found': True} if id_ in hits else {'_id': id_, 'found': False} for id_ in ids]}
@@ -44,3 +44,10 @@ class ProjectFilesStatisticsParameters(QueryParameters):
     parent_path: str | None = Query(default=None)
     zone: int | None = Query(default=None)
     time_zone: str = Query(default='+00:00', pattern=TIME_ZONE_REGEX)
+
+
+class ProjectFilesBatchStatisticsParameters(QueryParameters):
+    """Query parameters for querying statistics of multiple projects."""
+
+    zone: int | None = Query(default=None)
+    time_zone: str = Query(default='+00:00', pattern=TIME_ZONE_REGEX)
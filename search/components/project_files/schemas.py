@@ -4,6 +4,8 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from pydantic import Field
+
 from search.components.schemas import BaseSchema
 
 
@@ -48,6 +50,18 @@ class ProjectFilesStatisticsResponseSchema(BaseSchema):
     activity: ProjectFilesTodayActivity
 
 
+class ProjectFilesBatchStatisticsSchema(BaseSchema):
+    """Schema for requesting statistics of multiple projects."""
+
+    project_codes: list[str] = Field(min_items=1, max_items=1000)
+
+
+class ProjectFilesBatchStatisticsResponseSchema(BaseSchema):
+    """Default schema for statistics of multiple projects response."""
+
+    result: dict[str, ProjectFilesStatisticsResponseSchema]
+
+
 class ProjectFilesActivityResponseSchema(BaseSchema):
     """Default schema for project files activity response."""
 
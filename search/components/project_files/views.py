@@ -16,10 +16,14 @@ from search.components.item_activity.filtering import ItemActivityProjectFileAct
 from search.components.metadata_item.crud import MetadataItemCRUD
 from search.components.metadata_item.dependencies import get_metadata_item_crud
 from search.components.metadata_item.filtering import MetadataItemProjectSizeUsageFiltering
+from search.components.multi_search import MultiSearch
 from search.components.project_files.parameters import ProjectFilesActivityParameters
+from search.components.project_files.parameters import ProjectFilesBatchStatisticsParameters
 from search.components.project_files.parameters import ProjectFilesSizeParameters
 from search.components.project_files.parameters import ProjectFilesStatisticsParameters
 from search.components.project_files.schemas import ProjectFilesActivityResponseSchema
+from search.components.project_files.schemas import ProjectFilesBatchStatisticsResponseSchema
+from search.components.project_files.schemas import ProjectFilesBatchStatisticsSchema
 from search.components.project_files.schemas import ProjectFilesSizeResponseSchema
 from search.components.project_files.schemas import ProjectFilesSizeSchema
 from search.components.project_files.schemas import ProjectFilesStatisticsResponseSchema
@@ -38,13 +42,17 @@ async def get_project_size_usage(
     parameters: ProjectFilesSizeParameters = Depends(),
     metadata_item_crud: MetadataItemCRUD = Depends(get_metadata_item_crud),
 ) -> ProjectFilesSizeResponseSchema:
-    """Get storage usage in a project for the period."""
+    """Get storage usage in a project for the period.
+
+    Pages of the metadata items and the daily rollup searches are sent together in multi-search batches.
+    """
 
     filtering = MetadataItemProjectSizeUsageFiltering(
         project_code=project_code, parent_path=parent_path, from_date=parameters.from_date, to_date=parameters.to_date
     )
+    multi_search = MultiSearch(metadata_item_crud.client)
 
-    project_size_usage = await metadata_item_crud.get_project_size_usage(
+    project_size_usage = await metadata_item_crud.with_multi_search(multi_search).get_project_size_usage(
         filtering, parameters.time_zone, parameters.group_by
     )
 
@@ -65,10 +73,15 @@ async def get_project_statistics(
     """Get files and transfer activity statistics in a project for the period."""
 
     now = datetime.now(tz=timezone.utc)
+    multi_search = MultiSearch(metadata_item_crud.client)
 
-    statistics = await metadata_item_crud.get_project_statistics(project_code, parameters.parent_path, parameters.zone)
-    transfer_statistics = await item_activity_crud.get_project_transfer_statistics(
-        project_code, now, parameters.time_zone, parameters.parent_path, parameters.zone
+    statistics, transfer_statistics = await multi_search.gather(
+        metadata_item_crud.with_multi_search(multi_search).get_project_statistics(
+            project_code, parameters.parent_path, parameters.zone
+        ),
+        item_activity_crud.with_multi_search(multi_search).get_project_transfer_statistics(
+            project_code, now, parameters.time_zone, parameters.parent_path, parameters.zone
+        ),
     )
 
     return ProjectFilesStatisticsResponseSchema(
@@ -83,6 +96,46 @@ async def get_project_statistics(
     )
 
 
+@router.post(
+    '/statistics',
+    summary='Get files and transfer activity statistics in multiple projects.',
+    response_model=ProjectFilesBatchStatisticsResponseSchema,
+)
+async def get_projects_statistics(
+    data: ProjectFilesBatchStatisticsSchema,
+    parameters: ProjectFilesBatchStatisticsParameters = Depends(),
+    metadata_item_crud: MetadataItemCRUD = Depends(get_metadata_item_crud),
+    item_activity_crud: ItemActivityCRUD = Depends(get_item_activity_crud),
+) -> ProjectFilesBatchStatisticsResponseSchema:
+    """Get files and today's transfer activity statistics in multiple projects with one search per index."""
+
+    now = datetime.now(tz=timezone.utc)
+    multi_search = MultiSearch(metadata_item_crud.client)
+
+    statistics, transfer_statistics = await multi_search.gather(
+        metadata_item_crud.with_multi_search(multi_search).get_projects_statistics(data.project_codes, parameters.zone),
+        item_activity_crud.with_multi_search(multi_search).get_projects_transfer_statistics(
+            data.project_codes, now, parameters.time_zone, parameters.zone
+        ),
+    )
+
+    return ProjectFilesBatchStatisticsResponseSchema(
+        result={
+            project_code: ProjectFilesStatisticsResponseSchema(
+                files=ProjectFilesTotalStatistics(
+                    total_count=project_statistics.count,
+                    total_size=project_statistics.size,
+                ),
+                activity=ProjectFilesTodayActivity(
+                    today_uploaded=transfer_statistics[project_code].uploaded,
+                    today_downloaded=transfer_statistics[project_code].downloaded,
+                ),
+            )
+            for project_code, project_statistics in statistics.items()
+        }
+    )
+
+
 @router.get(
     '/{project_code}/activity',
     summary='Get file activity in the project.',
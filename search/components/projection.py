@@ -0,0 +1,40 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from pydantic import BaseModel
+
+
+class Projection(BaseModel):
+    """Base source fields projection control parameters."""
+
+    includes: list[str] = []
+    excludes: list[str] = []
+
+    def __bool__(self) -> bool:
+        """Projection considered valid when at least one field is included or excluded."""
+
+        return bool(self.includes or self.excludes)
+
+    def selects(self, field: str) -> bool:
+        """Check if field is kept in document sources after the projection."""
+
+        if field in self.excludes:
+            return False
+
+        return not self.includes or field in self.includes
+
+    def apply(self) -> dict[str, list[str]]:
+        """Return included and excluded fields that will be used as _source parameter."""
+
+        source = {}
+
+        if self.includes:
+            source['includes'] = self.includes
+
+        if self.excludes:
+            source['excludes'] = self.excludes
+
+        return source
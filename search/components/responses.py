@@ -0,0 +1,18 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from search.components.encoders import dumps_json
+
+
+class ORJSONResponse(JSONResponse):
+    """Json response rendered with orjson, pydantic models in content are serialized without validation."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
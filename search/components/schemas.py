@@ -4,23 +4,202 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from collections.abc import Callable
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
 from pydantic import BaseModel
+from pydantic.datetime_parse import parse_datetime
+from pydantic.fields import SHAPE_SINGLETON
+from pydantic.fields import ModelField
 
+from search.components.models import BulkCreateResult
+from search.components.pagination import CountRelation
 from search.components.pagination import PageType
+from search.components.projection import Projection
+from search.components.responses import ORJSONResponse
+
+
+def convert_datetime(value: Any) -> Any:
+    """Convert stored epoch seconds into the same iso format that is produced for validated datetime fields."""
+
+    if value is None:
+        return None
+
+    return parse_datetime(value).isoformat()
+
+
+@lru_cache
+def get_source_converters(schema: type['BaseSchema']) -> dict[str, tuple[Any, Callable[[Any], Any] | None]]:
+    """Return schema fields with their default values and converters required for trusted document sources."""
+
+    converters = {}
+
+    for field in schema.__fields__.values():
+        converter = None
+        if field.type_ is datetime and field.shape == SHAPE_SINGLETON:
+            converter = convert_datetime
+
+        converters[field.alias] = (field.get_default(), converter)
+
+    return converters
+
+
+@lru_cache
+def get_result_schemas(field: ModelField) -> tuple[str | None, dict[str, type['BaseSchema']]]:
+    """Return discriminator key and mapping of discriminator values into schemas for list result entries."""
+
+    if field.discriminator_key is None:
+        return None, {'': field.type_}
+
+    mapping = {str(key): sub_field.type_ for key, sub_field in field.sub_fields_mapping.items()}
+    return field.discriminator_key, mapping
 
 
 class BaseSchema(BaseModel):
     """Base class for all available schemas."""
 
+    @classmethod
+    def from_source(cls, source: dict[str, Any], projection: Projection | None = None) -> dict[str, Any]:
+        """Map trusted elasticsearch document source into json-compatible schema representation without validation.
+
+        Only fields defined in the schema are kept, missing fields receive default values unless they are not
+        selected by the projection.
+        """
+
+        result = {}
+
+        for name, (default, converter) in get_source_converters(cls).items():
+            if projection and name not in source and not projection.selects(name):
+                continue
+
+            value = source.get(name, default)
+            if converter is not None:
+                value = converter(value)
+
+            result[name] = value
+
+        return result
+
 
 class ListResponseSchema(BaseSchema):
-    """Default schema for multiple base schemas in response."""
+    """Default schema for multiple base schemas in response.
+
+    Total is a lower bound of the number of entries when total relation is "gte" and it's empty when counting is
+    skipped.
+    """
 
-    num_of_pages: int
+    num_of_pages: int | None
     page: int
-    total: int
+    total: int | None
+    total_relation: CountRelation | None
     result: list[BaseSchema]
+    next_cursor: str | None = None
+
+    @classmethod
+    def from_page(cls, page: PageType, projection: Projection | None = None) -> 'ListResponseSchema':
+        """Create response from a page.
+
+        Entries of projected pages are partial models that are already validated, so only fields defined in the result
+        schemas are taken from them without validating the entries once again.
+        """
+
+        if projection:
+            result = []
+            for entry in page.entries:
+                fields = cls.get_result_schema(entry.__dict__).__fields__.keys()
+                result.append(entry.dict(include=set(fields)))
+
+            return cls.construct(
+                num_of_pages=page.total_pages,
+                page=page.number,
+                total=page.count,
+                total_relation=page.count_relation,
+                result=result,
+                next_cursor=page.next_cursor,
+            )
+
+        return cls(
+            num_of_pages=page.total_pages,
+            page=page.number,
+            total=page.count,
+            total_relation=page.count_relation,
+            result=page.entries,
+            next_cursor=page.next_cursor,
+        )
+
+    @classmethod
+    def get_result_fields(cls) -> set[str]:
+        """Return names of fields available in result entries across all result schemas."""
+
+        _, mapping = get_result_schemas(cls.__fields__['result'].sub_fields[0])
+
+        return {field.alias for schema in mapping.values() for field in schema.__fields__.values()}
+
+    @classmethod
+    def get_result_schema(cls, source: dict[str, Any]) -> type[BaseSchema]:
+        """Return schema for one result entry, resolving discriminated unions using the entry source."""
+
+        discriminator_key, mapping = get_result_schemas(cls.__fields__['result'].sub_fields[0])
+
+        if discriminator_key is None:
+            return mapping['']
+
+        return mapping[str(source[discriminator_key])]
+
+    @classmethod
+    def render_page(cls, page: PageType, projection: Projection | None = None) -> ORJSONResponse:
+        """Create response directly from a page with raw document sources skipping model validation.
+
+        Suitable only for trusted sources received from elasticsearch.
+        """
+
+        content = {
+            'num_of_pages': page.total_pages,
+            'page': page.number,
+            'total': page.count,
+            'total_relation': page.count_relation,
+            'result': [cls.get_result_schema(source).from_source(source, projection) for source in page.entries],
+            'next_cursor': page.next_cursor,
+        }
+
+        return ORJSONResponse(content)
+
+
+class BulkCreateSchema(BaseSchema):
+    """Default schema for multiple base schemas in creation request."""
+
+    items: list[BaseSchema]
+
+
+class BulkCreateErrorSchema(BaseSchema):
+    """Schema for error of one entry that was not created."""
+
+    position: int
+    pk: str
+    status: int | None
+    type: str | None
+    reason: str | None
+
+
+class BulkCreateResponseSchema(BaseSchema):
+    """Default schema for result of creating multiple entries in response.
+
+    Primary keys are in the same order as entries in the request, entries that were not created have empty keys.
+    Created entries are returned only when they are read back.
+    """
+
+    created: int
+    pks: list[str | None]
+    errors: list[BulkCreateErrorSchema]
+    result: list[BaseSchema] | None = None
 
     @classmethod
-    def from_page(cls, page: PageType) -> 'ListResponseSchema':
-        return cls(num_of_pages=page.total_pages, page=page.number, total=page.count, result=page.entries)
+    def from_result(cls, result: BulkCreateResult) -> 'BulkCreateResponseSchema':
+        return cls(
+            created=len(result.pks) - len(result.errors),
+            pks=result.pks,
+            errors=[error.dict() for error in result.errors],
+            result=result.entries,
+        )
@@ -6,12 +6,19 @@
 
 from typing import Any
 
+from search.components.index import NGRAM_SIZE
+
 
 class SearchQuery:
-    """Build elastic search query."""
+    """Build elastic search query.
+
+    Full-text clauses are scored in the bool "must" context. Exact and range matches are put into the "filter"
+    context, which skips scoring and lets Elasticsearch cache them in the node query cache.
+    """
 
     def __init__(self) -> None:
         self.must = []
+        self.filter = []
         self.nested = {}
 
     def match_text(self, field: str, value: str) -> None:
@@ -33,14 +40,45 @@ class SearchQuery:
 
         self.must.append({query_type: query_value})
 
+    def match_normalized_text(self, field: str, value: str) -> None:
+        """Perform case and accent insensitive search of "%" patterns using normalized and n-gram subfields.
+
+        Values without "%" are matched exactly as with match_text. Prefix patterns use a prefix query and contains
+        patterns use a phrase of n-grams, the rest falls back to a wildcard query on the normalized subfield.
+        """
+
+        if '%' not in value:
+            self.match_text(f'{field}.keyword', value)
+            return
+
+        text = value.strip('%')
+        if '%' not in text and value == f'{text}%':
+            query = {'prefix': {f'{field}.normalized': {'value': text}}}
+        elif '%' not in text and value == f'%{text}%' and len(text) >= NGRAM_SIZE:
+            query = {'match_phrase': {f'{field}.ngram': text}}
+        else:
+            query = {'wildcard': {f'{field}.normalized': {'value': value.replace('%', '*')}}}
+
+        self.must.append(query)
+
+    def match_all_words(self, field: str, value: str) -> None:
+        """Perform full-text search matching all words of the value."""
+
+        self.must.append({'match': {field: {'query': value, 'operator': 'and'}}})
+
     def match_range(self, field: str, **kwds: Any) -> None:
-        self.must.append({'range': {field: kwds}})
+        self.filter.append({'range': {field: kwds}})
+
+    def match_any_range(self, field: str, ranges: list[dict[str, Any]]) -> None:
+        self.filter.append(
+            {'bool': {'should': [{'range': {field: value}} for value in ranges], 'minimum_should_match': 1}}
+        )
 
     def match_term(self, field: str, value: str | int | bool) -> None:
-        self.must.append({'term': {field: value}})
+        self.filter.append({'term': {field: value}})
 
     def match_multiple_terms(self, field: str, value: list[str | int]) -> None:
-        self.must.append({'terms': {field: value}})
+        self.filter.append({'terms': {field: value}})
 
     def init_nested(self, nested_field: str) -> None:
         self.nested = {
@@ -62,11 +100,14 @@ class SearchQuery:
         self.nested['nested']['query']['bool']['must'].append({'wildcard': {f'{nested_field}.{field}': value}})
 
     def build(self) -> dict[str, Any]:
-        if not self.must:
+        must = [*self.must, self.nested] if self.nested else self.must
+        if not must and not self.filter:
             return {'match_all': {}}
 
-        if self.nested:
-            self.must.append(self.nested)
+        es_query = {'bool': {}}
+        if must:
+            es_query['bool']['must'] = must
+        if self.filter:
+            es_query['bool']['filter'] = self.filter
 
-        es_query = {'bool': {'must': self.must}}
         return es_query
@@ -0,0 +1,147 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+
+from elasticsearch import AsyncElasticsearch
+from elasticsearch import TransportError
+
+from search.logger import logger
+
+CreatedHook = Callable[[AsyncElasticsearch, list[Any]], Awaitable[None]]
+
+
+class WriteBuffer:
+    """Collect single documents and create them with one _bulk request.
+
+    Buffered documents are flushed when there are max_batch_size of them or when the flush interval (in milliseconds)
+    passes since the first of them was added. Adding documents waits while max_pending documents are buffered or being
+    flushed.
+
+    Documents can be added with a hook and an item, every hook is called once per flush with items of all created
+    documents it was added with, so follow-up writes of created documents are batched per flush as well.
+    """
+
+    def __init__(
+        self, client: AsyncElasticsearch, flush_interval: float, max_batch_size: int, max_pending: int
+    ) -> None:
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.closed = False
+        self._capacity = asyncio.Semaphore(max_pending)
+        self._pending: list[tuple[str, str, str, CreatedHook | None, Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def _schedule_flush(self) -> None:
+        """Flush buffered documents in a separate task keeping a reference to it until it's done."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        task = asyncio.ensure_future(self._flush(pending))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def add(
+        self, index: str, pk: str, document: str, hook: CreatedHook | None = None, item: Any = None
+    ) -> asyncio.Future:
+        """Add a document into the buffer and return a future resolved with its primary key once it's created."""
+
+        if self.closed:
+            raise RuntimeError('Write buffer is closed.')
+
+        await self._capacity.acquire()
+
+        # The buffer may have been closed and flushed while waiting for capacity
+        if self.closed:
+            self._capacity.release()
+            raise RuntimeError('Write buffer is closed.')
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(lambda _: self._capacity.release())
+        self._pending.append((index, pk, document, hook, item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval / 1000, self._schedule_flush)
+
+        return future
+
+    async def create(
+        self, index: str, pk: str, document: str, hook: CreatedHook | None = None, item: Any = None
+    ) -> str:
+        """Add a document into the buffer and wait until it's created."""
+
+        return await (await self.add(index, pk, document, hook, item))
+
+    async def _flush(self, pending: list[tuple[str, str, str, CreatedHook | None, Any, asyncio.Future]]) -> None:
+        """Send buffered documents, resolve their futures and call hooks with items of created documents."""
+
+        body = []
+        for index, pk, document, *_ in pending:
+            body.extend([{'create': {'_index': index, '_id': pk}}, document])
+
+        try:
+            result = await self.client.bulk(body=body)
+        except Exception as e:
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        created = defaultdict(list)
+        for (*_, hook, item, future), result_item in zip(pending, result['items']):
+            operation = result_item['create']
+            if 'error' not in operation and hook is not None:
+                created[hook].append(item)
+
+            if future.done():
+                continue
+
+            if 'error' in operation:
+                error = operation['error']
+                future.set_exception(TransportError(operation['status'], error.get('type'), error))
+            else:
+                future.set_result(operation['_id'])
+
+        await self._call_hooks(created)
+
+    async def _call_hooks(self, created: dict[CreatedHook, list[Any]]) -> None:
+        """Call every hook with items of created documents without failing the flush when the hook fails."""
+
+        for hook, items in created.items():
+            try:
+                await hook(self.client, items)
+            except Exception:
+                logger.exception('Unable to call the write buffer hook with created documents.')
+
+    async def flush(self) -> None:
+        """Send all buffered documents and wait until all flushes are done."""
+
+        self._schedule_flush()
+
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+
+    async def close(self) -> None:
+        """Stop accepting new documents and flush the buffered ones."""
+
+        self.closed = True
+        await self.flush()
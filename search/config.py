@@ -6,6 +6,7 @@
 
 import logging
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import BaseSettings
 
@@ -24,6 +25,40 @@ class Settings(BaseSettings):
     LOGGING_FORMAT: str = 'json'
 
     ELASTICSEARCH_URI: str = 'http://127.0.0.1:9201'
+    # Idle pooled connections are kept alive for the aiohttp default of 15 seconds, the keep-alive timeout can't be
+    # configured through public arguments of the elasticsearch-py 7.x client
+    ELASTICSEARCH_MAX_CONNECTIONS: int = 10
+    ELASTICSEARCH_REQUEST_TIMEOUT: float = 10
+
+    # List endpoints (router prefixes) that render responses from raw document sources skipping model validation, for
+    # example ["metadata-items","item-activity-logs","dataset-activity-logs"], none of them by default
+    FAST_LIST_RESPONSE_ENDPOINTS: list[str] = []
+
+    # Time budget of the metadata items suggest search in milliseconds, hits found within it are returned
+    METADATA_ITEM_SUGGEST_TIMEOUT: int = 200
+
+    BULK_CREATE_CHUNK_SIZE: int = 500
+    BULK_CREATE_CONCURRENCY: int = 4
+
+    # Buffer that coalesces single document creates into _bulk requests, flush interval is in milliseconds
+    WRITE_BUFFER_ENABLED: bool = False
+    WRITE_BUFFER_FLUSH_INTERVAL: float = 50
+    WRITE_BUFFER_MAX_BATCH_SIZE: int = 500
+    WRITE_BUFFER_MAX_PENDING: int = 5000
+
+    # Hourly item activity counters are incremented on creation, reading should be enabled once they are backfilled
+    ACTIVITY_COUNTERS_WRITE_ENABLED: bool = False
+    ACTIVITY_COUNTERS_READ_ENABLED: bool = False
+
+    # Cache for project files aggregations, it's disabled when time to live is not positive
+    # Memory backend is local for each worker, redis backend is shared between all workers
+    RESULT_CACHE_BACKEND: Literal['memory', 'redis'] = 'memory'
+    RESULT_CACHE_MAX_SIZE: int = 1000
+    RESULT_CACHE_TTL: float = 5
+    RESULT_CACHE_REDIS_URL: str = 'redis://127.0.0.1:6379/0'
+    RESULT_CACHE_KEY_PREFIX: str = 'search:cache:'
+    # Writes invalidate cached results once the delay in seconds passes, writes within the delay share one invalidation
+    RESULT_CACHE_INVALIDATION_DELAY: float = 1
 
     OPEN_TELEMETRY_ENABLED: bool = False
     OPEN_TELEMETRY_HOST: str = '127.0.0.1'
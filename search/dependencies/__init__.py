@@ -4,8 +4,32 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from search.dependencies.cache import close_application_result_cache
+from search.dependencies.cache import create_cache_backend
+from search.dependencies.cache import create_result_cache
+from search.dependencies.cache import get_application_result_cache
+from search.dependencies.cache import get_result_cache
+from search.dependencies.elasticsearch import close_application_elasticsearch_client
+from search.dependencies.elasticsearch import create_elasticsearch_client
+from search.dependencies.elasticsearch import get_application_elasticsearch_client
 from search.dependencies.elasticsearch import get_elasticsearch_client
+from search.dependencies.write_buffer import close_application_write_buffer
+from search.dependencies.write_buffer import create_write_buffer
+from search.dependencies.write_buffer import get_application_write_buffer
+from search.dependencies.write_buffer import get_write_buffer
 
 __all__ = [
+    'close_application_elasticsearch_client',
+    'close_application_result_cache',
+    'close_application_write_buffer',
+    'create_cache_backend',
+    'create_elasticsearch_client',
+    'create_result_cache',
+    'create_write_buffer',
+    'get_application_elasticsearch_client',
+    'get_application_result_cache',
+    'get_application_write_buffer',
     'get_elasticsearch_client',
+    'get_result_cache',
+    'get_write_buffer',
 ]
@@ -0,0 +1,65 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from fastapi import Depends
+from fastapi import FastAPI
+from fastapi.requests import Request
+
+from search.components.cache import CacheBackend
+from search.components.cache import MemoryCacheBackend
+from search.components.cache import RedisCacheBackend
+from search.components.cache import ResultCache
+from search.config import Settings
+from search.config import get_settings
+
+
+def create_cache_backend(settings: Settings) -> CacheBackend:
+    """Create a cache backend configured in settings."""
+
+    if settings.RESULT_CACHE_BACKEND == 'redis':
+        return RedisCacheBackend.from_url(settings.RESULT_CACHE_REDIS_URL, settings.RESULT_CACHE_KEY_PREFIX)
+
+    return MemoryCacheBackend(max_size=settings.RESULT_CACHE_MAX_SIZE)
+
+
+def create_result_cache(settings: Settings) -> ResultCache | None:
+    """Create a result cache or return None when caching is disabled."""
+
+    if settings.RESULT_CACHE_TTL <= 0:
+        return None
+
+    return ResultCache(
+        create_cache_backend(settings),
+        ttl=settings.RESULT_CACHE_TTL,
+        invalidation_delay=settings.RESULT_CACHE_INVALIDATION_DELAY,
+    )
+
+
+def get_application_result_cache(app: FastAPI, settings: Settings) -> ResultCache | None:
+    """Return the application-scoped result cache creating it on the first use."""
+
+    if not hasattr(app.state, 'result_cache'):
+        app.state.result_cache = create_result_cache(settings)
+
+    return app.state.result_cache
+
+
+async def close_application_result_cache(app: FastAPI) -> None:
+    """Close the application-scoped result cache if it has been created."""
+
+    cache = getattr(app.state, 'result_cache', None)
+
+    if cache is not None:
+        await cache.close()
+
+    if hasattr(app.state, 'result_cache'):
+        del app.state.result_cache
+
+
+async def get_result_cache(request: Request, settings: Settings = Depends(get_settings)) -> ResultCache | None:
+    """Create a FastAPI callable dependency for result cache instance shared by the application."""
+
+    return get_application_result_cache(request.app, settings)
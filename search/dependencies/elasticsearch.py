@@ -6,17 +6,50 @@
 
 from elasticsearch import AsyncElasticsearch
 from fastapi import Depends
+from fastapi import FastAPI
+from fastapi.requests import Request
 
 from search.config import Settings
 from search.config import get_settings
 
 
-async def get_elasticsearch_client(settings: Settings = Depends(get_settings)) -> AsyncElasticsearch:
-    """Create a FastAPI callable dependency for async Elasticsearch client instance."""
+def create_elasticsearch_client(settings: Settings) -> AsyncElasticsearch:
+    """Create an async Elasticsearch client with a pool of keep-alive connections.
 
-    client = AsyncElasticsearch(settings.ELASTICSEARCH_URI)
+    Only the pool size and the request timeout are configurable. Idle connections are closed after the aiohttp default
+    keep-alive timeout of 15 seconds, which the client doesn't expose without overriding its private session factory.
+    """
 
-    try:
-        yield client
-    finally:
+    return AsyncElasticsearch(
+        settings.ELASTICSEARCH_URI,
+        maxsize=settings.ELASTICSEARCH_MAX_CONNECTIONS,
+        timeout=settings.ELASTICSEARCH_REQUEST_TIMEOUT,
+    )
+
+
+def get_application_elasticsearch_client(app: FastAPI, settings: Settings) -> AsyncElasticsearch:
+    """Return the application-scoped Elasticsearch client creating it on the first use."""
+
+    client = getattr(app.state, 'elasticsearch_client', None)
+
+    if client is None:
+        client = create_elasticsearch_client(settings)
+        app.state.elasticsearch_client = client
+
+    return client
+
+
+async def close_application_elasticsearch_client(app: FastAPI) -> None:
+    """Close the application-scoped Elasticsearch client if it has been created."""
+
+    client = getattr(app.state, 'elasticsearch_client', None)
+
+    if client is not None:
         await client.close()
+        app.state.elasticsearch_client = None
+
+
+async def get_elasticsearch_client(request: Request, settings: Settings = Depends(get_settings)) -> AsyncElasticsearch:
+    """Create a FastAPI callable dependency for async Elasticsearch client instance shared by the application."""
+
+    return get_application_elasticsearch_client(request.app, settings)
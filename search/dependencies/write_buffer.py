@@ -0,0 +1,60 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from elasticsearch import AsyncElasticsearch
+from fastapi import Depends
+from fastapi import FastAPI
+from fastapi.requests import Request
+
+from search.components.write_buffer import WriteBuffer
+from search.config import Settings
+from search.config import get_settings
+from search.dependencies.elasticsearch import get_elasticsearch_client
+
+
+def create_write_buffer(client: AsyncElasticsearch, settings: Settings) -> WriteBuffer | None:
+    """Create a write buffer or return None when buffering is disabled."""
+
+    if not settings.WRITE_BUFFER_ENABLED:
+        return None
+
+    return WriteBuffer(
+        client,
+        flush_interval=settings.WRITE_BUFFER_FLUSH_INTERVAL,
+        max_batch_size=settings.WRITE_BUFFER_MAX_BATCH_SIZE,
+        max_pending=settings.WRITE_BUFFER_MAX_PENDING,
+    )
+
+
+def get_application_write_buffer(app: FastAPI, client: AsyncElasticsearch, settings: Settings) -> WriteBuffer | None:
+    """Return the application-scoped write buffer creating it on the first use."""
+
+    if not hasattr(app.state, 'write_buffer'):
+        app.state.write_buffer = create_write_buffer(client, settings)
+
+    return app.state.write_buffer
+
+
+async def close_application_write_buffer(app: FastAPI) -> None:
+    """Flush and close the application-scoped write buffer if it has been created."""
+
+    write_buffer = getattr(app.state, 'write_buffer', None)
+
+    if write_buffer is not None:
+        await write_buffer.close()
+
+    if hasattr(app.state, 'write_buffer'):
+        del app.state.write_buffer
+
+
+async def get_write_buffer(
+    request: Request,
+    elasticsearch_client: AsyncElasticsearch = Depends(get_elasticsearch_client),
+    settings: Settings = Depends(get_settings),
+) -> WriteBuffer | None:
+    """Create a FastAPI callable dependency for write buffer instance shared by the application."""
+
+    return get_application_write_buffer(request.app, elasticsearch_client, settings)
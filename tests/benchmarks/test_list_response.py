@@ -0,0 +1,63 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import copy
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from search.components.metadata_item.crud import MetadataItemCRUD
+from search.components.metadata_item.schemas import MetadataItemListResponseSchema
+from search.components.pagination import Pagination
+from search.logger import logger
+from tests.fixtures.components.metadata_item import MetadataItemFactory
+
+PAGE_SIZE = 200
+ROUNDS = 5
+
+
+async def measure_per_hit_cost(render, result) -> float:
+    """Return the best time in microseconds spent on one hit while rendering the whole page."""
+
+    timings = []
+    for _ in range(ROUNDS):
+        page_result = copy.deepcopy(result)
+        started_at = time.perf_counter()
+        await render(page_result)
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings) / PAGE_SIZE * 10**6
+
+
+class TestListResponseBenchmark:
+    async def test_raw_source_fast_path_reduces_per_hit_cost_of_list_response(self, fake):
+        factory = MetadataItemFactory(None, fake)
+        hits = [
+            {'_index': 'metadata-items', '_id': str(number), '_source': json.loads(factory.generate().json())}
+            for number in range(PAGE_SIZE)
+        ]
+        result = {'hits': {'total': {'value': PAGE_SIZE, 'relation': 'eq'}, 'hits': hits}}
+        crud = MetadataItemCRUD(None)
+        pagination = Pagination(page=1, page_size=PAGE_SIZE)
+
+        async def render_validated(result):
+            page = await crud._paginate_list_result(result, pagination)
+            response = MetadataItemListResponseSchema.from_page(page)
+            # FastAPI validates the returned value against response_model once again before encoding it
+            response = MetadataItemListResponseSchema.validate(response.dict())
+            return json.dumps(jsonable_encoder(response)).encode()
+
+        async def render_raw(result):
+            page = await crud._paginate_list_result(result, pagination, raw=True)
+            return MetadataItemListResponseSchema.render_page(page).body
+
+        validated_cost = await measure_per_hit_cost(render_validated, result)
+        raw_cost = await measure_per_hit_cost(render_raw, result)
+
+        logger.info(f'Per-hit cost of list response: validated {validated_cost:.1f}us, raw {raw_cost:.1f}us.')
+
+        assert raw_cost < validated_cost / 2
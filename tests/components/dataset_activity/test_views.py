@@ -4,12 +4,14 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import json
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 
 import pytest
 
+from migrations.reindexer import Reindexer
 from search.components.dataset_activity.schemas import DatasetActivityIndexedSchema
 from search.components.dataset_activity.schemas import ItemActivityIndexedSchema
 
@@ -43,6 +45,24 @@ class TestDatasetAndItemActivityLogsViews:
 
         assert received_total == 3
 
+    async def test_list_dataset_activity_returns_item_activities_read_through_reindexed_partitions(
+        self, settings, es_client, client, jq, dataset_activity_factory, item_activity_factory
+    ):
+        await item_activity_factory.bulk_create(2, activity_time=datetime.now(timezone.utc))
+        reindexer = Reindexer(settings.ELASTICSEARCH_URI, poll_interval=0)
+        reindexer.client = es_client
+        await reindexer.reindex_crud(item_activity_factory.crud)
+        await es_client.indices.refresh(index=item_activity_factory.crud.index)
+
+        response = await client.get('/v1/dataset-activity-logs/')
+
+        assert response.status_code == 200
+
+        body = jq(response)
+        received_indexes = body('.result[].index').all()
+
+        assert received_indexes == ['file', 'file']
+
     async def test_list_dataset_activity_returns_list_of_existing_item_and_dataset_activities_with_correct_schemas(
         self, client, jq, dataset_activity_factory, item_activity_factory
     ):
@@ -70,6 +90,24 @@ class TestDatasetAndItemActivityLogsViews:
         for d in dataset_activity_logs:
             assert d.keys() == DatasetActivityIndexedSchema.schema()['properties'].keys()
 
+    async def test_list_dataset_activity_returns_all_item_and_dataset_activities_when_paginated_with_cursor(
+        self, client, jq, dataset_activity_factory, item_activity_factory
+    ):
+        await item_activity_factory.bulk_create(2)
+        await dataset_activity_factory.bulk_create(2)
+
+        received_indexes = []
+        params = {'cursor': '*', 'page_size': 3, 'sort_by': 'activity_time'}
+        while params['cursor']:
+            response = await client.get('/v1/dataset-activity-logs/', params=params)
+            assert response.status_code == 200
+
+            body = jq(response)
+            received_indexes.extend(body('.result[].index').all())
+            params['cursor'] = body('.next_cursor').first()
+
+        assert sorted(received_indexes) == ['dataset', 'dataset', 'file', 'file']
+
     @pytest.mark.parametrize(
         'items_number,page,page_size,expected_count',
         [
@@ -316,3 +354,17 @@ class TestDatasetAndItemActivityLogsViews:
         assert None in item_id
         assert None in imported_from
         assert [changes] in changes_res
+
+    async def test_export_dataset_and_item_activity_logs_streams_activities_with_source_index(
+        self, client, dataset_activity_factory, item_activity_factory
+    ):
+        await item_activity_factory.bulk_create(2)
+        await dataset_activity_factory.bulk_create(1)
+
+        response = await client.get('/v1/dataset-activity-logs/export')
+
+        assert response.status_code == 200
+
+        received_indexes = [json.loads(line)['index'] for line in response.text.splitlines()]
+
+        assert sorted(received_indexes) == ['dataset', 'file', 'file']
@@ -0,0 +1,223 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from datetime import datetime
+from datetime import timezone
+
+from search.components.item_activity.crud import ActivityCounterCRUD
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.item_activity.filtering import ItemActivityProjectFileActivityFiltering
+from search.components.item_activity.models import ActivityGroupBy
+from search.components.item_activity.models import ItemActivityTransferStatistics
+from search.components.item_activity.models import ItemActivityType
+from search.components.models import ContainerType
+from tests.fixtures.components.item_activity import ItemActivityFactory
+
+HOUR = 60 * 60
+
+
+def create_composite_result(*buckets: dict) -> dict:
+    return {'aggregations': {'buckets': {'buckets': list(buckets)}}}
+
+
+def create_counter_bucket(hour: int, doc_count: int, count: int | None = None) -> dict:
+    bucket = {
+        'key': {'container_code': 'project', 'zone': 0, 'activity_type': 'upload', 'user': 'user', 'hour': hour * 1000},
+        'doc_count': doc_count,
+    }
+    if count is not None:
+        bucket['count'] = {'value': count}
+    return bucket
+
+
+class TestActivityCounterCRUD:
+    async def test_increment_upserts_one_counter_for_project_activities_of_the_same_hour(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.return_value = {'errors': False, 'items': []}
+        factory = ItemActivityFactory(None, fake)
+        activity_time = datetime(2023, 1, 1, 10, 15, tzinfo=timezone.utc)
+        models = [
+            factory.generate(
+                container_code='project',
+                container_type=container_type,
+                zone=0,
+                activity_type=ItemActivityType.UPLOAD,
+                user='user',
+                activity_time=activity_time.replace(minute=minute),
+            )
+            for minute, container_type in [(1, ContainerType.PROJECT), (59, ContainerType.PROJECT), (5, 'dataset')]
+        ]
+        crud = ActivityCounterCRUD(client)
+
+        await crud.increment(models)
+
+        operations = client.bulk.await_args.kwargs['body']
+        hour = int(activity_time.replace(minute=0).timestamp())
+        assert len(operations) == 2
+        assert operations[1]['script']['params'] == {'count': 2}
+        assert operations[1]['upsert'] == {
+            'container_code': 'project',
+            'zone': 0,
+            'activity_type': 'upload',
+            'user': 'user',
+            'hour': hour,
+            'count': 2,
+        }
+
+    async def test_backfill_overwrites_counters_with_counts_from_activity_logs(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.side_effect = [create_composite_result(create_counter_bucket(HOUR, 3)), create_composite_result()]
+        client.bulk.return_value = {'errors': False, 'items': []}
+        crud = ActivityCounterCRUD(client)
+
+        written = await crud.backfill()
+
+        assert written == 1
+        assert client.search.await_args_list[0].kwargs['index'] == 'items-activity-logs'
+        operations = client.bulk.await_args.kwargs['body']
+        assert 'index' in operations[0]
+        assert operations[1]['count'] == 3
+
+    async def test_check_consistency_returns_counters_different_from_activity_logs(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.side_effect = lambda index, **kwds: {
+            'items-activity-logs': create_composite_result(
+                create_counter_bucket(HOUR, 3), create_counter_bucket(2 * HOUR, 1)
+            ),
+            'items-activity-counters': create_composite_result(
+                create_counter_bucket(HOUR, 1, count=3), create_counter_bucket(3 * HOUR, 1, count=2)
+            ),
+        }[index]
+        crud = ActivityCounterCRUD(client)
+        mocker.patch.object(crud, 'composite_size', 10)
+
+        mismatches = await crud.check_consistency(
+            datetime.fromtimestamp(HOUR + 10, tz=timezone.utc), datetime.fromtimestamp(4 * HOUR, tz=timezone.utc)
+        )
+
+        assert [(int(mismatch.hour.timestamp()), mismatch.expected, mismatch.actual) for mismatch in mismatches] == [
+            (2 * HOUR, 1, 0),
+            (3 * HOUR, 0, 2),
+        ]
+
+
+class TestItemActivityCRUDActivityCounters:
+    async def test_bulk_create_increments_counters_of_created_activities_only(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = [
+            {
+                'errors': True,
+                'items': [{'create': {'status': 201}}, {'create': {'_id': 'id', 'status': 409, 'error': {}}}],
+            },
+            {'errors': False, 'items': []},
+        ]
+        crud = ItemActivityCRUD(client, count_activities=True)
+        factory = ItemActivityFactory(None, fake)
+        models = [factory.generate(container_type=ContainerType.PROJECT) for _ in range(2)]
+
+        await crud.bulk_create(models)
+
+        counter_operations = client.bulk.await_args_list[1].kwargs['body']
+        assert counter_operations[1]['upsert']['container_code'] == models[0].container_code
+
+    async def test_create_does_not_fail_when_counters_can_not_be_incremented(self, mocker, fake):
+        client = mocker.AsyncMock()
+        model = ItemActivityFactory(None, fake).generate(container_type=ContainerType.PROJECT)
+        client.create.side_effect = lambda index, id, document: {'_index': index, '_id': id}
+        client.get.side_effect = lambda index, id: {'_index': index, '_id': id, '_source': model.dict()}
+        client.bulk.side_effect = ConnectionError()
+        crud = ItemActivityCRUD(client, count_activities=True)
+
+        entry = await crud.create(model)
+
+        assert entry.container_code == model.container_code
+        client.bulk.assert_awaited_once()
+
+    async def test_get_project_file_activity_sums_counters_when_range_is_hour_aligned(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = {
+            'aggregations': {
+                'group_by_activity_time': {'buckets': {'2023-01-01': {'doc_count': 1, 'count': {'value': 7}}}}
+            }
+        }
+        crud = ItemActivityCRUD(client, read_activity_counters=True)
+        filtering = ItemActivityProjectFileActivityFiltering(
+            project_code='project',
+            activity_type=ItemActivityType.UPLOAD,
+            from_date=datetime(2023, 1, 1, tzinfo=timezone.utc),
+            to_date=datetime(2023, 1, 2, tzinfo=timezone.utc),
+        )
+
+        file_activity = await crud.get_project_file_activity(filtering, '+03:00', ActivityGroupBy.DAY)
+
+        assert file_activity == {'2023-01-01': 7}
+        assert client.search.await_args.kwargs['index'] == 'items-activity-counters'
+
+    async def test_get_project_file_activity_aggregates_logs_for_time_zone_with_half_hour_offset(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = {'aggregations': {'group_by_activity_time': {'buckets': {}}}}
+        crud = ItemActivityCRUD(client, read_activity_counters=True)
+        filtering = ItemActivityProjectFileActivityFiltering(
+            project_code='project',
+            activity_type=ItemActivityType.UPLOAD,
+            from_date=datetime(2023, 1, 1, tzinfo=timezone.utc),
+            to_date=datetime(2023, 1, 2, tzinfo=timezone.utc),
+        )
+
+        await crud.get_project_file_activity(filtering, '+05:30', ActivityGroupBy.DAY)
+
+        assert client.search.await_args.kwargs['index'] != 'items-activity-counters'
+
+    async def test_get_project_transfer_statistics_sums_counters_of_the_day(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = {
+            'aggregations': {
+                'activity_types': {
+                    'buckets': [
+                        {'key': 'upload', 'doc_count': 2, 'count': {'value': 5}},
+                        {'key': 'download', 'doc_count': 1, 'count': {'value': 3}},
+                    ]
+                }
+            }
+        }
+        crud = ItemActivityCRUD(client, read_activity_counters=True)
+
+        statistics = await crud.get_project_transfer_statistics('project', datetime(2023, 1, 1, 12), '+00:00')
+
+        assert statistics == ItemActivityTransferStatistics(uploaded=5, downloaded=3)
+        assert client.search.await_args.kwargs['index'] == 'items-activity-counters'
+
+    async def test_get_projects_transfer_statistics_sums_counters_of_each_project_in_one_search(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = {
+            'aggregations': {
+                'projects': {
+                    'buckets': [
+                        {
+                            'key': 'first',
+                            'doc_count': 2,
+                            'activity_types': {'buckets': [{'key': 'upload', 'doc_count': 2, 'count': {'value': 4}}]},
+                        }
+                    ]
+                }
+            }
+        }
+        crud = ItemActivityCRUD(client, read_activity_counters=True)
+
+        statistics = await crud.get_projects_transfer_statistics(
+            ['first', 'second', 'first'], datetime(2023, 1, 1, 12), '+00:00'
+        )
+
+        assert statistics == {
+            'first': ItemActivityTransferStatistics(uploaded=4, downloaded=0),
+            'second': ItemActivityTransferStatistics(uploaded=0, downloaded=0),
+        }
+        client.search.assert_awaited_once()
+        assert client.search.await_args.kwargs['index'] == 'items-activity-counters'
+        assert client.search.await_args.kwargs['aggregations']['projects']['terms'] == {
+            'field': 'container_code',
+            'size': 2,
+        }
@@ -52,6 +52,38 @@ class TestItemActivityLogsViews:
         assert received_total == 1
         assert received_activity['container_type'] == ContainerType.PROJECT.value
 
+    async def test_get_project_item_activity_logs_returns_unprocessable_entity_for_cursor_of_metadata_items(
+        self, client, jq, metadata_item_factory, item_activity_factory
+    ):
+        await metadata_item_factory.bulk_create(3)
+        await item_activity_factory.bulk_create(3)
+
+        response = await client.get('/v1/metadata-items/', params={'cursor': '*', 'page_size': 2})
+        next_cursor = jq(response)('.next_cursor').first()
+
+        response = await client.get('/v1/item-activity-logs/', params={'cursor': next_cursor, 'page_size': 2})
+
+        assert response.status_code == 422
+
+    async def test_get_project_item_activity_logs_returns_all_item_activities_when_paginated_with_cursor(
+        self, client, jq, item_activity_factory
+    ):
+        await item_activity_factory.bulk_create(3)
+
+        response = await client.get('/v1/item-activity-logs/', params={'cursor': '*', 'page_size': 2})
+        body = jq(response)
+        first_page_count = len(body('.result').first())
+        next_cursor = body('.next_cursor').first()
+
+        response = await client.get('/v1/item-activity-logs/', params={'cursor': next_cursor, 'page_size': 2})
+        body = jq(response)
+        second_page_count = len(body('.result').first())
+
+        assert first_page_count == 2
+        assert second_page_count == 1
+        assert body('.page').first() == 2
+        assert body('.next_cursor').first() is None
+
     @pytest.mark.parametrize(
         'items_number,page,page_size,expected_count',
         [
@@ -5,8 +5,10 @@
 # You may not use this file except in compliance with the License.
 
 from datetime import datetime
+from datetime import timezone
 
 from search.components.metadata_item.crud.size_usage import SizeUsageHandler
+from search.components.metadata_item.models import MetadataItemSizeUsageDataset
 from search.components.metadata_item.models import SizeGroupBy
 
 
@@ -22,3 +24,93 @@ class TestSizeUsageHandler:
         received_keys = size_usage_handler.get_grouping_keys()
 
         assert received_keys == expected_keys
+
+    def test_split_ranges_serves_whole_utc_days_before_rolled_up_until_from_rollup(self):
+        size_usage_handler = SizeUsageHandler(
+            from_date=datetime(2022, 1, 10, 12, tzinfo=timezone.utc),
+            to_date=datetime(2022, 3, 20, tzinfo=timezone.utc),
+            time_zone='+00:00',
+            group_by=SizeGroupBy.MONTH,
+        )
+
+        rollup_ranges, raw_ranges = size_usage_handler.split_ranges(datetime(2022, 3, 15, tzinfo=timezone.utc))
+
+        assert rollup_ranges == [
+            (datetime(2022, 1, 11, tzinfo=timezone.utc), datetime(2022, 3, 15, tzinfo=timezone.utc))
+        ]
+        assert raw_ranges == [
+            (datetime(2022, 1, 10, 12, tzinfo=timezone.utc), datetime(2022, 1, 11, tzinfo=timezone.utc)),
+            (datetime(2022, 3, 15, tzinfo=timezone.utc), datetime(2022, 3, 20, tzinfo=timezone.utc)),
+        ]
+
+    def test_split_ranges_leaves_days_with_month_start_in_time_zone_for_raw_documents(self):
+        size_usage_handler = SizeUsageHandler(
+            from_date=datetime(2022, 1, 1),
+            to_date=datetime(2022, 4, 1),
+            time_zone='-05:00',
+            group_by=SizeGroupBy.MONTH,
+        )
+
+        rollup_ranges, raw_ranges = size_usage_handler.split_ranges(datetime(2022, 4, 1, tzinfo=timezone.utc))
+
+        assert raw_ranges == [
+            (datetime(2022, 1, 1, tzinfo=timezone.utc), datetime(2022, 1, 2, tzinfo=timezone.utc)),
+            (datetime(2022, 2, 1, tzinfo=timezone.utc), datetime(2022, 2, 2, tzinfo=timezone.utc)),
+            (datetime(2022, 3, 1, tzinfo=timezone.utc), datetime(2022, 3, 2, tzinfo=timezone.utc)),
+        ]
+        assert rollup_ranges == [
+            (datetime(2022, 1, 2, tzinfo=timezone.utc), datetime(2022, 2, 1, tzinfo=timezone.utc)),
+            (datetime(2022, 2, 2, tzinfo=timezone.utc), datetime(2022, 3, 1, tzinfo=timezone.utc)),
+            (datetime(2022, 3, 2, tzinfo=timezone.utc), datetime(2022, 4, 1, tzinfo=timezone.utc)),
+        ]
+
+    async def test_process_search_result_sums_sizes_of_the_same_zone_and_month_from_all_pages(self):
+        size_usage_handler = SizeUsageHandler(
+            from_date=datetime(2022, 1, 1),
+            to_date=datetime(2022, 3, 1),
+            time_zone='+00:00',
+            group_by=SizeGroupBy.MONTH,
+        )
+
+        async def iterate_pages(*pages: list[dict]):
+            for page in pages:
+                yield page
+
+        def create_bucket(zone: int, date: str, size: float) -> dict:
+            return {'key': {'zone': zone, 'date': date}, 'doc_count': 1, 'total_size': {'value': size}}
+
+        size_usage = await size_usage_handler.process_search_result(
+            iterate_pages([create_bucket(0, '2022-01', 10.0)], [create_bucket(1, '2022-02', 5.0)]),
+            iterate_pages([create_bucket(0, '2022-01', 10.0), create_bucket(12, '2022-02', 0.0)]),
+        )
+
+        assert size_usage.labels == ['2022-01', '2022-02']
+        assert size_usage.datasets == [
+            MetadataItemSizeUsageDataset(label=0, values=[20, 0]),
+            MetadataItemSizeUsageDataset(label=1, values=[0, 5]),
+            MetadataItemSizeUsageDataset(label=12, values=[0, 0]),
+        ]
+
+    def test_get_composite_sources_groups_by_zone_and_month_in_time_zone(self):
+        size_usage_handler = SizeUsageHandler(
+            from_date=datetime(2022, 1, 1),
+            to_date=datetime(2022, 3, 1),
+            time_zone='+02:00',
+            group_by=SizeGroupBy.MONTH,
+        )
+
+        sources = size_usage_handler.get_composite_sources('day')
+
+        assert sources == [
+            {'zone': {'terms': {'field': 'zone'}}},
+            {
+                'date': {
+                    'date_histogram': {
+                        'field': 'day',
+                        'calendar_interval': 'month',
+                        'time_zone': '+02:00',
+                        'format': 'yyyy-MM',
+                    }
+                }
+            },
+        ]
@@ -0,0 +1,167 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from datetime import datetime
+from datetime import timezone
+
+from search.components.metadata_item.crud import MetadataItemCRUD
+from search.components.metadata_item.crud import SizeUsageRollupCRUD
+from search.components.metadata_item.crud.size_usage_rollup import get_day_ranges
+from search.components.metadata_item.filtering import MetadataItemProjectSizeUsageFiltering
+from search.components.metadata_item.models import SizeGroupBy
+
+DAY = 24 * 60 * 60
+
+
+def create_composite_result(*buckets: dict) -> dict:
+    return {'aggregations': {'buckets': {'buckets': list(buckets)}}}
+
+
+def create_size_usage_result(zone: int, month: str, size: int) -> dict:
+    return create_composite_result(
+        {'key': {'zone': zone, 'date': month}, 'doc_count': 1, 'total_size': {'value': size}}
+    )
+
+
+class TestSizeUsageRollupCRUD:
+    def test_get_day_ranges_merges_consecutive_days(self):
+        days = [datetime.fromtimestamp(day * DAY, tz=timezone.utc) for day in [1, 2, 3, 5]]
+
+        assert get_day_ranges(days) == [{'gte': DAY, 'lt': 4 * DAY}, {'gte': 5 * DAY, 'lt': 6 * DAY}]
+
+    async def test_rollup_writes_buckets_of_all_days_before_today_on_the_first_run(self, mocker):
+        client = mocker.AsyncMock()
+        client.get.return_value = {'found': False}
+        client.search.side_effect = [
+            create_composite_result(
+                {
+                    'key': {'container_code': 'project', 'zone': 0, 'day': DAY * 1000},
+                    'doc_count': 2,
+                    'size': {'value': 30},
+                }
+            ),
+            create_composite_result(),
+        ]
+        client.bulk.return_value = {'errors': False, 'items': []}
+        crud = SizeUsageRollupCRUD(client)
+        now = datetime.fromtimestamp(10 * DAY + 100, tz=timezone.utc)
+
+        count = await crud.rollup(now)
+
+        assert count == 1
+        assert client.search.await_args_list[0].kwargs['index'] == 'metadata-items'
+        assert {'range': {'created_time': {'lt': 10 * DAY}}} in (
+            client.search.await_args_list[0].kwargs['query']['bool']['filter'][2]['bool']['should']
+        )
+        client.bulk.assert_awaited_once_with(
+            index='metadata-items-size-usage-rollup',
+            body=[
+                {'index': {'_index': 'metadata-items-size-usage-rollup', '_id': f'project:0:{DAY}'}},
+                {
+                    'container_code': 'project',
+                    'zone': 0,
+                    'day': DAY,
+                    'size': 30,
+                    'count': 2,
+                    'rolled_up_time': 10 * DAY + 100,
+                },
+            ],
+        )
+        client.delete_by_query.assert_awaited_once()
+        client.index.assert_awaited_once_with(
+            index='metadata-items-size-usage-rollup',
+            id='state',
+            document={'rolled_up_until': 10 * DAY, 'updated_until': 10 * DAY + 40},
+            refresh=True,
+        )
+
+    async def test_rollup_rolls_up_again_days_with_files_updated_since_previous_rollup(self, mocker):
+        client = mocker.AsyncMock()
+        client.get.return_value = {'found': True, '_source': {'rolled_up_until': 10 * DAY, 'updated_until': 10 * DAY}}
+        crud = SizeUsageRollupCRUD(client)
+        rollup_days = mocker.patch.object(crud, 'rollup_days', return_value=1)
+        client.search.side_effect = [
+            create_composite_result(
+                {'key': {'container_code': 'project', 'day': 2 * DAY * 1000}, 'doc_count': 1},
+                {'key': {'container_code': 'project', 'day': 3 * DAY * 1000}, 'doc_count': 1},
+            ),
+            create_composite_result(),
+        ]
+        now = datetime.fromtimestamp(10 * DAY + 100, tz=timezone.utc)
+
+        count = await crud.rollup(now)
+
+        assert count == 1
+        rollup_days.assert_awaited_once_with([{'gte': 2 * DAY, 'lt': 4 * DAY}], now, 'project')
+        assert {'range': {'last_updated_time': {'gte': 10 * DAY}}} in client.search.await_args.kwargs['query']['bool'][
+            'filter'
+        ]
+
+
+class TestMetadataItemCRUDSizeUsage:
+    async def test_get_project_size_usage_sums_rolled_up_days_and_raw_documents_of_the_rest(self, mocker):
+        client = mocker.AsyncMock()
+        client.get.return_value = {'found': True, '_source': {'rolled_up_until': 1644969600, 'updated_until': 0}}
+        client.search.side_effect = lambda index, **kwds: {
+            'metadata-items': create_size_usage_result(0, '2022-02', 5),
+            'metadata-items-size-usage-rollup': create_size_usage_result(0, '2022-02', 10),
+        }[index]
+        crud = MetadataItemCRUD(client)
+        filtering = MetadataItemProjectSizeUsageFiltering(
+            project_code='project', from_date=datetime(2022, 2, 1), to_date=datetime(2022, 3, 1)
+        )
+
+        size_usage = await crud.get_project_size_usage(filtering, '+00:00', SizeGroupBy.MONTH)
+
+        assert size_usage.datasets[0].values == [15]
+        queries = {call.kwargs['index']: call.kwargs['query'] for call in client.search.await_args_list}
+        assert {'range': {'day': {'gte': 1643673600, 'lt': 1644969600}}} in (
+            queries['metadata-items-size-usage-rollup']['bool']['filter'][1]['bool']['should']
+        )
+        assert {'range': {'created_time': {'gte': 1644969600, 'lt': 1646092800}}} in (
+            queries['metadata-items']['bool']['filter'][-1]['bool']['should']
+        )
+
+    async def test_get_project_size_usage_aggregates_raw_documents_when_filtered_by_parent_path(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = create_size_usage_result(0, '2022-02', 5)
+        crud = MetadataItemCRUD(client)
+        filtering = MetadataItemProjectSizeUsageFiltering(
+            project_code='project', parent_path='folder', from_date=datetime(2022, 2, 1), to_date=datetime(2022, 3, 1)
+        )
+
+        size_usage = await crud.get_project_size_usage(filtering, '+00:00', SizeGroupBy.MONTH)
+
+        assert size_usage.datasets[0].values == [5]
+        client.get.assert_not_awaited()
+        client.search.assert_awaited_once()
+
+    async def test_get_project_size_usage_pages_through_buckets_of_all_zones(self, mocker):
+        client = mocker.AsyncMock()
+        pages = [
+            create_composite_result(
+                *[
+                    {'key': {'zone': zone, 'date': '2022-02'}, 'doc_count': 1, 'total_size': {'value': zone}}
+                    for zone in range(start, start + 2)
+                ]
+            )
+            for start in range(0, 20, 2)
+        ]
+        pages[-1]['aggregations']['buckets']['buckets'].pop()
+        for page in pages:
+            page['aggregations']['buckets']['after_key'] = {}
+        client.search.side_effect = pages
+        crud = MetadataItemCRUD(client)
+        mocker.patch.object(crud, 'composite_size', 2)
+        filtering = MetadataItemProjectSizeUsageFiltering(
+            project_code='project', parent_path='folder', from_date=datetime(2022, 2, 1), to_date=datetime(2022, 3, 1)
+        )
+
+        size_usage = await crud.get_project_size_usage(filtering, '+00:00', SizeGroupBy.MONTH)
+
+        assert [dataset.label for dataset in size_usage.datasets] == list(range(19))
+        assert [dataset.values for dataset in size_usage.datasets] == [[zone] for zone in range(19)]
+        assert client.search.await_count == 10
@@ -4,6 +4,7 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import gzip
 import json
 import uuid
 from datetime import datetime
@@ -58,6 +59,111 @@ class TestMetadataItemViews:
         assert len(received_metadata_item_ids) == expected_count
         assert received_total == items_number
 
+    async def test_list_metadata_items_returns_all_metadata_items_when_paginated_with_cursor(
+        self, client, jq, metadata_item_factory
+    ):
+        created_metadata_items = await metadata_item_factory.bulk_create(5)
+        expected_ids = set(created_metadata_items.get_field_values('id', str))
+
+        received_ids = []
+        received_pages = []
+        params = {'cursor': '*', 'page_size': 2, 'sort_by': 'size', 'sort_order': 'desc'}
+        while params['cursor']:
+            response = await client.get('/v1/metadata-items/', params=params)
+            assert response.status_code == 200
+
+            body = jq(response)
+            received_ids.extend(body('.result[].id').all())
+            received_pages.append(body('.page').first())
+            params['cursor'] = body('.next_cursor').first()
+
+        assert len(received_ids) == 5
+        assert set(received_ids) == expected_ids
+        assert received_pages == [1, 2, 3]
+
+    @pytest.mark.parametrize(
+        'params',
+        [
+            {'sort_by': 'name', 'sort_order': 'desc'},
+            {'sort_by': 'size', 'sort_order': 'desc', 'zone': 1},
+        ],
+    )
+    async def test_list_metadata_items_returns_unprocessable_entity_for_cursor_of_different_sort_or_filters(
+        self, params, client, jq, metadata_item_factory
+    ):
+        await metadata_item_factory.bulk_create(3)
+
+        response = await client.get(
+            '/v1/metadata-items/', params={'cursor': '*', 'page_size': 2, 'sort_by': 'size', 'sort_order': 'desc'}
+        )
+        next_cursor = jq(response)('.next_cursor').first()
+
+        response = await client.get('/v1/metadata-items/', params={'cursor': next_cursor, 'page_size': 2, **params})
+
+        assert response.status_code == 422
+
+        body = jq(response)
+        received_code = body('.error.code').first()
+
+        assert received_code == 'global.cursor_mismatch'
+
+    async def test_list_metadata_items_returns_bad_request_for_invalid_cursor(self, client, jq, metadata_item_factory):
+        response = await client.get('/v1/metadata-items/', params={'cursor': 'invalid'})
+
+        assert response.status_code == 400
+
+        body = jq(response)
+        received_code = body('.error.code').first()
+
+        assert received_code == 'global.invalid_cursor'
+
+    @pytest.mark.parametrize(
+        'count,expected_total,expected_num_of_pages,expected_total_relation',
+        [
+            ('exact', 3, 2, 'eq'),
+            ('approximate', 3, 2, 'eq'),
+            ('none', None, None, None),
+        ],
+    )
+    async def test_list_metadata_items_returns_total_according_to_count_mode(
+        self, count, expected_total, expected_num_of_pages, expected_total_relation, client, jq, metadata_item_factory
+    ):
+        await metadata_item_factory.bulk_create(3)
+
+        response = await client.get('/v1/metadata-items/', params={'count': count, 'page_size': 2})
+
+        assert response.status_code == 200
+
+        body = jq(response)
+        received_ids = body('.result[].id').all()
+
+        assert len(received_ids) == 2
+        assert body('.total').first() == expected_total
+        assert body('.num_of_pages').first() == expected_num_of_pages
+        assert body('.total_relation').first() == expected_total_relation
+
+    async def test_list_metadata_items_returns_only_projected_fields(self, client, jq, metadata_item_factory):
+        created_metadata_item = await metadata_item_factory.create()
+
+        response = await client.get('/v1/metadata-items/', params={'fields': 'name,size,created_time'})
+
+        assert response.status_code == 200
+
+        body = jq(response)
+        received_metadata_item = body('.result[]').first()
+
+        assert received_metadata_item == {
+            'pk': created_metadata_item.pk,
+            'name': created_metadata_item.name,
+            'size': created_metadata_item.size,
+            'created_time': created_metadata_item.created_time.isoformat(),
+        }
+
+    async def test_list_metadata_items_returns_unprocessable_entity_for_unknown_projected_field(self, client):
+        response = await client.get('/v1/metadata-items/', params={'fields': 'name,-unknown'})
+
+        assert response.status_code == 422
+
     @pytest.mark.parametrize('sort_by', MetadataItemSortByFields.values())
     @pytest.mark.parametrize('sort_order', SortingOrder.values())
     async def test_list_metadata_items_returns_results_sorted_by_field_with_proper_order(
@@ -93,6 +199,10 @@ class TestMetadataItemViews:
             ('name-abc', '%name-abc%'),
             ('.name', '.name'),
             ('.name', '%.name%'),
+            ('nameäöüß', '%NAMEAOUSS%'),
+            ('Übersicht.pdf', 'uber%'),
+            ('report.PDF', '%.pdf'),
+            ('ab.txt', '%B.%'),
         ],
     )
     async def test_list_metadata_items_returns_metadata_item_filtered_by_name(
@@ -220,6 +330,30 @@ class TestMetadataItemViews:
         assert received_ids == expected_metadata_item_ids
         assert received_total == 2
 
+    async def test_list_metadata_items_returns_metadata_items_filtered_by_parent_path_subtree(
+        self, client, jq, fake, metadata_item_factory
+    ):
+        folder = fake.word().lower()
+        container_code = metadata_item_factory.generate_container_code()
+        parent_paths = [folder, f'{folder}.{fake.word().lower()}', f'{folder}-suffix', f'prefix.{folder}']
+        created_metadata_items = [
+            await metadata_item_factory.create(parent_path=parent_path, container_code=container_code)
+            for parent_path in parent_paths
+        ]
+        expected_ids = {str(item.id) for item in created_metadata_items[:2]}
+
+        response = await client.get(
+            '/v1/metadata-items/',
+            params={'container_code': container_code, 'parent_path': folder, 'parent_path_mode': 'subtree'},
+        )
+
+        body = jq(response)
+        received_ids = body('.result[].id').all()
+        received_total = body('.total').first()
+
+        assert set(received_ids) == expected_ids
+        assert received_total == 2
+
     @pytest.mark.parametrize('parameter', ['zone', 'container_code', 'container_type', 'template_id'])
     async def test_list_metadata_items_returns_metadata_item_filtered_by_parameter_match(
         self, parameter, client, jq, metadata_item_factory
@@ -378,3 +512,94 @@ class TestMetadataItemViews:
         received_total = body('.total').first()
         assert set(received_ids) == {str(create_file_1.id), str(create_file_2.id)}
         assert received_total == 2
+
+    async def test_suggest_metadata_items_returns_items_with_name_words_starting_with_query_words(
+        self, client, jq, metadata_item_factory
+    ):
+        container_code = metadata_item_factory.generate_container_code()
+        names = ['Quarterly_Report-2023.pdf', 'report-draft.docx', 'quarterly-summary.txt', 'Übersicht-report.xlsx']
+        created_metadata_items = [
+            await metadata_item_factory.create(name=name, container_code=container_code, zone=0) for name in names
+        ]
+        await metadata_item_factory.create(name='quarterly-report.pdf', container_code=container_code, zone=1)
+        await metadata_item_factory.create(name='quarterly-report.pdf', zone=0)
+        await metadata_item_factory.create(name='quarterly-report.pdf', container_code=container_code, archived=True)
+
+        response = await client.get(
+            '/v1/metadata-items/suggest', params={'container_code': container_code, 'zone': 0, 'query': 'REP quar'}
+        )
+
+        assert response.status_code == 200
+        body = jq(response)
+        assert body('.result[].id').all() == [str(created_metadata_items[0].id)]
+        assert body('.result[]').first() == {
+            'id': str(created_metadata_items[0].id),
+            'name': created_metadata_items[0].name,
+            'type': created_metadata_items[0].type,
+            'parent_path': created_metadata_items[0].parent_path,
+        }
+
+        response = await client.get(
+            '/v1/metadata-items/suggest', params={'container_code': container_code, 'zone': 0, 'query': 'uber'}
+        )
+
+        assert jq(response)('.result[].id').all() == [str(created_metadata_items[3].id)]
+
+    async def test_suggest_metadata_items_returns_unprocessable_entity_without_query(self, client):
+        response = await client.get('/v1/metadata-items/suggest', params={'container_code': 'code', 'zone': 0})
+
+        assert response.status_code == 422
+
+    async def test_export_metadata_items_streams_all_filtered_metadata_items_as_ndjson(
+        self, client, metadata_item_factory
+    ):
+        container_code = metadata_item_factory.generate_container_code()
+        created_metadata_items = await metadata_item_factory.bulk_create(3, container_code=container_code)
+        await metadata_item_factory.bulk_create(2)
+        expected_pks = set(created_metadata_items.get_field_values('pk'))
+
+        response = await client.get(
+            '/v1/metadata-items/export', params={'container_code': container_code, 'batch_size': 2}
+        )
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/x-ndjson'
+
+        received_pks = {json.loads(line)['pk'] for line in response.text.splitlines()}
+
+        assert received_pks == expected_pks
+
+    async def test_export_metadata_items_streams_gzip_compressed_ndjson_when_compress_is_set(
+        self, client, metadata_item_factory
+    ):
+        created_metadata_items = await metadata_item_factory.bulk_create(2)
+        expected_pks = set(created_metadata_items.get_field_values('pk'))
+
+        response = await client.get('/v1/metadata-items/export', params={'compress': 'true'})
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/gzip'
+
+        received_pks = {json.loads(line)['pk'] for line in gzip.decompress(response.content).splitlines()}
+
+        assert received_pks == expected_pks
+
+    async def test_bulk_create_metadata_items_creates_and_reads_back_metadata_items(
+        self, client, jq, metadata_item_factory
+    ):
+        metadata_items = [metadata_item_factory.generate() for _ in range(3)]
+        expected_ids = {str(metadata_item.id) for metadata_item in metadata_items}
+
+        response = await client.post(
+            '/v1/metadata-items/bulk',
+            params={'read_back': 'true'},
+            json={'items': [json.loads(metadata_item.json()) for metadata_item in metadata_items]},
+        )
+
+        assert response.status_code == 200
+
+        body = jq(response)
+        assert body('.created').first() == 3
+        assert body('.errors').first() == []
+        assert set(body('.result[].id').all()) == expected_ids
+        assert set(body('.result[].pk').all()) == set(body('.pks[]').all())
@@ -4,12 +4,41 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import asyncio
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 
+import pytest
+
+from search.components.item_activity.crud import ItemActivityCRUD
 from search.components.item_activity.models import ItemActivityType
+from search.components.metadata_item.crud import MetadataItemCRUD
 from search.components.metadata_item.models import MetadataItemType
+from search.components.project_files import views
+from search.components.project_files.parameters import ProjectFilesBatchStatisticsParameters
+from search.components.project_files.parameters import ProjectFilesSizeParameters
+from search.components.project_files.parameters import ProjectFilesStatisticsParameters
+from search.components.project_files.schemas import ProjectFilesBatchStatisticsSchema
+
+
+def create_statistics_response(header: dict) -> dict:
+    if header['index'] == 'metadata-items':
+        return {
+            'hits': {'total': {'value': 1}},
+            'aggregations': {
+                'size': {'value': 10},
+                'projects': {'buckets': [{'key': 'code', 'doc_count': 1, 'size': {'value': 10}}]},
+            },
+        }
+
+    buckets = [{'key': ItemActivityType.UPLOAD.value, 'doc_count': 1}]
+    return {
+        'aggregations': {
+            'activity_types': {'buckets': buckets},
+            'projects': {'buckets': [{'key': 'code', 'activity_types': {'buckets': buckets}}]},
+        }
+    }
 
 
 class TestProjectFilesViews:
@@ -32,6 +61,63 @@ class TestProjectFilesViews:
 
         assert received_zone == created_metadata_item.zone
 
+    async def test_get_project_size_usage_sends_first_pages_of_raw_and_rollup_searches_in_one_msearch_request(
+        self, mocker
+    ):
+        client = mocker.AsyncMock()
+        rolled_up_until = datetime(2023, 3, 10, tzinfo=timezone.utc)
+        client.get.return_value = {
+            'found': True,
+            '_source': {
+                'rolled_up_until': int(rolled_up_until.timestamp()),
+                'updated_until': int(rolled_up_until.timestamp()),
+            },
+        }
+        client.msearch.side_effect = lambda body: {
+            'responses': [{'aggregations': {'buckets': {'buckets': []}}} for _ in body[::2]]
+        }
+        parameters = ProjectFilesSizeParameters(
+            **{'from': rolled_up_until - timedelta(days=5), 'to': rolled_up_until + timedelta(days=5)}
+        )
+
+        await views.get_project_size_usage('code', parameters=parameters, metadata_item_crud=MetadataItemCRUD(client))
+
+        client.msearch.assert_awaited_once()
+        indices = [header['index'] for header in client.msearch.await_args.kwargs['body'][::2]]
+        assert sorted(indices) == ['metadata-items', 'metadata-items-size-usage-rollup']
+        client.search.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        'view,kwds',
+        [
+            (views.get_project_statistics, {'project_code': 'code', 'parameters': ProjectFilesStatisticsParameters()}),
+            (
+                views.get_projects_statistics,
+                {
+                    'data': ProjectFilesBatchStatisticsSchema(project_codes=['code']),
+                    'parameters': ProjectFilesBatchStatisticsParameters(),
+                },
+            ),
+        ],
+    )
+    async def test_statistics_views_send_searches_of_both_indices_in_one_msearch_request(self, view, kwds, mocker):
+        client = mocker.AsyncMock()
+
+        async def exists_alias(name):
+            await asyncio.sleep(0.001)
+            return True
+
+        client.indices.exists_alias.side_effect = exists_alias
+        client.msearch.side_effect = lambda body: {'responses': [create_statistics_response(h) for h in body[::2]]}
+
+        response = await view(
+            **kwds, metadata_item_crud=MetadataItemCRUD(client), item_activity_crud=ItemActivityCRUD(client)
+        )
+
+        client.msearch.assert_awaited_once()
+        client.search.assert_not_awaited()
+        assert '"today_uploaded":1' in response.json(separators=(',', ':'))
+
     async def test_get_project_statistics_returns_files_and_transfer_activity_statistics(
         self, fake, client, metadata_item_factory, item_activity_factory
     ):
@@ -100,6 +186,54 @@ class TestProjectFilesViews:
 
         assert response.json() == expected_response
 
+    async def test_get_projects_statistics_returns_statistics_of_each_requested_project(
+        self, client, metadata_item_factory, item_activity_factory
+    ):
+        project_codes = [metadata_item_factory.generate_container_code() for _ in range(3)]
+        time = datetime.now(tz=timezone.utc)
+        created_metadata_items = [
+            await metadata_item_factory.create(
+                container_code=project_code, created_time=time, type_=MetadataItemType.FILE
+            )
+            for project_code in project_codes[:2]
+        ]
+        await metadata_item_factory.create(
+            container_code=project_codes[0], created_time=time, type_=MetadataItemType.FILE, archived=True
+        )
+        await item_activity_factory.create(
+            container_code=project_codes[0], activity_time=time, activity_type=ItemActivityType.UPLOAD
+        )
+        await item_activity_factory.bulk_create(
+            2, container_code=project_codes[1], activity_time=time, activity_type=ItemActivityType.DOWNLOAD
+        )
+
+        response = await client.post(
+            '/v1/project-files/statistics', params={'time_zone': '+00:00'}, json={'project_codes': project_codes}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            'result': {
+                project_codes[0]: {
+                    'files': {'total_count': 1, 'total_size': created_metadata_items[0].size},
+                    'activity': {'today_uploaded': 1, 'today_downloaded': 0},
+                },
+                project_codes[1]: {
+                    'files': {'total_count': 1, 'total_size': created_metadata_items[1].size},
+                    'activity': {'today_uploaded': 0, 'today_downloaded': 2},
+                },
+                project_codes[2]: {
+                    'files': {'total_count': 0, 'total_size': 0},
+                    'activity': {'today_uploaded': 0, 'today_downloaded': 0},
+                },
+            }
+        }
+
+    async def test_get_projects_statistics_returns_unprocessable_entity_for_empty_project_codes(self, client):
+        response = await client.post('/v1/project-files/statistics', json={'project_codes': []})
+
+        assert response.status_code == 422
+
     async def test_get_project_file_activity_returns_project_activity_datasets_grouped_by_day(
         self, client, item_activity_factory
     ):
@@ -0,0 +1,140 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+import json
+
+from elasticsearch import TransportError
+
+from search.components.cache import MemoryCacheBackend
+from search.components.cache import ResultCache
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.metadata_item.crud import MetadataItemCRUD
+from tests.fixtures.components.item_activity import ItemActivityFactory
+from tests.fixtures.components.metadata_item import MetadataItemFactory
+
+
+def create_bulk_result(operations: list, failed: set[int] | None = None) -> dict:
+    failed = failed or set()
+
+    items = []
+    for position, operation in enumerate(operations[::2]):
+        item = {'_id': operation['create']['_id'], 'status': 201}
+        if position in failed:
+            item = {
+                '_id': operation['create']['_id'],
+                'status': 400,
+                'error': {'type': 'mapper_parsing_exception', 'reason': 'failed to parse'},
+            }
+        items.append({'create': item})
+
+    return {'errors': bool(failed), 'items': items}
+
+
+class TestBulkCreate:
+    async def test_bulk_create_sends_documents_in_chunks_of_bulk_requests(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda index, body: create_bulk_result(body)
+        crud = ItemActivityCRUD(client)
+        models = [ItemActivityFactory(None, fake).generate() for _ in range(5)]
+
+        result = await crud.bulk_create(models, chunk_size=2, concurrency=2)
+
+        assert client.bulk.await_count == 3
+        sent = [call.kwargs['body'] for call in client.bulk.await_args_list]
+        assert [len(operations) for operations in sent] == [4, 4, 2]
+        assert [json.loads(operations[1]) for operations in sent] == [json.loads(model.json()) for model in models[::2]]
+        assert result.errors == []
+        assert result.pks == [operation['create']['_id'] for operations in sent for operation in operations[::2]]
+        assert result.entries is None
+        client.mget.assert_not_awaited()
+
+    async def test_bulk_create_reports_errors_of_documents_that_were_not_created(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda index, body: create_bulk_result(body, failed={1})
+        crud = ItemActivityCRUD(client)
+        models = [ItemActivityFactory(None, fake).generate() for _ in range(4)]
+
+        result = await crud.bulk_create(models, chunk_size=2)
+
+        assert [error.position for error in result.errors] == [1, 3]
+        assert {error.status for error in result.errors} == {400}
+        assert {error.type for error in result.errors} == {'mapper_parsing_exception'}
+        assert result.pks[1] is None
+        assert result.pks[3] is None
+        assert result.pks[0] is not None
+
+    async def test_bulk_create_reports_all_documents_of_chunk_as_failed_when_bulk_request_fails(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = [
+            TransportError(413, 'request_entity_too_large', 'too large'),
+            {'errors': False, 'items': []},
+        ]
+        crud = ItemActivityCRUD(client)
+        models = [ItemActivityFactory(None, fake).generate() for _ in range(3)]
+
+        result = await crud.bulk_create(models, chunk_size=2, concurrency=1)
+
+        assert [error.position for error in result.errors] == [0, 1]
+        assert {error.status for error in result.errors} == {413}
+        assert result.pks[:2] == [None, None]
+        assert result.pks[2] is not None
+
+    async def test_bulk_create_retrieves_only_created_entries_when_read_back_is_set(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda index, body: create_bulk_result(body, failed={0})
+        models = [MetadataItemFactory(None, fake).generate() for _ in range(2)]
+        client.mget.side_effect = lambda index, body: {
+            'docs': [{**document, 'found': True, '_source': json.loads(models[1].json())} for document in body['docs']]
+        }
+        crud = MetadataItemCRUD(client)
+
+        result = await crud.bulk_create(models, read_back=True)
+
+        client.mget.assert_awaited_once_with(
+            index=crud.index, body={'docs': [{'_index': crud.index, '_id': result.pks[1]}]}
+        )
+        assert len(result.entries) == 1
+        assert result.entries[0].pk == result.pks[1]
+
+    async def test_bulk_create_invalidates_cached_results_of_crud(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda index, body: create_bulk_result(body)
+        cache = ResultCache(MemoryCacheBackend(max_size=10), ttl=60)
+        crud = ItemActivityCRUD(client, cache)
+        factory = mocker.AsyncMock(return_value=fake.pyint())
+        key = f'{crud}:key'
+        await cache.get_or_set(key, factory)
+
+        await crud.bulk_create([ItemActivityFactory(None, fake).generate()])
+        await cache.get_or_set(key, factory)
+
+        assert factory.await_count == 2
+
+    async def test_bulk_create_keeps_cached_results_between_coalesced_invalidations_under_concurrent_writes(
+        self, mocker, fake
+    ):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda index, body: create_bulk_result(body)
+        backend = MemoryCacheBackend(max_size=10)
+        delete_namespace = mocker.spy(backend, 'delete_namespace')
+        cache = ResultCache(backend, ttl=60, invalidation_delay=60)
+        crud = ItemActivityCRUD(client, cache)
+        factory = mocker.AsyncMock(return_value=fake.pyint())
+        key = f'{crud}:key'
+        model = ItemActivityFactory(None, fake).generate()
+
+        for _ in range(50):
+            await asyncio.gather(crud.bulk_create([model]), cache.get_or_set(key, factory))
+
+        assert cache.get_statistics() == {'hits': 49, 'misses': 1}
+        delete_namespace.assert_not_awaited()
+
+        await cache.close()
+        await cache.get_or_set(key, factory)
+
+        delete_namespace.assert_awaited_once_with(str(crud))
+        assert factory.await_count == 2
@@ -0,0 +1,315 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import pytest
+
+from search.components.cache import MemoryCacheBackend
+from search.components.cache import RedisCacheBackend
+from search.components.cache import ResultCache
+from search.components.cache import cached_result
+from search.components.cache import make_cache_key
+from search.components.metadata_item.filtering import MetadataItemProjectSizeUsageFiltering
+from search.components.metadata_item.models import SizeGroupBy
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.calls
+
+
+class TestMakeCacheKey:
+    def test_make_cache_key_returns_the_same_key_for_equal_filtering_in_different_time_zones(self, fake):
+        from_date = fake.date_time(tzinfo=timezone.utc)
+        to_date = from_date + timedelta(days=30)
+        shifted = timezone(timedelta(hours=3))
+        filtering_1 = MetadataItemProjectSizeUsageFiltering(project_code='code', from_date=from_date, to_date=to_date)
+        filtering_2 = MetadataItemProjectSizeUsageFiltering(
+            project_code='code', from_date=from_date.astimezone(shifted), to_date=to_date.astimezone(shifted)
+        )
+
+        key_1 = make_cache_key('namespace', 'name', filtering_1, '+00:00', SizeGroupBy.MONTH)
+        key_2 = make_cache_key('namespace', 'name', filtering_2, '+00:00', 'month')
+
+        assert key_1 == key_2
+        assert key_1.startswith('namespace:')
+
+    def test_make_cache_key_returns_different_keys_for_different_arguments(self):
+        key_1 = make_cache_key('namespace', 'name', 'a', datetime(2022, 1, 1))
+        key_2 = make_cache_key('namespace', 'name', 'b', datetime(2022, 1, 1))
+
+        assert key_1 != key_2
+
+
+class TestMemoryCacheBackend:
+    async def test_get_returns_none_when_value_is_expired(self):
+        clock = Clock()
+        backend = MemoryCacheBackend(max_size=10, clock=clock)
+        await backend.set('key', b'value', 5, 0)
+
+        assert await backend.get('key') == (b'value', 0)
+
+        clock.now = 5
+
+        assert await backend.get('key') == (None, 0)
+
+    async def test_set_evicts_least_recently_used_values_above_size_limit(self):
+        backend = MemoryCacheBackend(max_size=2)
+
+        await backend.set('first', b'1', 5, 0)
+        await backend.set('second', b'2', 5, 0)
+        await backend.get('first')
+        await backend.set('third', b'3', 5, 0)
+
+        assert len(backend) == 2
+        assert await backend.get('first') == (b'1', 0)
+        assert await backend.get('second') == (None, 0)
+
+    async def test_delete_namespace_removes_only_values_within_namespace(self):
+        backend = MemoryCacheBackend(max_size=10)
+        await backend.set('first:key', b'1', 5, 0)
+        await backend.set('second:key', b'2', 5, 0)
+
+        await backend.delete_namespace('first')
+
+        assert await backend.get('first:key') == (None, 1)
+        assert await backend.get('second:key') == (b'2', 0)
+
+    async def test_set_skips_value_of_outdated_namespace_version(self):
+        backend = MemoryCacheBackend(max_size=10)
+        _, version = await backend.get('namespace:key')
+
+        await backend.delete_namespace('namespace')
+        await backend.set('namespace:key', b'stale', 5, version)
+
+        assert len(backend) == 0
+
+
+class TestRedisCacheBackend:
+    async def test_backends_share_values_and_invalidation_through_the_server(self, redis_server):
+        backend_1 = RedisCacheBackend.from_url(redis_server.url)
+        backend_2 = RedisCacheBackend.from_url(redis_server.url)
+
+        try:
+            await backend_1.set('first:key', b'1', 5, 0)
+            await backend_1.set('second:key', b'2', 5, 0)
+
+            assert await backend_2.get('first:key') == (b'1', 0)
+
+            await backend_2.delete_namespace('first')
+
+            assert await backend_1.get('first:key') == (None, 1)
+            assert await backend_1.get('second:key') == (b'2', 0)
+        finally:
+            await backend_1.close()
+            await backend_2.close()
+
+    async def test_set_stores_value_with_time_to_live_under_key_prefix(self, redis_server):
+        backend = RedisCacheBackend.from_url(redis_server.url, prefix='prefix:')
+
+        try:
+            await backend.set('namespace:key', b'value', 0.01, 0)
+
+            assert redis_server.values[b'prefix:namespace:key'][1] == b'0:value'
+
+            await asyncio.sleep(0.02)
+
+            assert await backend.get('namespace:key') == (None, 0)
+        finally:
+            await backend.close()
+
+    async def test_delete_namespace_increments_namespace_generation_without_touching_values(self, redis_server):
+        backend = RedisCacheBackend.from_url(redis_server.url, prefix='prefix:')
+
+        try:
+            await backend.set('namespace:key', b'1', 5, 0)
+            await backend.delete_namespace('namespace')
+
+            assert await backend.get('namespace:key') == (None, 1)
+
+            await backend.set('namespace:key', b'2', 5, 1)
+
+            assert await backend.get('namespace:key') == (b'2', 1)
+            assert set(redis_server.values) == {b'prefix:namespace:key', b'prefix:generation:namespace'}
+        finally:
+            await backend.close()
+
+    async def test_get_reads_generation_and_value_in_one_round_trip(self, redis_server, mocker):
+        backend = RedisCacheBackend.from_url(redis_server.url)
+        execute_command = mocker.spy(backend.client, 'execute_command')
+
+        try:
+            await backend.set('namespace:key', b'value', 5, 0)
+            assert await backend.get('namespace:key') == (b'value', 0)
+        finally:
+            await backend.close()
+
+        assert [call.args[0] for call in execute_command.call_args_list] == ['SET', 'MGET']
+
+    async def test_get_returns_none_when_server_is_not_available(self, redis_server):
+        backend = RedisCacheBackend.from_url(redis_server.url)
+        await redis_server.stop()
+
+        try:
+            assert await backend.get('key') == (None, None)
+        finally:
+            await backend.close()
+
+
+class TestResultCache:
+    async def test_get_or_set_returns_cached_value_and_counts_hits_and_misses(self):
+        cache = ResultCache(MemoryCacheBackend(max_size=10), ttl=5)
+        factory = Counter()
+
+        assert await cache.get_or_set('key', factory, int) == 1
+        assert await cache.get_or_set('key', factory, int) == 1
+
+        assert factory.calls == 1
+        assert cache.get_statistics() == {'hits': 1, 'misses': 1}
+
+    async def test_get_or_set_parses_cached_value_using_result_type(self):
+        cache = ResultCache(MemoryCacheBackend(max_size=10), ttl=5)
+        value = MetadataItemProjectSizeUsageFiltering(
+            project_code='code', from_date=datetime(2022, 1, 1, tzinfo=timezone.utc), to_date=datetime.now(timezone.utc)
+        )
+
+        async def factory():
+            return value
+
+        await cache.get_or_set('key', factory, MetadataItemProjectSizeUsageFiltering)
+        received = await cache.get_or_set('key', factory, MetadataItemProjectSizeUsageFiltering)
+
+        assert received == value
+        assert received is not value
+
+    async def test_get_or_set_shares_one_computation_between_concurrent_requests_of_the_same_key(self):
+        cache = ResultCache(MemoryCacheBackend(max_size=10), ttl=5)
+        factory = Counter()
+
+        received = await asyncio.gather(*[cache.get_or_set('key', factory, int) for _ in range(5)])
+
+        assert received == [1] * 5
+        assert factory.calls == 1
+        assert cache.get_statistics() == {'hits': 4, 'misses': 1}
+
+    async def test_get_or_set_propagates_exception_to_concurrent_requests_without_caching_it(self):
+        backend = MemoryCacheBackend(max_size=10)
+        cache = ResultCache(backend, ttl=5)
+
+        async def factory():
+            await asyncio.sleep(0)
+            raise ValueError()
+
+        received = await asyncio.gather(
+            cache.get_or_set('key', factory), cache.get_or_set('key', factory), return_exceptions=True
+        )
+
+        assert all(isinstance(exception, ValueError) for exception in received)
+        assert len(backend) == 0
+
+    async def test_invalidate_coalesces_invalidations_of_namespace_within_delay(self, mocker):
+        backend = MemoryCacheBackend(max_size=10)
+        delete_namespace = mocker.spy(backend, 'delete_namespace')
+        cache = ResultCache(backend, ttl=5, invalidation_delay=0.01)
+
+        for _ in range(5):
+            await cache.invalidate('namespace')
+        await asyncio.sleep(0.02)
+        await cache.invalidate('namespace')
+        await asyncio.sleep(0.02)
+
+        assert delete_namespace.await_count == 2
+
+    @pytest.mark.parametrize('backend_type', ['memory', 'redis'])
+    async def test_get_or_set_does_not_return_value_computed_while_namespace_is_invalidated(
+        self, backend_type, redis_server
+    ):
+        if backend_type == 'memory':
+            backend = MemoryCacheBackend(max_size=10)
+        else:
+            backend = RedisCacheBackend.from_url(redis_server.url)
+        cache = ResultCache(backend, ttl=5)
+        factory = Counter()
+
+        async def invalidating_factory():
+            value = await factory()
+            await cache.invalidate('namespace')
+            return value
+
+        try:
+            assert await cache.get_or_set('namespace:key', invalidating_factory, int) == 1
+            assert await cache.get_or_set('namespace:key', factory, int) == 2
+            assert await cache.get_or_set('namespace:key', factory, int) == 2
+        finally:
+            await cache.close()
+
+        assert cache.get_statistics() == {'hits': 1, 'misses': 2}
+
+    async def test_get_or_set_returns_value_cached_by_another_worker_through_shared_backend(self, redis_server):
+        cache_1 = ResultCache(RedisCacheBackend.from_url(redis_server.url), ttl=5)
+        cache_2 = ResultCache(RedisCacheBackend.from_url(redis_server.url), ttl=5)
+        factory = Counter()
+
+        try:
+            await cache_1.get_or_set('key', factory, int)
+            received = await cache_2.get_or_set('key', factory, int)
+        finally:
+            await cache_1.close()
+            await cache_2.close()
+
+        assert received == 1
+        assert factory.calls == 1
+        assert cache_2.hits == 1
+
+
+class TestCachedResult:
+    class CustomCRUD:
+        def __init__(self, cache: ResultCache | None) -> None:
+            self.cache = cache
+            self.counter = Counter()
+
+        def __str__(self) -> str:
+            return 'CustomCRUD'
+
+        @cached_result
+        async def get_value(self, argument: str) -> int:
+            return await self.counter()
+
+    @pytest.mark.parametrize('cache,expected_calls', [(None, 2), (ResultCache(MemoryCacheBackend(max_size=10), 5), 1)])
+    async def test_cached_result_uses_result_cache_of_instance_when_it_is_available(self, cache, expected_calls):
+        crud = self.CustomCRUD(cache)
+
+        await crud.get_value('argument')
+        await crud.get_value('argument')
+
+        assert crud.counter.calls == expected_calls
+
+    async def test_cached_result_caches_results_within_crud_namespace(self):
+        backend = MemoryCacheBackend(max_size=10)
+        crud = self.CustomCRUD(ResultCache(backend, 5))
+
+        await crud.get_value('argument')
+        await crud.cache.invalidate('CustomCRUD')
+        await crud.get_value('argument')
+
+        assert crud.counter.calls == 2
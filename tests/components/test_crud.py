@@ -4,7 +4,14 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import pytest
+
 from search.components.crud import CRUD
+from search.components.exceptions import CursorMismatch
+from search.components.metadata_item.crud import MetadataItemCRUD
+from search.components.pagination import Cursor
+from search.components.pagination import CursorPagination
+from search.components.pagination import get_cursor_digest
 
 
 class TestCRUD:
@@ -18,3 +25,41 @@ class TestCRUD:
 
         is_exists = await crud.is_index_exists()
         assert is_exists is True
+
+
+class TestCRUDCursorPagination:
+    async def test_list_with_cursor_raises_cursor_mismatch_for_cursor_of_different_query(self, mocker):
+        client = mocker.AsyncMock()
+        crud = MetadataItemCRUD(client)
+        sort = [crud.point_in_time_tiebreaker]
+        digest = get_cursor_digest(crud.index, {'match_all': {}}, sort)
+        cursor = Cursor(point_in_time_id='pit', digest=digest, search_after=[1], page=1)
+
+        with pytest.raises(CursorMismatch):
+            await crud._list_with_cursor({'term': {'zone': 1}}, None, CursorPagination(page=2, cursor=cursor))
+
+        client.search.assert_not_awaited()
+
+    async def test_list_with_cursor_raises_cursor_mismatch_for_snapshot_of_another_index(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = {
+            'pit_id': 'pit',
+            'hits': {'hits': [{'_index': 'items-activity-logs-2023.01', '_id': 'pk', '_source': {}, 'sort': [1]}]},
+        }
+        crud = MetadataItemCRUD(client)
+        query = {'match_all': {}}
+        digest = get_cursor_digest(crud.index, query, [crud.point_in_time_tiebreaker])
+        cursor = Cursor(point_in_time_id='pit', digest=digest, search_after=[1], page=1)
+
+        with pytest.raises(CursorMismatch):
+            await crud._list_with_cursor(query, None, CursorPagination(page=2, cursor=cursor))
+
+    async def test_search_point_in_time_searches_snapshot_without_index_and_batching(self, mocker):
+        client = mocker.AsyncMock()
+        crud = MetadataItemCRUD(client)
+        crud.multi_search = mocker.Mock()
+
+        await crud._search_point_in_time('pit', query={'match_all': {}})
+
+        client.search.assert_awaited_once_with(pit={'id': 'pit', 'keep_alive': '1m'}, query={'match_all': {}})
+        crud.multi_search.search.assert_not_called()
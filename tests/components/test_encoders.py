@@ -4,12 +4,38 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+import json
 from datetime import datetime
 from datetime import timezone
 
+import pytest
+from fastapi.encoders import jsonable_encoder
+
 from search.components.encoders import datetime_to_timestamp
+from search.components.encoders import dumps_json
+from search.components.metadata_item.models import MetadataItemType
+from search.components.metadata_item.schemas import MetadataItemSchema
+from tests.fixtures.components.metadata_item import MetadataItemFactory
 
 
 class TestEncoders:
     def test_datetime_to_timestamp_converts_utc_datetime_into_seconds_timestamp(self):
         assert datetime_to_timestamp(datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc)) == 60
+
+    def test_dumps_json_serializes_uuid_datetime_and_str_enum_natively(self, fake):
+        value = fake.uuid4(cast_to=None)
+        created_time = datetime(2022, 5, 1, 10, 30, 15, 250, tzinfo=timezone.utc)
+
+        result = dumps_json({'id': value, 'created_time': created_time, 'type': MetadataItemType.FILE})
+
+        expected = f'{{"id":"{value}","created_time":"2022-05-01T10:30:15.000250+00:00","type":"file"}}'
+        assert result == expected.encode()
+
+    def test_dumps_json_returns_the_same_content_as_jsonable_encoder_for_pydantic_models(self, fake):
+        schema = MetadataItemSchema(**MetadataItemFactory(None, fake).generate().dict())
+
+        assert json.loads(dumps_json({'result': [schema]})) == jsonable_encoder({'result': [schema]})
+
+    def test_dumps_json_raises_type_error_for_unsupported_values(self):
+        with pytest.raises(TypeError):
+            dumps_json({'value': object()})
@@ -0,0 +1,33 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import gzip
+import json
+
+from search.components.export import compress_gzip
+from search.components.export import encode_ndjson
+
+
+async def iterate(items):
+    for item in items:
+        yield item
+
+
+class TestExport:
+    async def test_encode_ndjson_encodes_each_batch_into_one_chunk_with_document_per_line(self, fake):
+        batches = [[{'name': fake.word()}, {'name': 'nameäöüß'}], [{'size': fake.pyint()}]]
+
+        chunks = [chunk async for chunk in encode_ndjson(iterate(batches))]
+
+        assert len(chunks) == 2
+        assert [json.loads(line) for line in b''.join(chunks).splitlines()] == batches[0] + batches[1]
+
+    async def test_compress_gzip_returns_stream_that_can_be_decompressed_into_original_content(self, fake):
+        chunks = [fake.pystr().encode() for _ in range(3)]
+
+        compressed = [chunk async for chunk in compress_gzip(iterate(chunks))]
+
+        assert gzip.decompress(b''.join(compressed)) == b''.join(chunks)
@@ -4,7 +4,9 @@
 # Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
 # You may not use this file except in compliance with the License.
 
+from search.components.crud import CRUD
 from search.components.filtering import Filtering
+from search.components.search_query import SearchQuery
 
 
 class TestFiltering:
@@ -23,3 +25,39 @@ class TestFiltering:
         filtering = CustomFiltering()
 
         assert bool(filtering) is False
+
+    def test__bool__does_not_convert_filtering_into_dict(self, mocker):
+        class CustomFiltering(Filtering):
+            field: dict[str, str] | None = None
+
+        filtering = CustomFiltering(field={'key': 'value'})
+        mocker.patch.object(CustomFiltering, 'dict', side_effect=AssertionError)
+
+        assert bool(filtering) is True
+
+    def test_get_shape_returns_names_of_attributes_with_values(self):
+        class CustomFiltering(Filtering):
+            first: str | None = None
+            second: int | None = None
+            third: bool | None = None
+
+        filtering = CustomFiltering(first='value', third=False)
+
+        assert filtering.get_shape() == ['first', 'third']
+
+    def test_build_query_records_filtering_shape_in_trace_span(self, mocker):
+        class CustomFiltering(Filtering):
+            field: str | None = None
+
+            def apply(self, search_query: SearchQuery) -> None:
+                search_query.match_term('field', self.field)
+
+        tracer = mocker.patch('search.components.crud.tracer')
+        span = tracer.start_as_current_span.return_value.__enter__.return_value
+        span.is_recording.return_value = True
+
+        query = CRUD(None)._build_query(CustomFiltering(field='value'))
+
+        assert query == {'bool': {'filter': [{'term': {'field': 'value'}}]}}
+        tracer.start_as_current_span.assert_called_once_with('build_query')
+        span.set_attribute.assert_any_call('search.filtering.shape', ['field'])
@@ -0,0 +1,150 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import pytest
+
+from search.components.dataset_activity.crud import DatasetActivityCRUD
+from search.components.dataset_activity.crud import DatasetAndItemActivityCRUD
+from search.components.dataset_activity.filtering import DatasetAndItemActivityFiltering
+from search.components.index import compare_properties
+from search.components.index import get_field_names
+from search.components.index import get_index_sort_settings
+from search.components.index import has_nested_fields
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.metadata_item.crud import MetadataItemCRUD
+from search.components.pagination import Pagination
+
+
+class TestIndexSort:
+    def test_get_index_sort_settings_returns_fields_and_orders_in_the_same_order(self):
+        settings = get_index_sort_settings({'container_code': 'asc', 'activity_time': 'desc'})
+
+        assert settings == {'index': {'sort.field': ['container_code', 'activity_time'], 'sort.order': ['asc', 'desc']}}
+
+    def test_get_index_sort_settings_returns_no_settings_for_empty_index_sort(self):
+        assert get_index_sort_settings({}) == {}
+
+    def test_has_nested_fields_finds_nested_fields_inside_objects(self):
+        mappings = {'properties': {'object': {'properties': {'nested': {'type': 'nested'}}}}}
+
+        assert has_nested_fields(mappings) is True
+        assert has_nested_fields({'properties': {'field': {'type': 'keyword'}}}) is False
+
+    @pytest.mark.parametrize('crud_class', [MetadataItemCRUD, ItemActivityCRUD, DatasetActivityCRUD])
+    def test_crud_index_sort_is_used_only_with_mappings_without_nested_fields(self, crud_class):
+        assert not (crud_class.index_sort and has_nested_fields(crud_class.index_mappings))
+
+    def test_partition_template_includes_index_sort_settings(self):
+        template = ItemActivityCRUD(None).get_index_template()
+
+        assert template['template']['settings']['index'] == {
+            'sort.field': ['container_code', 'activity_time'],
+            'sort.order': ['asc', 'desc'],
+        }
+
+    async def test_get_unsorted_indices_returns_indices_with_different_sort(self, mocker):
+        client = mocker.AsyncMock()
+        client.indices.get_settings.return_value = {
+            'items-activity-logs-2023.01': {'settings': {}},
+            'items-activity-logs-2023.02': {
+                'settings': {
+                    'index': {'sort': {'field': ['container_code', 'activity_time'], 'order': ['asc', 'desc']}}
+                }
+            },
+        }
+        crud = ItemActivityCRUD(client)
+
+        unsorted_indices = await crud.get_unsorted_indices()
+
+        assert unsorted_indices == ['items-activity-logs-2023.01']
+        client.indices.get_settings.assert_awaited_once_with(index='items-activity-logs', name='index.sort.*')
+
+
+class TestSortAlignment:
+    @pytest.mark.parametrize(
+        'container_code,sort,expected_sort',
+        [
+            (
+                'project',
+                [{'activity_time': 'desc'}],
+                [{'container_code': 'asc'}, {'activity_time': 'desc'}],
+            ),
+            (None, [{'activity_time': 'desc'}], [{'activity_time': 'desc'}]),
+            ('project', [{'activity_time': 'asc'}], [{'activity_time': 'asc'}]),
+            ('project', [{'container_code': 'asc'}], [{'container_code': 'asc'}]),
+        ],
+    )
+    async def test_list_prefixes_sort_with_index_sort_fields_matched_by_filtering(
+        self, container_code, sort, expected_sort, mocker
+    ):
+        client = mocker.AsyncMock()
+        client.search.return_value = {'hits': {'total': {'value': 0, 'relation': 'eq'}, 'hits': []}}
+        crud = DatasetAndItemActivityCRUD(client)
+        sorting = mocker.MagicMock()
+        sorting.apply.return_value = sort
+        filtering = DatasetAndItemActivityFiltering(container_code=container_code)
+
+        await crud.list(Pagination(page=1, page_size=10), sorting, filtering)
+
+        assert client.search.await_args.kwargs['sort'] == expected_sort
+
+
+class TestCompareProperties:
+    def test_compare_properties_returns_missing_fields_subfields_and_object_properties(self):
+        expected = {
+            'name': {'type': 'text', 'fields': {'keyword': {'type': 'keyword'}, 'ngram': {'type': 'text'}}},
+            'changes': {'properties': {'old_value': {'type': 'keyword'}, 'new_value': {'type': 'keyword'}}},
+            'size': {'type': 'long'},
+        }
+        actual = {
+            'name': {'type': 'text', 'fields': {'keyword': {'type': 'keyword'}}},
+            'changes': {'properties': {'old_value': {'type': 'keyword'}}},
+            'dynamic': {'type': 'keyword'},
+        }
+
+        missing, conflicts = compare_properties(expected, actual)
+
+        assert missing == {
+            'name': {'type': 'text', 'fields': {'ngram': {'type': 'text'}}},
+            'changes': {'properties': {'new_value': {'type': 'keyword'}}},
+            'size': {'type': 'long'},
+        }
+        assert conflicts == []
+        assert get_field_names(missing) == ['name', 'name.ngram', 'changes.new_value', 'size']
+
+    def test_compare_properties_returns_fields_with_different_type_or_parameters_as_conflicts(self):
+        expected = {
+            'zone': {'type': 'byte'},
+            'parent_path': {'type': 'text', 'analyzer': 'path_analyzer'},
+            'changes': {'type': 'object', 'properties': {'old_value': {'type': 'keyword'}}},
+            'item': {'properties': {'name': {'type': 'keyword'}}},
+        }
+        actual = {
+            'zone': {'type': 'long'},
+            'parent_path': {'type': 'text'},
+            'changes': {'type': 'nested', 'properties': {'old_value': {'type': 'keyword'}}},
+            'item': {'properties': {'name': {'type': 'text'}}},
+        }
+
+        missing, conflicts = compare_properties(expected, actual)
+
+        assert missing == {}
+        assert conflicts == ['zone', 'parent_path', 'changes', 'item.name']
+
+    async def test_get_mappings_drift_compares_each_partition_separately(self, mocker):
+        client = mocker.AsyncMock()
+        properties = ItemActivityCRUD.index_mappings['properties']
+        outdated = {name: field for name, field in properties.items() if name != 'user'}
+        client.indices.get_mapping.return_value = {
+            'items-activity-logs-2023.02': {'mappings': {'properties': properties}},
+            'items-activity-logs-2023.01': {'mappings': {'properties': {**outdated, 'zone': {'type': 'long'}}}},
+        }
+        crud = ItemActivityCRUD(client)
+
+        missing, conflicts = await crud.get_mappings_drift()
+
+        assert missing == {'items-activity-logs-2023.01': {'user': properties['user']}}
+        assert conflicts == {'items-activity-logs-2023.01': ['zone']}
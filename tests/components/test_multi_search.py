@@ -0,0 +1,108 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+
+import pytest
+from elasticsearch import TransportError
+
+from search.components.multi_search import MultiSearch
+
+
+class TestMultiSearch:
+    async def test_search_sends_concurrent_searches_as_one_msearch_request(self, mocker, fake):
+        client = mocker.AsyncMock()
+        responses = [{'hits': {'total': {'value': fake.pyint()}}} for _ in range(2)]
+        client.msearch.return_value = {'responses': responses}
+        multi_search = MultiSearch(client)
+
+        received = await asyncio.gather(
+            multi_search.search(index='first', size=0, from_=10),
+            multi_search.search(index=['second', 'third'], size=0),
+        )
+
+        assert received == responses
+        client.msearch.assert_awaited_once_with(
+            body=[
+                {'index': 'first'},
+                {'size': 0, 'from': 10},
+                {'index': ['second', 'third']},
+                {'size': 0},
+            ]
+        )
+
+    async def test_search_raises_transport_error_for_failed_search_in_batch(self, mocker):
+        client = mocker.AsyncMock()
+        error = {'type': 'index_not_found_exception', 'reason': 'no such index'}
+        client.msearch.return_value = {'responses': [{'hits': {}}, {'error': error, 'status': 404}]}
+        multi_search = MultiSearch(client)
+
+        received = await asyncio.gather(
+            multi_search.search(index='first'), multi_search.search(index='second'), return_exceptions=True
+        )
+
+        assert received[0] == {'hits': {}}
+        assert isinstance(received[1], TransportError)
+        assert received[1].status_code == 404
+
+    async def test_search_executes_searches_added_later_in_separate_requests(self, mocker):
+        client = mocker.AsyncMock()
+        client.msearch.return_value = {'responses': [{'hits': {}}]}
+        multi_search = MultiSearch(client)
+
+        await multi_search.search(index='first')
+        await multi_search.search(index='second')
+
+        assert client.msearch.await_count == 2
+
+    async def test_search_propagates_msearch_request_exception_to_all_searches(self, mocker):
+        client = mocker.AsyncMock()
+        client.msearch.side_effect = ConnectionError()
+        multi_search = MultiSearch(client)
+
+        with pytest.raises(ConnectionError):
+            await asyncio.gather(multi_search.search(index='first'), multi_search.search(index='second'))
+
+    async def test_search_sends_index_options_in_search_header(self, mocker):
+        client = mocker.AsyncMock()
+        client.msearch.return_value = {'responses': [{'hits': {}}]}
+        multi_search = MultiSearch(client)
+
+        await multi_search.search(index=['first', 'second'], ignore_unavailable=True, size=0)
+
+        client.msearch.assert_awaited_once_with(
+            body=[{'index': ['first', 'second'], 'ignore_unavailable': True}, {'size': 0}]
+        )
+
+    async def test_gather_sends_searches_registered_after_other_requests_in_one_msearch_request(self, mocker):
+        client = mocker.AsyncMock()
+        client.msearch.return_value = {'responses': [{'hits': {}}, {'hits': {}}]}
+        multi_search = MultiSearch(client)
+
+        async def search_later():
+            await asyncio.sleep(0.001)
+            return await multi_search.search(index='second')
+
+        received = await multi_search.gather(multi_search.search(index='first'), search_later())
+
+        assert received == [{'hits': {}}, {'hits': {}}]
+        client.msearch.assert_awaited_once_with(body=[{'index': 'first'}, {}, {'index': 'second'}, {}])
+
+    async def test_gather_sends_searches_after_max_wait_when_other_participants_do_not_search(self, mocker):
+        client = mocker.AsyncMock()
+        client.msearch.return_value = {'responses': [{'hits': {}}]}
+        multi_search = MultiSearch(client, max_wait=0.001)
+        searched = asyncio.Event()
+
+        async def search():
+            result = await multi_search.search(index='first')
+            searched.set()
+            return result
+
+        received = await asyncio.wait_for(multi_search.gather(search(), searched.wait()), timeout=1)
+
+        assert received == [{'hits': {}}, True]
+        client.msearch.assert_awaited_once()
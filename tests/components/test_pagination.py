@@ -0,0 +1,86 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import base64
+import json
+
+import pytest
+
+from search.components.exceptions import InvalidCursor
+from search.components.pagination import APPROXIMATE_COUNT_LIMIT
+from search.components.pagination import CountMode
+from search.components.pagination import Cursor
+from search.components.pagination import Page
+from search.components.pagination import Pagination
+from search.components.pagination import get_cursor_digest
+
+
+class TestPagination:
+    @pytest.mark.parametrize(
+        'count,expected_track_total_hits',
+        [
+            (CountMode.EXACT, True),
+            (CountMode.APPROXIMATE, APPROXIMATE_COUNT_LIMIT),
+            (CountMode.NONE, False),
+        ],
+    )
+    def test_track_total_hits_returns_search_parameter_for_count_mode(self, count, expected_track_total_hits):
+        pagination = Pagination(count=count)
+
+        assert pagination.track_total_hits == expected_track_total_hits
+
+
+class TestPage:
+    def test_total_pages_returns_number_of_pages_for_counted_entries(self):
+        page = Page(pagination=Pagination(page_size=20), count=41, count_relation='eq', entries=[])
+
+        assert page.total_pages == 3
+
+    def test_total_pages_returns_none_when_entries_are_not_counted(self):
+        page = Page(pagination=Pagination(count=CountMode.NONE), count=None, count_relation=None, entries=[])
+
+        assert page.total_pages is None
+
+
+class TestCursor:
+    @pytest.mark.parametrize(
+        'index,query,sort',
+        [
+            ('items-activity-logs', {'match_all': {}}, [{'_shard_doc': 'asc'}]),
+            ('metadata-items', {'term': {'zone': 1}}, [{'_shard_doc': 'asc'}]),
+            ('metadata-items', {'match_all': {}}, [{'size': 'desc'}, {'_shard_doc': 'asc'}]),
+        ],
+    )
+    def test_get_cursor_digest_returns_different_digests_for_different_index_query_or_sort(self, index, query, sort):
+        digest = get_cursor_digest('metadata-items', {'match_all': {}}, [{'_shard_doc': 'asc'}])
+
+        assert get_cursor_digest(index, query, sort) != digest
+        assert get_cursor_digest(index, query, sort) == get_cursor_digest(index, query, sort)
+
+    def test_matches_returns_true_for_the_same_digest_and_full_position(self, fake):
+        sort = [{'size': 'desc'}, {'_shard_doc': 'asc'}]
+        cursor = Cursor(point_in_time_id=fake.pystr(), digest='digest', search_after=[1, 2], page=1)
+
+        assert cursor.matches('digest', sort) is True
+
+    @pytest.mark.parametrize('digest,search_after', [('other', [1, 2]), ('digest', [1])])
+    def test_matches_returns_false_for_different_digest_or_partial_position(self, digest, search_after, fake):
+        sort = [{'size': 'desc'}, {'_shard_doc': 'asc'}]
+        cursor = Cursor(point_in_time_id=fake.pystr(), digest='digest', search_after=search_after, page=1)
+
+        assert cursor.matches(digest, sort) is False
+
+    def test_decode_raises_invalid_cursor_exception_for_non_scalar_search_after_values(self, fake):
+        value = {
+            'point_in_time_id': fake.pystr(),
+            'digest': fake.pystr(),
+            'search_after': [{'_script': {'script': 'doc.size.value'}}],
+            'page': 1,
+        }
+        encoded = base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+        with pytest.raises(InvalidCursor):
+            Cursor.decode(encoded)
@@ -6,10 +6,19 @@
 
 import inspect
 
+import pytest
+from pydantic import ValidationError
+
+from search.components.exceptions import InvalidCursor
+from search.components.pagination import CountMode
+from search.components.pagination import Cursor
+from search.components.pagination import CursorPagination
 from search.components.pagination import Pagination
 from search.components.parameters import PageParameters
+from search.components.parameters import ProjectionParameters
 from search.components.parameters import SortByFields
 from search.components.parameters import SortParameters
+from search.components.projection import Projection
 
 
 class TestPageParameters:
@@ -24,6 +33,45 @@ class TestPageParameters:
         assert pagination.page == page
         assert pagination.page_size == page_size
 
+    @pytest.mark.parametrize('count', CountMode)
+    def test_to_pagination_returns_pagination_with_the_same_count_mode(self, count):
+        page_parameters = PageParameters(count=count)
+
+        pagination = page_parameters.to_pagination()
+
+        assert pagination.count == count
+
+    def test_to_pagination_returns_instance_of_cursor_pagination_without_cursor_for_cursor_start(self, fake):
+        page_size = fake.pyint(1)
+        page_parameters = PageParameters(page=fake.pyint(2), page_size=page_size, cursor='*')
+
+        pagination = page_parameters.to_pagination()
+
+        assert isinstance(pagination, CursorPagination)
+        assert pagination.page == 1
+        assert pagination.page_size == page_size
+        assert pagination.cursor is None
+
+    def test_to_pagination_returns_instance_of_cursor_pagination_with_next_page_for_encoded_cursor(self, fake):
+        cursor = Cursor(
+            point_in_time_id=fake.pystr(),
+            digest=fake.pystr(),
+            search_after=[fake.pyint()],
+            page=fake.pyint(1, 9),
+        )
+        page_parameters = PageParameters(page_size=fake.pyint(1), cursor=cursor.encode())
+
+        pagination = page_parameters.to_pagination()
+
+        assert pagination.cursor == cursor
+        assert pagination.page == cursor.page + 1
+
+    def test_to_pagination_raises_invalid_cursor_exception_for_malformed_cursor(self, fake):
+        page_parameters = PageParameters(cursor=fake.pystr())
+
+        with pytest.raises(InvalidCursor):
+            page_parameters.to_pagination()
+
 
 class TestSortParameters:
     def test_with_sort_by_fields_returns_a_class_with_overridden_type_annotation_for_sort_by_field(self):
@@ -45,3 +93,29 @@ class TestSortParameters:
         annotations = inspect.get_annotations(SortParameters)
 
         assert annotations['sort_by'] == str | None
+
+
+class TestProjectionParameters:
+    def test_to_projection_returns_projection_with_included_and_excluded_fields(self):
+        projection_parameters_class = ProjectionParameters.with_fields(['name', 'size', 'attributes'])
+        projection_parameters = projection_parameters_class(fields='name, size,-attributes')
+
+        projection = projection_parameters.to_projection()
+
+        assert projection == Projection(includes=['name', 'size'], excludes=['attributes'])
+
+    def test_to_projection_returns_empty_projection_when_fields_are_not_set(self):
+        projection_parameters = ProjectionParameters.with_fields(['name'])()
+
+        assert bool(projection_parameters.to_projection()) is False
+
+    def test_with_fields_limits_fields_argument_with_allowed_fields(self):
+        projection_parameters_class = ProjectionParameters.with_fields(['name'])
+
+        with pytest.raises(ValidationError):
+            projection_parameters_class(fields='name,-unknown')
+
+    def test_with_fields_does_not_override_original_class_allowed_fields(self):
+        ProjectionParameters.with_fields(['name'])
+
+        assert ProjectionParameters.allowed_fields == frozenset()
@@ -0,0 +1,242 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import pytest
+
+from search.components.dataset_activity.crud import DatasetAndItemActivityCRUD
+from search.components.dataset_activity.models import DatasetAndItemActivityIndex
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.item_activity.filtering import ItemActivityProjectFileActivityFiltering
+from search.components.item_activity.models import ActivityGroupBy
+from search.components.item_activity.models import ItemActivityType
+from search.components.partitioning import TimePartitioning
+from tests.fixtures.components.item_activity import ItemActivityFactory
+
+
+class TestTimePartitioning:
+    def test_get_partition_returns_partition_of_utc_month(self):
+        partitioning = TimePartitioning(alias='logs', field='activity_time')
+        value = datetime(2023, 1, 1, 1, 0, tzinfo=timezone(timedelta(hours=3)))
+
+        assert partitioning.get_partition(value) == 'logs-2022.12'
+
+    @pytest.mark.parametrize(
+        'start,end,expected_partitions',
+        [
+            (
+                datetime(2022, 11, 15),
+                datetime(2023, 2, 1),
+                ['logs-2022.11', 'logs-2022.12', 'logs-2023.01', 'logs-2023.02'],
+            ),
+            (datetime(2023, 5, 1), datetime(2023, 5, 31), ['logs-2023.05']),
+            (datetime(2023, 5, 1), datetime(2023, 4, 1), []),
+            (datetime(2020, 1, 1), datetime(2023, 1, 1), ['logs']),
+        ],
+    )
+    def test_get_partitions_returns_partitions_overlapping_range(self, start, end, expected_partitions):
+        partitioning = TimePartitioning(alias='logs', field='activity_time', max_targeted_partitions=12)
+
+        assert partitioning.get_partitions(start, end) == expected_partitions
+
+
+class TestPartitionedCRUD:
+    async def test_create_writes_document_into_partition_of_activity_time(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.create.side_effect = lambda index, id, document: {'_index': index, '_id': id}
+        client.get.side_effect = lambda index, id: {'_index': index, '_id': id, '_source': model.dict()}
+        model = ItemActivityFactory(None, fake).generate(activity_time=datetime(2023, 3, 10, tzinfo=timezone.utc))
+        crud = ItemActivityCRUD(client)
+
+        await crud.create(model)
+
+        assert client.create.await_args.kwargs['index'] == 'items-activity-logs-2023.03'
+        assert client.get.await_args.kwargs['index'] == 'items-activity-logs-2023.03'
+
+    async def test_create_and_bulk_create_write_documents_into_legacy_index_without_write_alias(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.indices.exists_alias.return_value = False
+        client.create.side_effect = lambda index, id, document: {'_index': index, '_id': id}
+        client.get.side_effect = lambda index, id: {'_index': index, '_id': id, '_source': model.dict()}
+        client.bulk.return_value = {'errors': False, 'items': []}
+        model = ItemActivityFactory(None, fake).generate(activity_time=datetime(2023, 3, 10, tzinfo=timezone.utc))
+        crud = ItemActivityCRUD(client)
+
+        await crud.create(model)
+        await crud.bulk_create([model, model])
+
+        assert client.create.await_args.kwargs['index'] == 'items-activity-logs'
+        operations = client.bulk.await_args.kwargs['body'][::2]
+        assert [operation['create']['_index'] for operation in operations] == ['items-activity-logs'] * 2
+        client.indices.exists_alias.assert_awaited_once_with(name='items-activity-logs-write')
+
+    async def test_is_partitioned_checks_write_alias_again_after_check_ttl(self, mocker):
+        client = mocker.AsyncMock()
+        client.indices.exists_alias.side_effect = [False, True]
+        crud = ItemActivityCRUD(client)
+        clock = mocker.patch('search.components.partitioning.time.monotonic', return_value=100)
+
+        assert await crud.is_partitioned() is False
+        assert await ItemActivityCRUD(client).is_partitioned() is False
+
+        clock.return_value = 100 + crud.partitioned_check_ttl
+
+        assert await crud.is_partitioned() is True
+        assert client.indices.exists_alias.await_count == 2
+
+    async def test_bulk_create_writes_documents_into_partitions_of_activity_time(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.return_value = {'errors': False, 'items': []}
+        factory = ItemActivityFactory(None, fake)
+        models = [
+            factory.generate(activity_time=datetime(2023, 3, 10, tzinfo=timezone.utc)),
+            factory.generate(activity_time=datetime(2023, 4, 10, tzinfo=timezone.utc)),
+        ]
+        crud = ItemActivityCRUD(client)
+
+        await crud.bulk_create(models)
+
+        operations = client.bulk.await_args.kwargs['body'][::2]
+        assert [operation['create']['_index'] for operation in operations] == [
+            'items-activity-logs-2023.03',
+            'items-activity-logs-2023.04',
+        ]
+
+    async def test_bulk_create_reads_back_documents_from_their_partitions_with_mget(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.return_value = {'errors': False, 'items': []}
+        model = ItemActivityFactory(None, fake).generate(activity_time=datetime(2023, 3, 10, tzinfo=timezone.utc))
+        client.mget.side_effect = lambda body: {
+            'docs': [{**document, 'found': True, '_source': model.dict()} for document in body['docs']]
+        }
+        crud = ItemActivityCRUD(client)
+
+        result = await crud.bulk_create([model], read_back=True)
+
+        client.mget.assert_awaited_once_with(
+            body={'docs': [{'_index': 'items-activity-logs-2023.03', '_id': result.pks[0]}]}
+        )
+        client.search.assert_not_awaited()
+        assert result.entries[0].pk == result.pks[0]
+
+    async def test_get_project_file_activity_searches_only_partitions_overlapping_requested_range(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = {'aggregations': {'group_by_activity_time': {'buckets': {}}}}
+        crud = ItemActivityCRUD(client)
+        filtering = ItemActivityProjectFileActivityFiltering(
+            project_code='project',
+            activity_type=ItemActivityType.UPLOAD,
+            from_date=datetime(2023, 1, 20, tzinfo=timezone.utc),
+            to_date=datetime(2023, 2, 10, tzinfo=timezone.utc),
+        )
+
+        await crud.get_project_file_activity(filtering, '+00:00', ActivityGroupBy.DAY)
+
+        assert client.search.await_args.kwargs['index'] == [
+            'items-activity-logs-2023.01',
+            'items-activity-logs-2023.02',
+            'items-activity-logs-write',
+        ]
+        assert client.search.await_args.kwargs['ignore_unavailable'] is True
+
+    async def test_get_project_transfer_statistics_searches_only_partition_of_requested_day(self, mocker):
+        client = mocker.AsyncMock()
+        client.search.return_value = {'aggregations': {'activity_types': {'buckets': []}}}
+        crud = ItemActivityCRUD(client)
+
+        await crud.get_project_transfer_statistics('project', datetime(2023, 6, 15, tzinfo=timezone.utc), '+0000')
+
+        assert client.search.await_args.kwargs['index'] == ['items-activity-logs-2023.06', 'items-activity-logs-write']
+
+    async def test_get_project_transfer_statistics_searches_legacy_index_without_write_alias(self, mocker):
+        client = mocker.AsyncMock()
+        client.indices.exists_alias.return_value = False
+        client.search.return_value = {'aggregations': {'activity_types': {'buckets': []}}}
+        crud = ItemActivityCRUD(client)
+
+        await crud.get_project_transfer_statistics('project', datetime(2023, 6, 15, tzinfo=timezone.utc), '+0000')
+
+        client.indices.exists_alias.assert_awaited_once_with(name='items-activity-logs-write')
+        assert client.search.await_args.kwargs['index'] == ['items-activity-logs']
+
+    async def test_rollover_creates_current_partition_and_moves_write_alias_to_it(self, mocker):
+        client = mocker.AsyncMock()
+        client.indices.get_alias.side_effect = lambda index=None, name=None, ignore=None: {
+            index or 'items-activity-logs-2023.05': {'aliases': {}}
+        }
+        crud = ItemActivityCRUD(client)
+
+        partition = await crud.rollover(datetime(2023, 6, 1, tzinfo=timezone.utc))
+
+        assert partition == 'items-activity-logs-2023.06'
+        client.indices.create.assert_awaited_once_with(index=partition, ignore=400)
+        client.indices.update_aliases.assert_awaited_once_with(
+            body={
+                'actions': [
+                    {'add': {'index': partition, 'alias': 'items-activity-logs-write', 'is_write_index': True}},
+                    {'remove': {'index': 'items-activity-logs-2023.05', 'alias': 'items-activity-logs-write'}},
+                ]
+            }
+        )
+
+    async def test_rollover_moves_write_alias_to_backing_index_of_reindexed_partition(self, mocker):
+        client = mocker.AsyncMock()
+        client.indices.get_alias.side_effect = lambda index=None, name=None, ignore=None: {
+            'items-activity-logs-2023.06-v2': {'aliases': {}}
+        }
+        crud = ItemActivityCRUD(client)
+
+        await crud.rollover(datetime(2023, 6, 1, tzinfo=timezone.utc))
+
+        client.indices.update_aliases.assert_awaited_once_with(
+            body={
+                'actions': [
+                    {
+                        'add': {
+                            'index': 'items-activity-logs-2023.06-v2',
+                            'alias': 'items-activity-logs-write',
+                            'is_write_index': True,
+                        }
+                    }
+                ]
+            }
+        )
+
+    async def test_retrieve_by_pk_searches_document_across_all_partitions(self, mocker, fake):
+        client = mocker.AsyncMock()
+        model = ItemActivityFactory(None, fake).generate()
+        client.search.return_value = {
+            'hits': {'hits': [{'_index': 'items-activity-logs-2023.01', '_id': 'pk', '_source': model.dict()}]}
+        }
+        crud = ItemActivityCRUD(client)
+
+        entry = await crud.retrieve_by_pk('pk')
+
+        assert entry.pk == 'pk'
+        client.search.assert_awaited_once_with(index='items-activity-logs', query={'ids': {'values': ['pk']}}, size=1)
+        client.get.assert_not_awaited()
+
+
+class TestDatasetAndItemActivityCRUD:
+    @pytest.mark.parametrize(
+        'index,expected_index',
+        [
+            ('items-activity-logs-2023.01', DatasetAndItemActivityIndex.ITEM),
+            ('datasets-activity-logs-2023.01', DatasetAndItemActivityIndex.DATASET),
+            ('items-activity-logs', DatasetAndItemActivityIndex.ITEM),
+            ('items-activity-logs-2023.01-v1', DatasetAndItemActivityIndex.ITEM),
+            ('datasets-activity-logs-2023.01-v12', DatasetAndItemActivityIndex.DATASET),
+        ],
+    )
+    def test_get_document_source_resolves_index_from_partition_name(self, index, expected_index):
+        crud = DatasetAndItemActivityCRUD(None)
+
+        source = crud._get_document_source({'_index': index, '_id': 'pk', '_source': {}})
+
+        assert source['index'] == expected_index
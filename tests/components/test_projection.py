@@ -0,0 +1,28 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from search.components.projection import Projection
+
+
+class TestProjection:
+    def test__bool__returns_true_when_fields_are_included_or_excluded(self):
+        assert bool(Projection(includes=['name'])) is True
+        assert bool(Projection(excludes=['name'])) is True
+
+    def test__bool__returns_false_when_fields_are_not_set(self):
+        assert bool(Projection()) is False
+
+    def test_selects_returns_true_only_for_included_and_not_excluded_fields(self):
+        projection = Projection(includes=['name', 'size'], excludes=['size'])
+
+        assert projection.selects('name') is True
+        assert projection.selects('size') is False
+        assert projection.selects('owner') is False
+
+    def test_apply_returns_source_parameter_with_included_and_excluded_fields(self):
+        projection = Projection(includes=['name'], excludes=['attributes'])
+
+        assert projection.apply() == {'includes': ['name'], 'excludes': ['attributes']}
@@ -0,0 +1,176 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import copy
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from search.components.dataset_activity.crud import DatasetAndItemActivityCRUD
+from search.components.dataset_activity.schemas import DatasetAndItemActivityListResponseSchema
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.item_activity.schemas import ItemActivityCreateSchema
+from search.components.item_activity.schemas import ItemActivityListResponseSchema
+from search.components.metadata_item.crud import MetadataItemCRUD
+from search.components.metadata_item.schemas import MetadataItemListResponseSchema
+from search.components.pagination import Pagination
+from search.components.projection import Projection
+from tests.fixtures.components.dataset_activity import DatasetActivityFactory
+from tests.fixtures.components.item_activity import ItemActivityFactory
+from tests.fixtures.components.metadata_item import MetadataItemFactory
+
+
+def create_search_result(
+    documents: list[tuple[str, dict]], projection: Projection | None = None, total: dict | None = ...
+) -> dict:
+    hits = []
+    for number, (index, document) in enumerate(documents):
+        source = json.loads(document.json())
+        if projection:
+            source = {key: value for key, value in source.items() if projection.selects(key)}
+        hits.append({'_index': index, '_id': str(number), '_source': source})
+
+    if total is ...:
+        total = {'value': len(hits), 'relation': 'eq'}
+
+    if total is None:
+        return {'hits': {'hits': hits}}
+
+    return {'hits': {'total': total, 'hits': hits}}
+
+
+async def render_validated_and_raw(crud, schema, documents, projection=None, total=...) -> tuple[dict, dict]:
+    pagination = Pagination(page=1, page_size=len(documents))
+
+    page = await crud._paginate_list_result(
+        create_search_result(documents, projection, total), pagination, projection=projection
+    )
+    validated = jsonable_encoder(schema.from_page(page, projection))
+
+    raw_page = await crud._paginate_list_result(
+        create_search_result(documents, projection, total), pagination, raw=True, projection=projection
+    )
+    raw = json.loads(schema.render_page(raw_page, projection).body)
+
+    return validated, raw
+
+
+class TestListResponseSchema:
+    async def test_render_page_returns_the_same_content_as_validated_page_for_metadata_items(self, fake):
+        factory = MetadataItemFactory(None, fake)
+        documents = [('metadata-items', factory.generate()) for _ in range(5)]
+
+        validated, raw = await render_validated_and_raw(
+            MetadataItemCRUD(None), MetadataItemListResponseSchema, documents
+        )
+
+        assert raw == validated
+
+    async def test_render_page_returns_the_same_content_as_validated_page_for_item_activities(self, fake):
+        factory = ItemActivityFactory(None, fake)
+        documents = [('items-activity-logs', factory.generate()) for _ in range(5)]
+
+        validated, raw = await render_validated_and_raw(
+            ItemActivityCRUD(None), ItemActivityListResponseSchema, documents
+        )
+
+        assert raw == validated
+
+    async def test_render_page_returns_the_same_content_as_validated_page_for_dataset_and_item_activities(self, fake):
+        item_activity_factory = ItemActivityFactory(None, fake)
+        dataset_activity_factory = DatasetActivityFactory(None, fake)
+        documents = [('items-activity-logs', item_activity_factory.generate()) for _ in range(3)]
+        documents += [('datasets-activity-logs', dataset_activity_factory.generate()) for _ in range(3)]
+
+        validated, raw = await render_validated_and_raw(
+            DatasetAndItemActivityCRUD(None), DatasetAndItemActivityListResponseSchema, documents
+        )
+
+        assert raw == validated
+
+    async def test_render_page_returns_the_same_content_as_validated_page_for_projected_metadata_items(self, fake):
+        factory = MetadataItemFactory(None, fake)
+        documents = [('metadata-items', factory.generate()) for _ in range(5)]
+        projection = Projection(excludes=['attributes', 'tags'])
+
+        validated, raw = await render_validated_and_raw(
+            MetadataItemCRUD(None), MetadataItemListResponseSchema, documents, projection
+        )
+
+        assert raw == validated
+
+    async def test_render_page_returns_the_same_content_as_validated_page_for_projected_activities(self, fake):
+        item_activity_factory = ItemActivityFactory(None, fake)
+        dataset_activity_factory = DatasetActivityFactory(None, fake)
+        documents = [('items-activity-logs', item_activity_factory.generate()) for _ in range(3)]
+        documents += [('datasets-activity-logs', dataset_activity_factory.generate()) for _ in range(3)]
+        projection = Projection(includes=['activity_type', 'activity_time', 'network_origin'])
+
+        validated, raw = await render_validated_and_raw(
+            DatasetAndItemActivityCRUD(None), DatasetAndItemActivityListResponseSchema, documents, projection
+        )
+
+        assert raw == validated
+        assert set(validated['result'][0]) == {'activity_type', 'activity_time', 'network_origin', 'index'}
+
+    @pytest.mark.parametrize(
+        'total,expected_total,expected_num_of_pages,expected_total_relation',
+        [
+            ({'value': 10000, 'relation': 'gte'}, 10000, 2000, 'gte'),
+            (None, None, None, None),
+        ],
+    )
+    async def test_render_page_returns_the_same_content_as_validated_page_for_capped_and_skipped_total(
+        self, total, expected_total, expected_num_of_pages, expected_total_relation, fake
+    ):
+        factory = MetadataItemFactory(None, fake)
+        documents = [('metadata-items', factory.generate()) for _ in range(5)]
+
+        validated, raw = await render_validated_and_raw(
+            MetadataItemCRUD(None), MetadataItemListResponseSchema, documents, total=total
+        )
+
+        assert raw == validated
+        assert validated['total'] == expected_total
+        assert validated['num_of_pages'] == expected_num_of_pages
+        assert validated['total_relation'] == expected_total_relation
+
+    def test_from_source_keeps_only_schema_fields_and_sets_defaults_for_missing_fields(self, fake):
+        source = json.loads(ItemActivityFactory(None, fake).generate().json())
+        source.pop('imported_from')
+        source['unknown_field'] = fake.word()
+
+        result = ItemActivityListResponseSchema.get_result_schema(source).from_source(source)
+
+        assert 'unknown_field' not in result
+        assert result['imported_from'] is None
+
+    @pytest.mark.parametrize('projection', [None, Projection(includes=['network_origin', 'activity_type'])])
+    async def test_render_page_fills_model_defaults_for_fields_missing_in_stored_documents(self, projection, fake):
+        factory = ItemActivityFactory(None, fake)
+        documents = [('items-activity-logs', factory.generate()) for _ in range(3)]
+        result = create_search_result(documents, projection)
+        for hit in result['hits']['hits']:
+            hit['_source'].pop('network_origin')
+        crud = ItemActivityCRUD(None)
+        pagination = Pagination(page=1, page_size=3)
+
+        validated_page = await crud._paginate_list_result(copy.deepcopy(result), pagination, projection=projection)
+        raw_page = await crud._paginate_list_result(result, pagination, raw=True, projection=projection)
+        validated = jsonable_encoder(ItemActivityListResponseSchema.from_page(validated_page, projection))
+        raw = json.loads(ItemActivityListResponseSchema.render_page(raw_page, projection).body)
+
+        assert raw == validated
+        assert {entry['network_origin'] for entry in raw['result']} == {'unknown'}
+
+    def test_create_schema_requires_network_origin(self, fake):
+        document = json.loads(ItemActivityFactory(None, fake).generate().json())
+        document.pop('network_origin')
+
+        with pytest.raises(ValidationError):
+            ItemActivityCreateSchema.parse_obj(document)
@@ -0,0 +1,121 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from typing import Any
+
+import pytest
+
+from search.components.metadata_item.filtering import MetadataItemFiltering
+from search.components.metadata_item.models import MetadataItemType
+from search.components.search_query import SearchQuery
+
+
+def as_scoring_query(query: dict[str, Any]) -> dict[str, Any]:
+    """Return the query with filter clauses moved into the must context, as it was built before."""
+
+    if 'bool' not in query:
+        return query
+
+    return {'bool': {'must': [*query['bool'].get('must', []), *query['bool'].get('filter', [])]}}
+
+
+class TestSearchQuery:
+    def test_build_puts_exact_and_range_matches_into_filter_context(self):
+        search_query = SearchQuery()
+        search_query.match_term('container_code', 'project')
+        search_query.match_multiple_terms('type', ['file', 'folder'])
+        search_query.match_range('size', gte=10)
+        search_query.match_any_range('created_time', [{'lt': 10}])
+
+        query = search_query.build()
+
+        assert query == {
+            'bool': {
+                'filter': [
+                    {'term': {'container_code': 'project'}},
+                    {'terms': {'type': ['file', 'folder']}},
+                    {'range': {'size': {'gte': 10}}},
+                    {'bool': {'should': [{'range': {'created_time': {'lt': 10}}}], 'minimum_should_match': 1}},
+                ]
+            }
+        }
+
+    def test_build_keeps_text_and_nested_matches_in_must_context(self):
+        search_query = SearchQuery()
+        search_query.match_text('name.keyword', 'file%')
+        search_query.match_term('zone', 0)
+        search_query.init_nested('attributes')
+        search_query.match_nested_contains('attributes', 'key', 'value')
+
+        query = search_query.build()
+
+        assert query['bool']['filter'] == [{'term': {'zone': 0}}]
+        assert query['bool']['must'] == [
+            {'wildcard': {'name.keyword': {'value': 'file*', 'case_insensitive': True}}},
+            search_query.nested,
+        ]
+        assert search_query.build() == query
+
+    @pytest.mark.parametrize(
+        'value,expected_query',
+        [
+            ('Name.txt', {'match': {'name.keyword': 'Name.txt'}}),
+            ('Nam%', {'prefix': {'name.normalized': {'value': 'Nam'}}}),
+            ('%Name%', {'match_phrase': {'name.ngram': 'Name'}}),
+            ('%Na%', {'wildcard': {'name.normalized': {'value': '*Na*'}}}),
+            ('%.txt', {'wildcard': {'name.normalized': {'value': '*.txt'}}}),
+            ('N%.txt%', {'wildcard': {'name.normalized': {'value': 'N*.txt*'}}}),
+        ],
+    )
+    def test_match_normalized_text_routes_patterns_to_normalized_subfields(self, value, expected_query):
+        search_query = SearchQuery()
+
+        search_query.match_normalized_text('name', value)
+
+        assert search_query.build() == {'bool': {'must': [expected_query]}}
+
+    def test_build_returns_match_all_query_without_clauses(self):
+        assert SearchQuery().build() == {'match_all': {}}
+
+
+class TestSearchQueryHitSet:
+    @pytest.mark.parametrize(
+        'parameters',
+        [
+            {'container_code': 'first'},
+            {'container_code': 'first', 'zone': 1, 'type': 'file'},
+            {'container_code': 'second', 'size_gte': 100, 'size_lte': 1000},
+            {'name': 'report%', 'zone': 0},
+            {'owner': 'owner', 'is_archived': False},
+            {'parent_path': 'folder%', 'type': 'file,folder'},
+        ],
+    )
+    async def test_filter_context_query_matches_the_same_documents_as_scoring_query(
+        self, parameters, metadata_item_factory, metadata_item_crud
+    ):
+        for index in range(24):
+            await metadata_item_factory.create(
+                name=f'report-{index}.txt' if index % 3 else f'data-{index}.csv',
+                owner='owner' if index % 2 else 'someone',
+                parent_path='folder.sub' if index % 4 else 'other',
+                type_=MetadataItemType.FILE if index % 5 else MetadataItemType.FOLDER,
+                zone=index % 2,
+                size=index * 50,
+                container_code='first' if index % 3 else 'second',
+                archived=index % 7 == 0,
+            )
+        search_query = SearchQuery()
+        MetadataItemFiltering(**parameters).apply(search_query)
+        query = search_query.build()
+
+        hits = await metadata_item_crud.client.search(index=metadata_item_crud.index, query=query, size=100)
+        expected_hits = await metadata_item_crud.client.search(
+            index=metadata_item_crud.index, query=as_scoring_query(query), size=100
+        )
+
+        assert 'filter' in query['bool']
+        assert {hit['_id'] for hit in hits['hits']['hits']} == {hit['_id'] for hit in expected_hits['hits']['hits']}
+        assert hits['hits']['total'] == expected_hits['hits']['total']
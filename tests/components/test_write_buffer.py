@@ -0,0 +1,198 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+
+import pytest
+from elasticsearch import TransportError
+
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.models import ContainerType
+from search.components.write_buffer import WriteBuffer
+from tests.fixtures.components.item_activity import ItemActivityFactory
+
+
+def create_bulk_result(body: list, failed: set[int] | None = None) -> dict:
+    failed = failed or set()
+
+    items = []
+    for position, operation in enumerate(body[::2]):
+        item = {'_id': operation['create']['_id'], 'status': 201}
+        if position in failed:
+            item = {**item, 'status': 409, 'error': {'type': 'version_conflict_engine_exception'}}
+        items.append({'create': item})
+
+    return {'errors': bool(failed), 'items': items}
+
+
+class TestWriteBuffer:
+    async def test_create_sends_documents_added_within_flush_interval_as_one_bulk_request(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body)
+        write_buffer = WriteBuffer(client, flush_interval=10, max_batch_size=100, max_pending=100)
+
+        received = await asyncio.gather(
+            write_buffer.create('first', 'pk-1', '{"a": 1}'),
+            write_buffer.create('second', 'pk-2', '{"b": 2}'),
+        )
+
+        assert received == ['pk-1', 'pk-2']
+        client.bulk.assert_awaited_once_with(
+            body=[
+                {'create': {'_index': 'first', '_id': 'pk-1'}},
+                '{"a": 1}',
+                {'create': {'_index': 'second', '_id': 'pk-2'}},
+                '{"b": 2}',
+            ]
+        )
+
+    async def test_create_flushes_documents_when_buffer_reaches_max_batch_size(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body)
+        write_buffer = WriteBuffer(client, flush_interval=60000, max_batch_size=2, max_pending=100)
+
+        received = await asyncio.wait_for(
+            asyncio.gather(*[write_buffer.create('index', f'pk-{number}', '{}') for number in range(4)]), timeout=1
+        )
+
+        assert received == ['pk-0', 'pk-1', 'pk-2', 'pk-3']
+        assert client.bulk.await_count == 2
+
+    async def test_create_raises_transport_error_for_document_that_was_not_created(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body, failed={1})
+        write_buffer = WriteBuffer(client, flush_interval=1, max_batch_size=100, max_pending=100)
+
+        received = await asyncio.gather(
+            write_buffer.create('index', 'pk-1', '{}'),
+            write_buffer.create('index', 'pk-2', '{}'),
+            return_exceptions=True,
+        )
+
+        assert received[0] == 'pk-1'
+        assert isinstance(received[1], TransportError)
+        assert received[1].status_code == 409
+
+    async def test_create_propagates_bulk_request_exception_to_all_documents(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = ConnectionError()
+        write_buffer = WriteBuffer(client, flush_interval=1, max_batch_size=100, max_pending=100)
+
+        with pytest.raises(ConnectionError):
+            await asyncio.gather(write_buffer.create('index', 'pk-1', '{}'), write_buffer.create('index', 'pk-2', '{}'))
+
+    async def test_add_waits_for_capacity_while_max_pending_documents_are_not_created(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body)
+        write_buffer = WriteBuffer(client, flush_interval=60000, max_batch_size=100, max_pending=2)
+        futures = [await write_buffer.add('index', f'pk-{number}', '{}') for number in range(2)]
+
+        blocked = asyncio.ensure_future(write_buffer.add('index', 'pk-2', '{}'))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        await write_buffer.flush()
+        future = await asyncio.wait_for(blocked, timeout=1)
+        await write_buffer.flush()
+
+        assert [future.result() for future in futures] == ['pk-0', 'pk-1']
+        assert future.result() == 'pk-2'
+
+    async def test_close_flushes_buffered_documents_and_rejects_new_ones(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body)
+        write_buffer = WriteBuffer(client, flush_interval=60000, max_batch_size=100, max_pending=100)
+        future = await write_buffer.add('index', 'pk-1', '{}')
+
+        await write_buffer.close()
+
+        assert future.result() == 'pk-1'
+        with pytest.raises(RuntimeError):
+            await write_buffer.add('index', 'pk-2', '{}')
+
+    async def test_close_rejects_documents_waiting_for_capacity(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body)
+        write_buffer = WriteBuffer(client, flush_interval=60000, max_batch_size=100, max_pending=1)
+        future = await write_buffer.add('index', 'pk-1', '{}')
+
+        blocked = asyncio.ensure_future(write_buffer.add('index', 'pk-2', '{}'))
+        await asyncio.sleep(0.01)
+        await write_buffer.close()
+
+        assert future.result() == 'pk-1'
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(blocked, timeout=1)
+        assert client.bulk.await_count == 1
+
+    async def test_flush_calls_hook_once_with_items_of_created_documents(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body, failed={1})
+        write_buffer = WriteBuffer(client, flush_interval=1, max_batch_size=100, max_pending=100)
+        hook = mocker.AsyncMock()
+
+        received = await asyncio.gather(
+            *[write_buffer.create('index', f'pk-{number}', '{}', hook, number) for number in range(3)],
+            write_buffer.create('index', 'pk-3', '{}'),
+            return_exceptions=True,
+        )
+
+        assert isinstance(received[1], TransportError)
+        hook.assert_awaited_once_with(client, [0, 2])
+
+    async def test_flush_keeps_documents_created_when_hook_fails(self, mocker):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body)
+        write_buffer = WriteBuffer(client, flush_interval=1, max_batch_size=100, max_pending=100)
+        hook = mocker.AsyncMock(side_effect=ConnectionError())
+
+        received = await write_buffer.create('index', 'pk-1', '{}', hook, 'item')
+        await write_buffer.close()
+
+        assert received == 'pk-1'
+        hook.assert_awaited_once()
+
+    async def test_crud_create_sends_document_through_write_buffer(self, mocker, fake):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body: create_bulk_result(body)
+        write_buffer = WriteBuffer(client, flush_interval=1, max_batch_size=100, max_pending=100)
+        crud = ItemActivityCRUD(client, write_buffer=write_buffer)
+        model = ItemActivityFactory(None, fake).generate()
+        client.get.side_effect = lambda index, id: {'_id': id, '_source': model.dict()}
+
+        entry = await crud.create(model)
+
+        client.create.assert_not_awaited()
+        client.bulk.assert_awaited_once()
+        assert entry.pk == client.bulk.await_args.kwargs['body'][0]['create']['_id']
+
+    async def test_crud_create_counts_activities_of_all_crud_instances_with_one_bulk_request_per_flush(
+        self, mocker, fake
+    ):
+        client = mocker.AsyncMock()
+        client.bulk.side_effect = lambda body, **kwds: (
+            create_bulk_result(body)
+            if 'index' not in kwds
+            else {
+                'errors': False,
+                'items': [],
+            }
+        )
+        write_buffer = WriteBuffer(client, flush_interval=1, max_batch_size=100, max_pending=100)
+        factory = ItemActivityFactory(None, fake)
+        models = [factory.generate(container_type=ContainerType.PROJECT) for _ in range(5)]
+        client.get.side_effect = lambda index, id: {'_id': id, '_source': models[0].dict()}
+
+        await asyncio.gather(
+            *[ItemActivityCRUD(client, write_buffer=write_buffer, count_activities=True).create(m) for m in models]
+        )
+        await write_buffer.close()
+
+        assert client.bulk.await_count == 2
+        creates, increments = [call.kwargs for call in client.bulk.await_args_list]
+        assert len(creates['body']) == 10
+        assert increments['index'] == 'items-activity-counters'
+        assert sum(operation['script']['params']['count'] for operation in increments['body'][1::2]) == 5
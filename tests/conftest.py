@@ -12,4 +12,5 @@ pytest_plugins = [
     'tests.fixtures.elasticsearch',
     'tests.fixtures.fake',
     'tests.fixtures.jq',
+    'tests.fixtures.redis',
 ]
@@ -0,0 +1,56 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from fastapi import FastAPI
+
+from search.components.cache import MemoryCacheBackend
+from search.components.cache import RedisCacheBackend
+from search.config import Settings
+from search.dependencies import close_application_result_cache
+from search.dependencies import create_result_cache
+from search.dependencies import get_application_result_cache
+
+
+class TestResultCacheDependencies:
+    def test_create_result_cache_configures_limits_from_settings(self):
+        settings = Settings(RESULT_CACHE_MAX_SIZE=50, RESULT_CACHE_TTL=2.5, RESULT_CACHE_INVALIDATION_DELAY=0.5)
+
+        cache = create_result_cache(settings)
+
+        assert isinstance(cache.backend, MemoryCacheBackend)
+        assert cache.backend.max_size == 50
+        assert cache.ttl == 2.5
+        assert cache.invalidation_delay == 0.5
+
+    async def test_create_result_cache_uses_redis_backend_when_it_is_configured(self):
+        settings = Settings(RESULT_CACHE_BACKEND='redis', RESULT_CACHE_KEY_PREFIX='prefix:')
+
+        cache = create_result_cache(settings)
+
+        assert isinstance(cache.backend, RedisCacheBackend)
+        assert cache.backend.prefix == 'prefix:'
+
+        await cache.close()
+
+    def test_create_result_cache_returns_none_when_time_to_live_is_not_positive(self):
+        settings = Settings(RESULT_CACHE_TTL=0)
+
+        assert create_result_cache(settings) is None
+
+    def test_get_application_result_cache_returns_the_same_cache_for_the_application(self):
+        app = FastAPI()
+        settings = Settings()
+
+        assert get_application_result_cache(app, settings) is get_application_result_cache(app, settings)
+
+    async def test_close_application_result_cache_removes_cache_from_application_state(self):
+        app = FastAPI()
+        settings = Settings()
+        cache = get_application_result_cache(app, settings)
+
+        await close_application_result_cache(app)
+
+        assert get_application_result_cache(app, settings) is not cache
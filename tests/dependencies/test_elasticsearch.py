@@ -0,0 +1,48 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from elasticsearch import AIOHttpConnection
+from fastapi import FastAPI
+
+from search.config import Settings
+from search.dependencies import close_application_elasticsearch_client
+from search.dependencies import create_elasticsearch_client
+from search.dependencies import get_application_elasticsearch_client
+
+
+class TestElasticsearchDependencies:
+    def test_create_elasticsearch_client_configures_connection_pool_from_settings(self):
+        settings = Settings(ELASTICSEARCH_MAX_CONNECTIONS=25, ELASTICSEARCH_REQUEST_TIMEOUT=5)
+
+        client = create_elasticsearch_client(settings)
+        connection = client.transport.connection_class(**client.transport.kwargs)
+
+        assert client.transport.connection_class is AIOHttpConnection
+        assert client.transport.kwargs['maxsize'] == 25
+        assert connection.timeout == 5
+
+    async def test_get_application_elasticsearch_client_returns_the_same_client_for_the_application(self):
+        app = FastAPI()
+        settings = Settings()
+
+        client_1 = get_application_elasticsearch_client(app, settings)
+        client_2 = get_application_elasticsearch_client(app, settings)
+
+        assert client_1 is client_2
+
+        await close_application_elasticsearch_client(app)
+
+    async def test_close_application_elasticsearch_client_removes_client_from_application_state(self):
+        app = FastAPI()
+        settings = Settings()
+        client = get_application_elasticsearch_client(app, settings)
+
+        await close_application_elasticsearch_client(app)
+
+        assert app.state.elasticsearch_client is None
+        assert get_application_elasticsearch_client(app, settings) is not client
+
+        await close_application_elasticsearch_client(app)
@@ -0,0 +1,46 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from fastapi import FastAPI
+
+from search.config import Settings
+from search.dependencies import close_application_write_buffer
+from search.dependencies import create_write_buffer
+from search.dependencies import get_application_write_buffer
+
+
+class TestWriteBufferDependencies:
+    def test_create_write_buffer_configures_limits_from_settings(self, mocker):
+        settings = Settings(
+            WRITE_BUFFER_ENABLED=True,
+            WRITE_BUFFER_FLUSH_INTERVAL=20,
+            WRITE_BUFFER_MAX_BATCH_SIZE=50,
+            WRITE_BUFFER_MAX_PENDING=200,
+        )
+
+        write_buffer = create_write_buffer(mocker.AsyncMock(), settings)
+
+        assert write_buffer.flush_interval == 20
+        assert write_buffer.max_batch_size == 50
+        assert write_buffer.max_pending == 200
+
+    def test_create_write_buffer_returns_none_when_buffering_is_disabled(self, mocker):
+        settings = Settings(WRITE_BUFFER_ENABLED=False)
+
+        assert create_write_buffer(mocker.AsyncMock(), settings) is None
+
+    async def test_close_application_write_buffer_flushes_buffered_documents(self, mocker):
+        app = FastAPI()
+        client = mocker.AsyncMock()
+        client.bulk.return_value = {'errors': False, 'items': [{'create': {'_id': 'pk', 'status': 201}}]}
+        settings = Settings(WRITE_BUFFER_ENABLED=True, WRITE_BUFFER_FLUSH_INTERVAL=60000)
+        write_buffer = get_application_write_buffer(app, client, settings)
+        future = await write_buffer.add('index', 'pk', '{}')
+
+        await close_application_write_buffer(app)
+
+        assert future.result() == 'pk'
+        assert get_application_write_buffer(app, client, settings) is not write_buffer
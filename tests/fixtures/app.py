@@ -15,6 +15,7 @@ from fastapi import FastAPI
 from httpx import AsyncClient
 
 from search.app import create_app
+from search.app import shutdown_event
 from search.config import Settings
 from search.config import get_settings
 
@@ -59,10 +60,11 @@ def settings(elasticsearch_uri) -> Settings:
 
 
 @pytest.fixture
-def app(event_loop, settings) -> FastAPI:
+async def app(event_loop, settings) -> FastAPI:
     app = create_app()
     app.dependency_overrides[get_settings] = lambda: settings
     yield app
+    await shutdown_event(app)
 
 
 @pytest.fixture
@@ -27,4 +27,4 @@ class BaseFactory:
     async def delete_index(self) -> None:
         """Remove an existing index."""
 
-        await self.crud.client.indices.delete(index=self.crud.index)
+        await self.crud.delete_index()
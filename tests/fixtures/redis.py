@@ -0,0 +1,112 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import asyncio
+import time
+
+import pytest
+
+
+class FakeRedisServer:
+    """Local server speaking the subset of Redis protocol that is used by the cache backend."""
+
+    def __init__(self) -> None:
+        self.values: dict[bytes, tuple[float | None, bytes]] = {}
+        self.server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f'redis://{host}:{port}/0'
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle_connection, '127.0.0.1', 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def read_command(self, reader: asyncio.StreamReader) -> list[bytes]:
+        header = await reader.readline()
+        if not header:
+            raise ConnectionResetError()
+
+        arguments = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            arguments.append((await reader.readexactly(length + 2))[:-2])
+
+        return arguments
+
+    def encode(self, value: None | int | bytes | list) -> bytes:
+        if value is None:
+            return b'$-1\r\n'
+
+        if isinstance(value, int):
+            return b':%d\r\n' % value
+
+        if isinstance(value, list):
+            return b'*%d\r\n' % len(value) + b''.join(self.encode(item) for item in value)
+
+        return b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def get_value(self, key: bytes) -> bytes | None:
+        expires_at, value = self.values.get(key, (None, None))
+
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+
+        return value
+
+    def execute(self, name: bytes, *arguments: bytes) -> bytes:
+        name = name.upper()
+
+        if name == b'GET':
+            return self.encode(self.get_value(arguments[0]))
+
+        if name == b'MGET':
+            return self.encode([self.get_value(key) for key in arguments])
+
+        if name == b'SET':
+            expires_at = None
+            if len(arguments) == 4 and arguments[2].upper() == b'PX':
+                expires_at = time.monotonic() + int(arguments[3]) / 1000
+            self.values[arguments[0]] = (expires_at, arguments[1])
+            return b'+OK\r\n'
+
+        if name == b'DEL':
+            deleted = [key for key in arguments if self.values.pop(key, None) is not None]
+            return self.encode(len(deleted))
+
+        if name == b'INCRBY':
+            value = int(self.get_value(arguments[0]) or 0) + int(arguments[1])
+            self.values[arguments[0]] = (None, b'%d' % value)
+            return self.encode(value)
+
+        return b'-ERR unknown command\r\n'
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                command = await self.read_command(reader)
+                writer.write(self.execute(*command))
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def redis_server() -> FakeRedisServer:
+    server = FakeRedisServer()
+    await server.start()
+
+    try:
+        yield server
+    finally:
+        await server.stop()
@@ -0,0 +1,97 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+import pytest
+from elasticsearch import RequestError
+
+from migrations.index_checker import IndexChecker
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.metadata_item.crud import MetadataItemCRUD
+
+
+@pytest.fixture
+def index_checker(mocker) -> IndexChecker:
+    index_checker = IndexChecker('http://localhost:9200')
+    index_checker.client = mocker.AsyncMock()
+    index_checker.client.indices.get_mapping.side_effect = lambda index: {}
+    index_checker.client.indices.get_settings.return_value = {}
+    return index_checker
+
+
+class TestIndexChecker:
+    async def test_check_cruds_checks_all_cruds_even_when_one_of_them_fails(self, index_checker):
+        client = index_checker.client
+        client.indices.exists.return_value = False
+        client.indices.create.side_effect = [ConnectionError(), None]
+        client.indices.exists_alias.return_value = False
+        client.indices.exists_index_template.return_value = False
+        client.indices.get_alias.return_value = {'items-activity-logs-2023.01': {'aliases': {}}}
+
+        report = await index_checker.check_cruds([MetadataItemCRUD, ItemActivityCRUD])
+
+        assert report.is_successful is False
+        assert report.indices[0].error == 'ConnectionError()'
+        assert report.indices[1].error is None
+        assert report.indices[1].created is True
+        client.close.assert_awaited_once()
+
+    async def test_check_crud_treats_concurrently_created_index_as_existing(self, index_checker):
+        client = index_checker.client
+        client.indices.exists.return_value = False
+        client.indices.create.side_effect = RequestError(400, 'resource_already_exists_exception', {})
+
+        report = await index_checker.check_crud(MetadataItemCRUD(client))
+
+        assert report.is_successful is True
+        assert report.created is False
+
+    async def test_check_crud_adds_missing_fields_and_reports_conflicting_ones(self, index_checker):
+        client = index_checker.client
+        client.indices.exists.return_value = True
+        properties = MetadataItemCRUD.index_mappings['properties']
+        outdated = {name: field for name, field in properties.items() if name != 'storage_id'}
+        client.indices.get_mapping.side_effect = lambda index: {
+            'metadata-items': {'mappings': {'properties': {**outdated, 'zone': {'type': 'long'}}}}
+        }
+
+        report = await index_checker.check_crud(MetadataItemCRUD(client))
+
+        client.indices.put_mapping.assert_awaited_once_with(
+            index='metadata-items', body={'properties': {'storage_id': {'type': 'keyword'}}}
+        )
+        assert report.updated_fields == {'metadata-items': ['storage_id']}
+        assert report.conflicting_fields == {'metadata-items': ['zone']}
+        assert report.is_successful is False
+
+    async def test_check_crud_reports_fields_that_can_not_be_added_to_existing_index_as_conflicting(
+        self, index_checker
+    ):
+        client = index_checker.client
+        client.indices.exists.return_value = True
+        properties = MetadataItemCRUD.index_mappings['properties']
+        name = {**properties['name'], 'fields': {'keyword': {'type': 'keyword'}}}
+        client.indices.get_mapping.side_effect = lambda index: {
+            'metadata-items': {'mappings': {'properties': {**properties, 'name': name}}}
+        }
+        client.indices.put_mapping.side_effect = RequestError(400, 'mapper_parsing_exception', {})
+
+        report = await index_checker.check_crud(MetadataItemCRUD(client))
+
+        assert report.updated_fields == {}
+        assert report.conflicting_fields == {
+            'metadata-items': ['name', 'name.normalized', 'name.ngram', 'name.suggest']
+        }
+        assert report.error is None
+
+    async def test_check_crud_reports_legacy_index_of_partitioned_crud_as_error(self, index_checker):
+        client = index_checker.client
+        client.indices.exists_alias.return_value = False
+        client.indices.exists.return_value = True
+
+        report = await index_checker.check_crud(ItemActivityCRUD(client))
+
+        assert 'python -m migrations reindex items-activity-logs' in report.error
+        client.indices.put_index_template.assert_not_awaited()
@@ -0,0 +1,187 @@
+# Copyright (C) 2022-Present Indoc Systems
+#
+# Licensed under the GNU AFFERO GENERAL PUBLIC LICENSE,
+# Version 3.0 (the "License") available at https://www.gnu.org/licenses/agpl-3.0.en.html.
+# You may not use this file except in compliance with the License.
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import pytest
+
+from migrations.reindexer import IndexCopy
+from migrations.reindexer import Reindexer
+from migrations.reindexer import ReindexFailed
+from search.components.item_activity.crud import ActivityCounterCRUD
+from search.components.item_activity.crud import ItemActivityCRUD
+from search.components.metadata_item.crud import MetadataItemCRUD
+
+
+def create_task(completed: bool, created: int, total: int, **kwds) -> dict:
+    status = {'created': created, 'updated': 0, 'version_conflicts': 0, 'total': total}
+    return {'completed': completed, 'task': {'status': status}, **kwds}
+
+
+@pytest.fixture
+def reindexer(mocker) -> Reindexer:
+    reindexer = Reindexer('http://localhost:9200', poll_interval=0)
+    reindexer.client = mocker.AsyncMock()
+    reindexer.client.reindex.return_value = {'task': 'node:1'}
+    reindexer.client.tasks.get.return_value = create_task(True, 10, 10, response={'failures': []})
+    return reindexer
+
+
+class TestReindexer:
+    @pytest.mark.parametrize(
+        'index,expected_name,expected_target',
+        [
+            ('metadata-items', 'metadata-items', 'metadata-items-v1'),
+            ('metadata-items-v1', 'metadata-items', 'metadata-items-v2'),
+            ('items-activity-logs-2023.01-v9', 'items-activity-logs-2023.01', 'items-activity-logs-2023.01-v10'),
+        ],
+    )
+    def test_get_versioned_name_returns_name_without_version_and_next_version(
+        self, index, expected_name, expected_target, reindexer
+    ):
+        assert reindexer.get_versioned_name(index) == (expected_name, expected_target)
+
+    async def test_reindex_crud_copies_index_twice_and_swaps_alias_to_next_version(self, reindexer):
+        client = reindexer.client
+        client.indices.get_alias.return_value = {'metadata-items-v1': {'aliases': {'metadata-items': {}}}}
+        crud = MetadataItemCRUD(client)
+
+        await reindexer.reindex_crud(crud)
+
+        client.indices.create.assert_awaited_once_with(
+            index='metadata-items-v2', mappings=crud.index_mappings, settings=crud.get_index_settings()
+        )
+        assert client.reindex.await_count == 2
+        assert 'query' not in client.reindex.await_args_list[0].kwargs['body']['source']
+        assert client.reindex.await_args.kwargs['body']['dest'] == {
+            'index': 'metadata-items-v2',
+            'version_type': 'external',
+        }
+        assert client.reindex.await_args.kwargs['wait_for_completion'] is False
+        client.indices.add_block.assert_awaited_once_with(index='metadata-items-v1', block='write')
+        client.indices.update_aliases.assert_awaited_once_with(
+            body={
+                'actions': [
+                    {'remove_index': {'index': 'metadata-items-v1'}},
+                    {'add': {'index': 'metadata-items-v2', 'alias': 'metadata-items'}},
+                ]
+            }
+        )
+        client.indices.put_settings.assert_not_awaited()
+
+    async def test_reindex_crud_copies_only_documents_written_since_the_first_pass_after_writes_are_blocked(
+        self, reindexer, mocker
+    ):
+        client = reindexer.client
+        client.indices.get_alias.return_value = {'metadata-items': {'aliases': {}}}
+        started_at = datetime(2023, 3, 10, 12, tzinfo=timezone.utc)
+        mocker.patch('migrations.reindexer.datetime').now.return_value = started_at
+        reindexer.catch_up_margin = timedelta(minutes=30)
+
+        await reindexer.reindex_crud(MetadataItemCRUD(client))
+
+        first, catch_up = [call.kwargs['body']['source'] for call in client.reindex.await_args_list]
+        assert 'query' not in first
+        since = int((started_at - timedelta(minutes=30)).timestamp())
+        assert catch_up['query'] == {'range': {'last_updated_time': {'gte': since, 'format': 'epoch_second'}}}
+
+    def test_get_catch_up_query_returns_none_for_crud_without_updated_time_field(self, reindexer):
+        crud = ActivityCounterCRUD(reindexer.client)
+
+        assert reindexer.get_catch_up_query(crud, datetime.now(timezone.utc)) is None
+
+    async def test_reindex_crud_replaces_partitions_keeping_their_names_and_write_alias(self, reindexer, mocker):
+        client = reindexer.client
+        client.indices.get_alias.return_value = {
+            'items-activity-logs-2023.01': {'aliases': {'items-activity-logs': {}}},
+            'items-activity-logs-2023.02-v1': {
+                'aliases': {
+                    'items-activity-logs': {},
+                    'items-activity-logs-2023.02': {},
+                    'items-activity-logs-write': {'is_write_index': True},
+                }
+            },
+        }
+        crud = ItemActivityCRUD(client)
+        mocker.patch.object(crud, 'create_index')
+
+        await reindexer.reindex_crud(crud)
+
+        assert 'aliases' not in client.indices.put_index_template.await_args.kwargs['body']['template']
+        assert [call.kwargs for call in client.indices.create.await_args_list] == [
+            {'index': 'items-activity-logs-2023.01-v1'},
+            {'index': 'items-activity-logs-2023.02-v2'},
+        ]
+        swap, added = [call.kwargs['body']['actions'] for call in client.indices.update_aliases.await_args_list]
+        actions = swap
+        assert actions[:2] == [
+            {'remove_index': {'index': 'items-activity-logs-2023.01'}},
+            {'remove_index': {'index': 'items-activity-logs-2023.02-v1'}},
+        ]
+        assert {
+            'add': {
+                'index': 'items-activity-logs-2023.02-v2',
+                'alias': 'items-activity-logs-write',
+                'is_write_index': True,
+            }
+        } in actions
+        assert {'add': {'index': 'items-activity-logs-2023.01-v1', 'alias': 'items-activity-logs-2023.01'}} in actions
+        crud.create_index.assert_awaited_once()
+        assert added == [{'add': {'index': 'items-activity-logs-*', 'alias': 'items-activity-logs'}}]
+
+    async def test_reindex_crud_splits_legacy_index_into_partitions_with_script(self, reindexer, mocker):
+        client = reindexer.client
+        client.indices.get_alias.return_value = {'items-activity-logs': {'aliases': {}}}
+        crud = ItemActivityCRUD(client)
+        mocker.patch.object(crud, 'create_index')
+
+        await reindexer.reindex_crud(crud)
+
+        partition = crud.partitioning.get_partition(datetime.now(timezone.utc))
+        client.indices.create.assert_awaited_once_with(index=partition, ignore=400)
+        body = client.reindex.await_args.kwargs['body']
+        assert body['script']['params'] == {'field': 'activity_time', 'prefix': 'items-activity-logs-'}
+        assert body['source']['query']['range']['activity_time']['format'] == 'epoch_second'
+        swap = client.indices.update_aliases.await_args_list[0].kwargs['body']['actions']
+        assert swap == [
+            {'remove_index': {'index': 'items-activity-logs'}},
+            {'add': {'index': 'items-activity-logs-*', 'alias': 'items-activity-logs'}},
+            {'add': {'index': partition, 'alias': 'items-activity-logs', 'is_write_index': True}},
+            {'add': {'index': partition, 'alias': 'items-activity-logs-write', 'is_write_index': True}},
+        ]
+        crud.create_index.assert_awaited_once()
+
+    async def test_reindex_crud_unblocks_writes_and_keeps_aliases_when_copying_fails(self, reindexer):
+        client = reindexer.client
+        client.indices.get_alias.return_value = {'metadata-items': {'aliases': {}}}
+        client.tasks.get.side_effect = [
+            create_task(True, 10, 10, response={'failures': []}),
+            create_task(True, 9, 10, response={'failures': [{'cause': {'type': 'mapper_parsing_exception'}}]}),
+        ]
+
+        with pytest.raises(ReindexFailed):
+            await reindexer.reindex_crud(MetadataItemCRUD(client))
+
+        client.indices.update_aliases.assert_not_awaited()
+        client.indices.put_settings.assert_awaited_once_with(index='metadata-items', body={'index.blocks.write': False})
+
+    async def test_wait_for_task_polls_task_until_it_is_completed(self, reindexer):
+        client = reindexer.client
+        client.tasks.get.side_effect = [create_task(False, 5, 10), create_task(True, 10, 10, response={})]
+
+        await reindexer.wait_for_task('node:1', IndexCopy(source='source', target='target', aliases={}))
+
+        assert client.tasks.get.await_count == 2
+
+    async def test_reindex_cruds_returns_false_when_reindexing_fails(self, reindexer):
+        reindexer.client.indices.get_alias.side_effect = ConnectionError()
+
+        is_reindexed = await reindexer.reindex_cruds([MetadataItemCRUD])
+
+        assert is_reindexed is False
+        reindexer.client.close.assert_awaited_once()